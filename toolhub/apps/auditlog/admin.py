@@ -36,3 +36,8 @@ class LogEntryAdmin(ReadOnlyModelAdmin):
     )
     list_filter = ("user", "content_type")
     ordering = ("-timestamp",)
+
+
+@django.contrib.admin.register(models.ArchivedLogEntry)
+class ArchivedLogEntryAdmin(LogEntryAdmin):
+    """Register with admin."""
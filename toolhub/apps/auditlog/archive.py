@@ -0,0 +1,77 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+"""Archival of old audit log entries.
+
+The audit log grows forever and every API query has to work around the
+full history. Entries older than a cutoff are moved to the
+ArchivedLogEntry table, which has the same columns and keeps the original
+ids and timestamps. Archived entries remain available from the API with
+the `archived` query parameter.
+"""
+import logging
+
+from django.db import transaction
+
+from .models import ArchivedLogEntry
+from .models import LogEntry
+
+
+logger = logging.getLogger(__name__)
+
+COPY_FIELDS = (
+    "id",
+    "timestamp",
+    "user_id",
+    "content_type_id",
+    "object_id",
+    "object_pk",
+    "action",
+    "change_message",
+    "params",
+)
+
+
+def archive_entries(cutoff, batch_size=1000, dry_run=False):
+    """Move log entries created before a cutoff to the archive table.
+
+    Each batch is copied and deleted in a single transaction.
+
+    :param cutoff: only entries created before this time are moved
+    :param batch_size: number of entries to move per transaction
+    :param dry_run: count entries without moving them
+    :return: number of entries moved (or that would be moved)
+    """
+    qs = LogEntry.objects.filter(timestamp__lt=cutoff).order_by("pk")
+    if dry_run:
+        return qs.count()
+
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(qs.values(*COPY_FIELDS)[:batch_size])
+            if not batch:
+                break
+            ArchivedLogEntry.objects.bulk_create(
+                ArchivedLogEntry(**row) for row in batch
+            )
+            LogEntry.objects.filter(
+                pk__in=[row["id"] for row in batch]
+            ).delete()
+        total += len(batch)
+        logger.info("Archived %d auditlog entries", len(batch))
+    return total
@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+"""Buffered LogEntry writes.
+
+Inside a `buffered_logging()` block, `LogEntry.objects.log_action` collects
+new entries in memory instead of inserting them one at a time. The entries
+are written with a single bulk insert, in the order they were logged, when
+the outermost block exits. If a database transaction is open at that
+point, the write is delayed until the transaction commits and dropped if
+it rolls back.
+"""
+import contextlib
+import contextvars
+
+from django.db import transaction
+from django.db.models.signals import pre_save
+
+
+buffer_var = contextvars.ContextVar("auditlog_buffer", default=None)
+
+
+class LogEntryBuffer:
+    """Collect LogEntry objects to save with a bulk insert."""
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self.pending = []
+
+    def __len__(self):
+        """Get the number of pending entries."""
+        return len(self.pending)
+
+    def add(self, entry):
+        """Add an unsaved LogEntry to the buffer.
+
+        pre_save is sent immediately because bulk inserts do not send it.
+        This lets receivers such as the auditlog_context handler see the
+        state that was active when the entry was logged.
+        """
+        pre_save.send(
+            sender=entry.__class__,
+            instance=entry,
+            raw=False,
+            using=None,
+            update_fields=None,
+        )
+        self.pending.append(entry)
+
+    def find_latest(self, content_type, object_id):
+        """Find the newest pending entry for an object, if any."""
+        for entry in reversed(self.pending):
+            if (
+                entry.content_type_id == content_type.pk
+                and entry.object_id == object_id
+            ):
+                return entry
+        return None
+
+    def flush(self):
+        """Save all pending entries."""
+        pending, self.pending = self.pending, []
+        if pending:
+            pending[0].__class__.objects.bulk_create(pending)
+
+
+def current_buffer():
+    """Get the active LogEntryBuffer, if any."""
+    return buffer_var.get()
+
+
+@contextlib.contextmanager
+def buffered_logging():
+    """Context manager for batching LogEntry inserts."""
+    buffer = current_buffer()
+    if buffer is not None:
+        # Nested context; the outermost context will flush
+        yield buffer
+        return
+
+    buffer = LogEntryBuffer()
+    token = buffer_var.set(buffer)
+    try:
+        yield buffer
+    finally:
+        buffer_var.reset(token)
+        transaction.on_commit(buffer.flush)
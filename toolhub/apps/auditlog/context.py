@@ -16,73 +16,47 @@
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
 import contextlib
-import threading
-import time
-from functools import partial
+import contextvars
 
 from django.contrib.auth import get_user_model
 from django.db.models.signals import pre_save
+from django.dispatch import receiver
 
 from .models import LogEntry
 
 
-threadlocal = threading.local()
+# Stack of (user, comment) tuples for the active auditlog_context blocks.
+# A ContextVar keeps the state separate for each thread and asyncio task.
+stack = contextvars.ContextVar("auditlog_context", default=())
 
 
 @contextlib.contextmanager
 def auditlog_context(user, comment=None):
-    """Context manager for setting user and comment for LogEntry creation."""
-    threadlocal.auditlog = {
-        "dispatch_uid": ("auditlog_user", time.time()),
-    }
-    pre_save_callback = partial(
-        _on_logentry_save,
-        user=user,
-        comment=comment,
-        duid=threadlocal.auditlog["dispatch_uid"],
-    )
-    pre_save.connect(
-        pre_save_callback,
-        sender=LogEntry,
-        dispatch_uid=threadlocal.auditlog["dispatch_uid"],
-        weak=False,
-    )
+    """Context manager for setting user and comment for LogEntry creation.
 
+    Contexts may be nested. The innermost context applies.
+    """
+    token = stack.set(stack.get() + ((user, comment),))
     try:
         yield
     finally:
-        try:
-            auditlog = threadlocal.auditlog
-        except AttributeError:
-            # Already disconnected
-            pass
-        else:
-            pre_save.disconnect(
-                sender=LogEntry,
-                dispatch_uid=auditlog["dispatch_uid"],
-            )
-            del threadlocal.auditlog
+        stack.reset(token)
 
 
-def _on_logentry_save(
-    user, comment, duid, sender, instance, **kwargs  # noqa: W0613
-):
+def current_context():
+    """Get the (user, comment) of the innermost active context, if any."""
+    active = stack.get()
+    return active[-1] if active else None
+
+
+@receiver(pre_save, sender=LogEntry)
+def _on_logentry_save(sender, instance, **kwargs):  # noqa: W0613
     """Set user and comment on LogEntry before saving."""
-    try:
-        auditlog = threadlocal.auditlog
-    except AttributeError:
-        # Already disconnected
-        pass
-    else:
-        if duid != auditlog["dispatch_uid"]:
-            # Mismatch of caller args and thread state
-            return
-        user_model = get_user_model()
-        if (
-            sender == LogEntry
-            and isinstance(user, user_model)
-            and instance.user is None
-        ):
-            instance.user = user
-        if comment is not None:
-            instance.change_message = comment
+    ctx = current_context()
+    if ctx is None:
+        return
+    user, comment = ctx
+    if isinstance(user, get_user_model()) and instance.user is None:
+        instance.user = user
+    if comment is not None:
+        instance.change_message = comment
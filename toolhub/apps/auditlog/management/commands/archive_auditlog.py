@@ -0,0 +1,72 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from toolhub.apps.auditlog.archive import archive_entries
+
+
+class Command(BaseCommand):
+    """Move old audit log entries to the archive table."""
+
+    help = "Move old audit log entries to the archive table"  # noqa: A003
+
+    def add_arguments(self, parser):
+        """Add CLI arguments."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=(
+                "Keep entries newer than this many days. Defaults to "
+                "AUDITLOG_ARCHIVE_DAYS."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of entries to move per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count entries that would be archived without moving them.",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        days = options["days"]
+        if days is None:
+            days = settings.AUDITLOG_ARCHIVE_DAYS
+        cutoff = timezone.now() - datetime.timedelta(days=days)
+        total = archive_entries(
+            cutoff,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                "{} {} entries".format(
+                    "Would archive" if options["dry_run"] else "Archived",
+                    total,
+                )
+            )
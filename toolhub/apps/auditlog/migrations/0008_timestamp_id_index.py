@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auditlog', '0007_featured_actions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['timestamp', 'id'], name='auditlog_timestamp_id_idx'),
+        ),
+    ]
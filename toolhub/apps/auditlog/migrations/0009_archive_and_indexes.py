@@ -0,0 +1,80 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import toolhub.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auditlog', '0008_timestamp_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLogEntry',
+            fields=[
+                ('object_id', models.BigIntegerField(blank=True, db_index=True, null=True, verbose_name='object id')),
+                ('object_pk', models.CharField(blank=True, db_index=True, max_length=255, null=True, verbose_name='object pk')),
+                ('action', models.PositiveSmallIntegerField(choices=[(0, 'created'), (1, 'updated'), (2, 'deleted'), (3, 'added to'), (4, 'removed from'), (5, 'hid'), (6, 'revealed'), (7, 'patrolled'), (8, 'featured'), (9, 'unfeatured')], db_index=True, verbose_name='action')),
+                ('change_message', models.TextField(blank=True, null=True)),
+                ('params', toolhub.fields.JSONSchemaField(default=dict, null=True)),
+                ('id', models.IntegerField(primary_key=True, serialize=False, verbose_name='id')),
+                ('timestamp', models.DateTimeField(verbose_name='timestamp')),
+            ],
+            options={
+                'verbose_name': 'archived auditlog entry',
+                'verbose_name_plural': 'archived auditlog entries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['content_type', 'timestamp', 'id'], name='auditlog_type_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['user', 'timestamp', 'id'], name='auditlog_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['action', 'timestamp', 'id'], name='auditlog_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['content_type', 'object_id', 'timestamp'], name='auditlog_object_ts_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedlogentry',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contenttypes.contenttype', verbose_name='content type'),
+        ),
+        migrations.AddField(
+            model_name='archivedlogentry',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='user'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlogentry',
+            index=models.Index(fields=['timestamp', 'id'], name='auditlog_arch_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlogentry',
+            index=models.Index(fields=['content_type', 'timestamp', 'id'], name='auditlog_arch_type_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlogentry',
+            index=models.Index(fields=['user', 'timestamp', 'id'], name='auditlog_arch_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlogentry',
+            index=models.Index(fields=['action', 'timestamp', 'id'], name='auditlog_arch_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlogentry',
+            index=models.Index(fields=['content_type', 'object_id', 'timestamp'], name='auditlog_arch_object_ts_idx'),
+        ),
+    ]
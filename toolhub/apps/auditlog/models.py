@@ -26,6 +26,7 @@ from django_prometheus.models import ExportModelOperationsMixin
 from toolhub.fields import JSONSchemaField
 
 from . import schema
+from .buffering import current_buffer
 
 
 class LogEntryManager(models.Manager):
@@ -48,8 +49,29 @@ class LogEntryManager(models.Manager):
         else:
             kwargs["object_pk"] = pk
 
+        buffer = current_buffer()
+        if buffer is not None:
+            entry = self.model(**kwargs)
+            buffer.add(entry)
+            return entry
         return self.model.objects.create(**kwargs)
 
+    def get_latest_for_object_id(self, content_type, object_id):
+        """Get the newest log entry for an object, including buffered ones.
+
+        Entries waiting in an active buffered_logging block are unsaved.
+        """
+        buffer = current_buffer()
+        if buffer is not None:
+            entry = buffer.find_latest(content_type, object_id)
+            if entry is not None:
+                return entry
+        return (
+            self.filter(content_type=content_type, object_id=object_id)
+            .order_by("-timestamp")
+            .first()
+        )
+
     def get_for_object(self, instance):
         """Get log entries for a model instance."""
         if not isinstance(instance, models.Model):
@@ -76,8 +98,8 @@ class LogEntryManager(models.Manager):
         return pk
 
 
-class LogEntry(ExportModelOperationsMixin("logentry"), models.Model):
-    """An audit log entry."""
+class AbstractLogEntry(models.Model):
+    """Fields and behavior shared by live and archived audit log entries."""
 
     CREATE = 0
     UPDATE = 1
@@ -148,13 +170,10 @@ class LogEntry(ExportModelOperationsMixin("logentry"), models.Model):
         schema=schema.PARAMS,
     )
 
-    objects = LogEntryManager()
-
     class Meta:
-        """Metadata for model."""
+        """Mark as abstract."""
 
-        verbose_name = _("auditlog entry")
-        verbose_name_plural = _("auditlog entries")
+        abstract = True
 
     def get_target(self):
         """Return the target object represented by this log entry."""
@@ -174,3 +193,83 @@ class LogEntry(ExportModelOperationsMixin("logentry"), models.Model):
         if self.object_id is not None:
             return self.object_id
         return self.object_pk
+
+
+class LogEntry(ExportModelOperationsMixin("logentry"), AbstractLogEntry):
+    """An audit log entry."""
+
+    objects = LogEntryManager()
+
+    class Meta:
+        """Metadata for model."""
+
+        verbose_name = _("auditlog entry")
+        verbose_name_plural = _("auditlog entries")
+        indexes = [
+            # Used for keyset pagination of the log
+            models.Index(
+                fields=["timestamp", "id"],
+                name="auditlog_timestamp_id_idx",
+            ),
+            # Used by the API filters combined with keyset pagination
+            models.Index(
+                fields=["content_type", "timestamp", "id"],
+                name="auditlog_type_ts_idx",
+            ),
+            models.Index(
+                fields=["user", "timestamp", "id"],
+                name="auditlog_user_ts_idx",
+            ),
+            models.Index(
+                fields=["action", "timestamp", "id"],
+                name="auditlog_action_ts_idx",
+            ),
+            # Used to find the history of a single object
+            models.Index(
+                fields=["content_type", "object_id", "timestamp"],
+                name="auditlog_object_ts_idx",
+            ),
+        ]
+
+
+class ArchivedLogEntry(AbstractLogEntry):
+    """An audit log entry moved out of the live table by archive_auditlog.
+
+    Entries keep the id and timestamp that they had as LogEntry rows.
+    """
+
+    id = models.IntegerField(  # noqa: A003
+        primary_key=True,
+        verbose_name=_("id"),
+    )
+    timestamp = models.DateTimeField(
+        verbose_name=_("timestamp"),
+    )
+
+    class Meta:
+        """Metadata for model."""
+
+        verbose_name = _("archived auditlog entry")
+        verbose_name_plural = _("archived auditlog entries")
+        indexes = [
+            models.Index(
+                fields=["timestamp", "id"],
+                name="auditlog_arch_ts_id_idx",
+            ),
+            models.Index(
+                fields=["content_type", "timestamp", "id"],
+                name="auditlog_arch_type_ts_idx",
+            ),
+            models.Index(
+                fields=["user", "timestamp", "id"],
+                name="auditlog_arch_user_ts_idx",
+            ),
+            models.Index(
+                fields=["action", "timestamp", "id"],
+                name="auditlog_arch_action_ts_idx",
+            ),
+            models.Index(
+                fields=["content_type", "object_id", "timestamp"],
+                name="auditlog_arch_object_ts_idx",
+            ),
+        ]
@@ -32,6 +32,85 @@ from toolhub.serializers import ModelSerializer
 from .models import LogEntry
 
 
+def target_key(entry):
+    """Get a hashable key identifying the target of a log entry."""
+    return (entry.content_type_id, str(entry.get_target_id()))
+
+
+def get_targets(entries):
+    """Get the targets of many log entries.
+
+    Targets are fetched with one query per content type. Targets which no
+    longer exist are mapped to None.
+
+    :return: dict of target_key to target object
+    """
+    ids_by_type = {}
+    for entry in entries:
+        if entry.content_type_id is None:
+            continue
+        ids_by_type.setdefault(entry.content_type, set()).add(
+            str(entry.get_target_id())
+        )
+
+    targets = {}
+    for content_type, ids in ids_by_type.items():
+        model = content_type.model_class()
+        found = {}
+        if model is not None:
+            # The base manager also finds soft deleted objects, matching
+            # ContentType.get_object_for_this_type.
+            found = {
+                str(obj.pk): obj
+                for obj in model._base_manager.filter(pk__in=ids)
+            }
+        for pk in ids:
+            targets[(content_type.pk, pk)] = found.get(pk)
+    return targets
+
+
+def get_revision_flags(version_ids):
+    """Get the suppressed and patrolled flags of many revisions.
+
+    Versions which no longer exist are mapped to None.
+
+    :return: dict of Version id to (suppressed, patrolled)
+    """
+    flags = dict.fromkeys(version_ids)
+    qs = Version.objects.filter(
+        pk__in=version_ids, revision__meta__isnull=False
+    ).values_list(
+        "pk", "revision__meta__suppressed", "revision__meta__patrolled"
+    )
+    for pk, suppressed, patrolled in qs:
+        flags[pk] = (suppressed, patrolled)
+    return flags
+
+
+class LogEntryListSerializer(serializers.ListSerializer):
+    """Serialize many log entries.
+
+    Targets and revision metadata for all of the entries are fetched
+    before the individual entries are serialized.
+    """
+
+    def to_representation(self, data):
+        """Generate primative representation of many log entries."""
+        data = list(data.all() if hasattr(data, "all") else data)
+        self.context.setdefault("auditlog_targets", {}).update(
+            get_targets(data)
+        )
+        rev_ids = {
+            e.params["revision"]
+            for e in data
+            if e.params and e.params.get("revision")
+        }
+        self.context.setdefault("auditlog_revisions", {}).update(
+            get_revision_flags(rev_ids)
+        )
+        return super().to_representation(data)
+
+
 @doc(_("""Event action"""))  # noqa: W0223
 class ActionField(serializers.ReadOnlyField):
     """Event action."""
@@ -65,7 +144,12 @@ class TargetSerializer(serializers.Serializer):
                 "label": "",
             }
 
-        target = instance.get_target()
+        targets = self.context.get("auditlog_targets", {})
+        key = target_key(instance)
+        if key in targets:
+            target = targets[key]
+        else:
+            target = instance.get_target()
         try:
             ret["label"] = target.auditlog_label
             if isinstance(target, Tool):
@@ -87,15 +171,14 @@ class ParamsField(JSONSchemaField):
     def to_representation(self, obj):
         """Transform the *outgoing* native value into primitive data."""
         raw = super().to_representation(obj)
-        if raw.get("revision"):
+        rev_id = raw.get("revision")
+        if rev_id:
             # When we have a revision, add its meta data to the output.
-            meta = (
-                Version.objects.select_related("revision", "revision__meta")
-                .get(pk=raw["revision"])
-                .revision.meta
-            )
-            raw["suppressed"] = meta.suppressed
-            raw["patrolled"] = meta.patrolled
+            flags = self.context.get("auditlog_revisions", {})
+            if rev_id not in flags:
+                flags.update(get_revision_flags([rev_id]))
+            if flags.get(rev_id) is not None:
+                raw["suppressed"], raw["patrolled"] = flags[rev_id]
         return raw
 
 
@@ -120,6 +203,7 @@ class LogEntrySerializer(ModelSerializer):
         """Configure serializer."""
 
         model = LogEntry
+        list_serializer_class = LogEntryListSerializer
         fields = [
             "id",
             "timestamp",
@@ -106,8 +106,9 @@ def log_m2m_changed_callback(  # noqa: R0913
 ):
     """Handle a many-to-many relation change signal."""
     if sender == get_user_model().groups.through:
-        # Users are being added/removed from a group.
-        for pk in kwargs["pk_set"]:
+        # Users are being added/removed from a group. pk_set is None when
+        # a relation is cleared.
+        for pk in kwargs["pk_set"] or ():
             if reverse:
                 group = instance
                 user = model.objects.get(pk=pk)
@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from toolhub.apps.user.models import ToolhubUser
+
+from ..archive import archive_entries
+from ..models import ArchivedLogEntry
+from ..models import LogEntry
+
+
+class ArchiveEntriesTest(TestCase):
+    """Test archive_entries."""
+
+    def setUp(self):
+        """Initialize common test conditions."""
+        self.user = ToolhubUser.objects.create(username="tester")
+        self.old = [
+            LogEntry.objects.log_action(
+                self.user, self.user, LogEntry.UPDATE, "old {}".format(i)
+            )
+            for i in range(3)
+        ]
+        self.old_ts = timezone.now() - datetime.timedelta(days=400)
+        LogEntry.objects.filter(pk__in=[e.pk for e in self.old]).update(
+            timestamp=self.old_ts
+        )
+        self.new = LogEntry.objects.log_action(
+            self.user, self.user, LogEntry.UPDATE, "new"
+        )
+        self.cutoff = timezone.now() - datetime.timedelta(days=365)
+
+    def test_archive_entries(self):
+        """Assert old entries are moved with their ids and timestamps."""
+        self.assertEqual(archive_entries(self.cutoff, batch_size=2), 3)
+
+        self.assertFalse(
+            LogEntry.objects.filter(timestamp__lt=self.cutoff).exists()
+        )
+        self.assertTrue(LogEntry.objects.filter(pk=self.new.pk).exists())
+        for entry in self.old:
+            archived = ArchivedLogEntry.objects.get(pk=entry.pk)
+            self.assertEqual(archived.timestamp, self.old_ts)
+            self.assertEqual(archived.user, self.user)
+            self.assertEqual(archived.content_type, entry.content_type)
+            self.assertEqual(archived.object_id, entry.object_id)
+            self.assertEqual(archived.change_message, entry.change_message)
+
+    def test_dry_run(self):
+        """Assert nothing is moved in a dry run."""
+        self.assertEqual(archive_entries(self.cutoff, dry_run=True), 3)
+        self.assertFalse(ArchivedLogEntry.objects.exists())
+
+    def test_command(self):
+        """Assert the management command archives entries."""
+        call_command("archive_auditlog", days=365, verbosity=0)
+        self.assertEqual(ArchivedLogEntry.objects.count(), 3)
@@ -0,0 +1,106 @@
+# Copyright (c) 2020 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.test import TestCase
+
+from reversion.models import Version
+
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.user.models import ToolhubUser
+from toolhub.apps.versioned.context import reversion_context
+
+from ..buffering import buffered_logging
+from ..buffering import current_buffer
+from ..context import auditlog_context
+from ..models import LogEntry
+
+
+class BufferedLoggingTest(TestCase):
+    """Test buffered_logging."""
+
+    def setUp(self):
+        """Initialize common test conditions."""
+        self.user = ToolhubUser.objects.create(
+            username="tester",
+            email="tester@example.org",
+        )
+        self.start = LogEntry.objects.count()
+
+    def test_entries_written_on_commit(self):
+        """Assert entries are held until the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with buffered_logging() as buffer:
+                for i in range(3):
+                    LogEntry.objects.log_action(
+                        self.user, self.user, LogEntry.UPDATE, str(i)
+                    )
+                self.assertEqual(len(buffer), 3)
+                self.assertEqual(LogEntry.objects.count(), self.start)
+            self.assertIsNone(current_buffer())
+            self.assertEqual(LogEntry.objects.count(), self.start)
+        self.assertEqual(len(callbacks), 1)
+
+        messages = list(
+            LogEntry.objects.order_by("id").values_list(
+                "change_message", flat=True
+            )
+        )
+        self.assertEqual(messages[-3:], ["0", "1", "2"])
+
+    def test_nested(self):
+        """Assert nested blocks share the outermost buffer."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with buffered_logging() as outer:
+                with buffered_logging() as inner:
+                    self.assertIs(inner, outer)
+                    LogEntry.objects.log_action(
+                        None, self.user, LogEntry.UPDATE
+                    )
+                self.assertEqual(len(outer), 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(LogEntry.objects.count(), self.start + 1)
+
+    def test_auditlog_context(self):
+        """Assert auditlog_context applies at log time."""
+        other = ToolhubUser.objects.create(username="other")
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_logging():
+                with auditlog_context(other, "from context"):
+                    entry = LogEntry.objects.log_action(
+                        None, self.user, LogEntry.UPDATE
+                    )
+                self.assertIsNone(entry.pk)
+        entry = LogEntry.objects.order_by("-id").first()
+        self.assertEqual(entry.user, other)
+        self.assertEqual(entry.change_message, "from context")
+
+    def test_revision_backfill(self):
+        """Assert revision ids are added to buffered tool entries."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_logging():
+                with reversion_context(self.user):
+                    tool = Tool.objects.create(
+                        name="buffered-tool",
+                        title="Buffered",
+                        description="Tool",
+                        url="https://example.org/",
+                        created_by=self.user,
+                    )
+        version = Version.objects.get_for_object(tool).get()
+        entry = LogEntry.objects.get_for_object(tool).get()
+        self.assertEqual(entry.action, LogEntry.CREATE)
+        self.assertEqual(entry.params["revision"], version.pk)
@@ -15,12 +15,15 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+
 from django.test import TestCase
 
 from toolhub.apps.user.models import ToolhubUser
 
 from ..context import auditlog_context
-from ..context import threadlocal
+from ..context import current_context
+from ..models import LogEntry
 
 
 class ContextTest(TestCase):
@@ -34,18 +37,57 @@ class ContextTest(TestCase):
         )
 
     def test_auditlog_context(self):
-        """Assert threadlocal state while using."""
-        self.assertEqual(
-            getattr(threadlocal, "auditlog", None),
-            None,
-            msg="No threadlocal value before contextmanager.",
+        """Assert context state while using."""
+        self.assertIsNone(
+            current_context(),
+            msg="No context value before contextmanager.",
         )
         with auditlog_context(self.user, "some comment"):
-            self.assertIsInstance(getattr(threadlocal, "auditlog", None), dict)
-            self.assertIn("dispatch_uid", threadlocal.auditlog)
-            self.assertIsInstance(threadlocal.auditlog["dispatch_uid"], tuple)
-        self.assertEqual(
-            getattr(threadlocal, "auditlog", None),
-            None,
-            msg="No threadlocal value after contextmanager.",
+            self.assertEqual(current_context(), (self.user, "some comment"))
+        self.assertIsNone(
+            current_context(),
+            msg="No context value after contextmanager.",
         )
+
+    def test_auditlog_context_nested(self):
+        """Assert the innermost context applies and outer is restored."""
+        other = ToolhubUser.objects.create(username="other")
+        with auditlog_context(self.user, "outer"):
+            with auditlog_context(other, "inner"):
+                entry = LogEntry.objects.log_action(
+                    None, self.user, LogEntry.UPDATE
+                )
+                self.assertEqual(entry.user, other)
+                self.assertEqual(entry.change_message, "inner")
+            entry = LogEntry.objects.log_action(
+                None, self.user, LogEntry.UPDATE
+            )
+            self.assertEqual(entry.user, self.user)
+            self.assertEqual(entry.change_message, "outer")
+        entry = LogEntry.objects.log_action(None, self.user, LogEntry.UPDATE)
+        self.assertIsNone(entry.user)
+        self.assertIsNone(entry.change_message)
+
+    def test_auditlog_context_tasks(self):
+        """Assert asyncio tasks do not see each other's contexts."""
+
+        async def task(comment, ready, done):
+            with auditlog_context(self.user, comment):
+                ready.set()
+                await done.wait()
+                return current_context()[1]
+
+        async def main():
+            ready_a, ready_b, done = (
+                asyncio.Event(),
+                asyncio.Event(),
+                asyncio.Event(),
+            )
+            a = asyncio.ensure_future(task("a", ready_a, done))
+            b = asyncio.ensure_future(task("b", ready_b, done))
+            await ready_a.wait()
+            await ready_b.wait()
+            done.set()
+            return await a, await b
+
+        self.assertEqual(asyncio.run(main()), ("a", "b"))
@@ -19,7 +19,7 @@ from unittest.mock import Mock
 
 from django.test import SimpleTestCase
 
-from ..context import threadlocal
+from ..context import current_context
 from ..middleware import LogEntryUserMiddleware
 
 
@@ -38,15 +38,14 @@ class LogEntryUserMiddlewareTest(SimpleTestCase):
         self.request.user.is_authenticated = False
 
         def assert_null_context(req):
-            self.assertEqual(getattr(threadlocal, "auditlog", None), None)
+            self.assertIsNone(current_context())
             return req
 
         self.get_response.side_effect = assert_null_context
 
-        self.assertEqual(
-            getattr(threadlocal, "auditlog", None),
-            None,
-            msg="No threadlocal value before middleware.",
+        self.assertIsNone(
+            current_context(),
+            msg="No context value before middleware.",
         )
 
         self.middleware(self.request)
@@ -57,25 +56,21 @@ class LogEntryUserMiddlewareTest(SimpleTestCase):
         """Assert that authed request sets auditlog hook."""
         self.request.user.is_authenticated = True
 
-        def assert_thread_local(req):
-            self.assertIsInstance(getattr(threadlocal, "auditlog", None), dict)
-            self.assertIn("dispatch_uid", threadlocal.auditlog)
-            self.assertIsInstance(threadlocal.auditlog["dispatch_uid"], tuple)
+        def assert_context(req):
+            self.assertEqual(current_context(), (self.request.user, None))
             return req
 
-        self.get_response.side_effect = assert_thread_local
+        self.get_response.side_effect = assert_context
 
-        self.assertEqual(
-            getattr(threadlocal, "auditlog", None),
-            None,
-            msg="No threadlocal value before middleware.",
+        self.assertIsNone(
+            current_context(),
+            msg="No context value before middleware.",
         )
 
         self.middleware(self.request)
 
         self.get_response.assert_called_once()
-        self.assertEqual(
-            getattr(threadlocal, "auditlog", None),
-            None,
-            msg="No threadlocal value after middleware.",
+        self.assertIsNone(
+            current_context(),
+            msg="No context value after middleware.",
         )
@@ -0,0 +1,142 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reversion.models import Version
+
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.versioned.context import reversion_context
+from toolhub.tests import TestCase
+
+from ..archive import archive_entries
+from ..models import LogEntry
+
+
+class LogEntryViewSetTest(TestCase):
+    """Test LogEntryViewSet."""
+
+    url = "/api/auditlogs/"
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup for all tests in this TestCase."""
+        cls.user = cls._user("user")
+
+    def make_entries(self, count, start=0):
+        """Create tools and lists which add log entries."""
+        for i in range(start, start + count):
+            with reversion_context(self.user):
+                Tool.objects.create(
+                    name="tool-{}".format(i),
+                    title="Tool {}".format(i),
+                    description="Tool",
+                    url="https://example.org/",
+                    created_by=self.user,
+                )
+                ToolList.objects.create(
+                    title="List {}".format(i), created_by=self.user
+                )
+
+    def get_query_count(self):
+        """Get the number of queries used to render a page."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"page_size": 100})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx)
+
+    def test_list_query_count(self):
+        """Test targets are resolved without a query per entry."""
+        self.make_entries(1)
+        small = self.get_query_count()
+        self.make_entries(5, start=1)
+        self.assertEqual(self.get_query_count(), small)
+
+    def test_list_targets(self):
+        """Test targets are rendered."""
+        self.make_entries(1)
+        response = self.client.get(self.url, {"target_type": "tool"})
+        target = response.data["results"][0]["target"]
+        self.assertEqual(target["id"], "tool-0")
+        self.assertEqual(target["label"], "tool-0")
+
+    def test_revision_flags(self):
+        """Test revision metadata is added to params."""
+        self.make_entries(1)
+        tool = Tool.objects.get(name="tool-0")
+        version = Version.objects.get_for_object(tool).first()
+        meta = version.revision.meta
+        meta.patrolled = True
+        meta.save()
+        LogEntry.objects.log_action(
+            self.user,
+            version,
+            LogEntry.PATROL,
+            params={"tool_name": tool.name, "revision": version.pk},
+        )
+        LogEntry.objects.log_action(
+            self.user,
+            tool,
+            LogEntry.UPDATE,
+            params={"revision": version.pk + 1000},
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        results = {r["action"]: r for r in response.data["results"]}
+        self.assertTrue(results["patrolled"]["params"]["patrolled"])
+        self.assertFalse(results["patrolled"]["params"]["suppressed"])
+        # Revisions which no longer exist are shown without flags
+        self.assertNotIn("patrolled", results["updated"]["params"])
+
+    def test_archived(self):
+        """Test archived entries are listed with the archived flag."""
+        self.make_entries(2)
+        old = list(
+            LogEntry.objects.filter(content_type__model="tool").values_list(
+                "pk", flat=True
+            )
+        )
+        LogEntry.objects.filter(pk__in=old).update(
+            timestamp=timezone.now() - datetime.timedelta(days=30)
+        )
+        archive_entries(timezone.now() - datetime.timedelta(days=1))
+
+        response = self.client.get(self.url, {"target_type": "tool"})
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get(
+            self.url, {"target_type": "tool", "archived": "true"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(r["id"] for r in response.data["results"]), sorted(old)
+        )
+        self.assertEqual(
+            response.data["results"][0]["target"]["label"], "tool-1"
+        )
+
+        response = self.client.get(
+            "{}{}/".format(self.url, old[0]), {"archived": "1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], old[0])
@@ -20,12 +20,17 @@ from django.utils.translation import gettext_lazy as _
 
 from django_filters import rest_framework as filters
 
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import extend_schema_view
 
 from rest_framework import permissions
 from rest_framework import viewsets
 
+from toolhub.pagination import KeysetPagination
+
+from .models import ArchivedLogEntry
 from .models import LogEntry
 from .serializers import LogEntrySerializer
 
@@ -85,19 +90,43 @@ class LogEntryFilter(filters.FilterSet):
     )
 
 
+query_param_archived = OpenApiParameter(
+    "archived",
+    OpenApiTypes.BOOL,
+    OpenApiParameter.QUERY,
+    description=_(
+        "Use log entries which have been moved to the archive instead of "
+        "recent log entries."
+    ),
+)
+
+
 @extend_schema_view(
     list=extend_schema(
         description=_("""List all log entries."""),
+        parameters=[query_param_archived],
     ),
     retrieve=extend_schema(
         description=_("""Info for a specific log entry."""),
+        parameters=[query_param_archived],
     ),
 )
 class LogEntryViewSet(viewsets.ReadOnlyModelViewSet):
     """LogEntries."""
 
-    queryset = LogEntry.objects.all()
+    queryset = LogEntry.objects.select_related("user", "content_type")
     serializer_class = LogEntrySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filterset_class = LogEntryFilter
     ordering = ["-timestamp"]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-timestamp", "-id")
+
+    def get_queryset(self):
+        """Select the live or archived log entries."""
+        archived = self.request.query_params.get("archived", "")
+        if archived.lower() in ["true", "1", "yes"]:
+            return ArchivedLogEntry.objects.select_related(
+                "user", "content_type"
+            )
+        return super().get_queryset()
@@ -0,0 +1,140 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+"""Pruning of old crawler revisions.
+
+The crawler saves a full revision of a tool and its annotations every time
+a toolinfo record changes. Old revisions which were made by the crawler
+and which nobody has reviewed or hidden can be deleted to keep the
+revision tables small. The newest revision of each tool is always kept,
+so revert, undo, diff and suppression keep working on the remaining
+history.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import BigIntegerField
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import Max
+from django.db.models import OuterRef
+from django.db.models.functions import Cast
+
+from reversion.models import Revision
+from reversion.models import Version
+
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.toolinfo.models import get_tool_content_type_id
+
+from .tasks import IMPORT_COMMENT
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_prunable_versions(cutoff):
+    """Get Tool versions which are candidates for pruning.
+
+    Besides the crawler's revision comment, the tool must be managed by
+    the crawler and the revision must be attributed to the tool's creator,
+    as crawler revisions are. Edits by people which happen to use a
+    similar comment are never pruned.
+
+    :param cutoff: only versions created before this time are returned
+    """
+    crawler_tool = Tool.all_objects.filter(
+        pk=Cast(OuterRef("object_id"), BigIntegerField()),
+        origin=Tool.ORIGIN_CRAWLER,
+        created_by=OuterRef("revision__user"),
+    )
+    return (
+        Version.objects.filter(
+            Exists(crawler_tool),
+            content_type_id=get_tool_content_type_id(),
+            revision__date_created__lt=cutoff,
+            revision__comment__startswith=IMPORT_COMMENT.format(""),
+            revision__meta__patrolled=False,
+            revision__meta__suppressed=False,
+        )
+        .order_by("pk")
+        .only("pk", "object_id", "revision_id")
+    )
+
+
+def prune_revisions(cutoff, batch_size=1000, dry_run=False):
+    """Delete unreviewed crawler revisions created before a cutoff.
+
+    A revision is only deleted if every Tool version it contains may be
+    pruned. Deleting a revision also deletes its versions, metadata and
+    recent changes feed entries.
+
+    :param cutoff: only revisions created before this time are deleted
+    :param batch_size: number of versions to examine per transaction
+    :param dry_run: count revisions without deleting them
+    :return: number of revisions deleted (or that would be deleted)
+    """
+    qs = get_prunable_versions(cutoff)
+    last_pk = 0
+    total = 0
+    while True:
+        batch = list(qs.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        # The newest version of each tool is always kept
+        newest = dict(
+            Version.objects.filter(
+                content_type_id=get_tool_content_type_id(),
+                object_id__in={v.object_id for v in batch},
+            )
+            .values("object_id")
+            .annotate(newest=Max("pk"))
+            .values_list("object_id", "newest")
+        )
+        candidates = {}
+        for version in batch:
+            if version.pk != newest.get(version.object_id):
+                candidates.setdefault(version.revision_id, set()).add(
+                    version.pk
+                )
+
+        # Skip revisions that also changed tools we are keeping
+        counts = (
+            Version.objects.filter(
+                revision_id__in=candidates.keys(),
+                content_type_id=get_tool_content_type_id(),
+            )
+            .values("revision_id")
+            .annotate(tools=Count("pk"))
+            .values_list("revision_id", "tools")
+        )
+        revision_ids = [
+            rev_id
+            for rev_id, tools in counts
+            if tools == len(candidates[rev_id])
+        ]
+        if not revision_ids:
+            continue
+
+        total += len(revision_ids)
+        if dry_run:
+            continue
+        with transaction.atomic():
+            Revision.objects.filter(pk__in=revision_ids).delete()
+        logger.info("Pruned %d crawler revisions", len(revision_ids))
+    return total
@@ -0,0 +1,184 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import codecs
+import json
+
+
+WHITESPACE = " \t\n\r"
+
+
+class ContentTooLarge(Exception):
+    """Content exceeded a configured size limit."""
+
+
+def iter_limited(chunks, max_bytes, digest=None):
+    """Pass through byte chunks while enforcing a total size limit.
+
+    :param chunks: iterable of bytes
+    :param max_bytes: maximum number of bytes to allow
+    :param digest: optional hashlib object to update with each chunk
+    :raises ContentTooLarge: when more than max_bytes are seen
+    """
+    seen = 0
+    for chunk in chunks:
+        seen += len(chunk)
+        if seen > max_bytes:
+            raise ContentTooLarge(
+                "Document larger than {} bytes".format(max_bytes)
+            )
+        if digest is not None:
+            digest.update(chunk)
+        yield chunk
+
+
+class _Reader:
+    """Incrementally decoded text buffer over a series of byte chunks."""
+
+    def __init__(self, chunks, max_record_size):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.max_record_size = max_record_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk into the buffer.
+
+        :returns: False if there are no more chunks
+        """
+        if self.eof:
+            return False
+        # Drop text that has already been consumed. Anything left over is
+        # part of the record currently being decoded.
+        consumed = self.pos
+        self.buf = self.buf[consumed:]
+        self.pos = 0
+        if len(self.buf) > self.max_record_size:
+            raise ContentTooLarge(
+                "Record larger than {} characters".format(self.max_record_size)
+            )
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            self.buf += self.decoder.decode(b"", final=True)
+            return False
+        self.buf += self.decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character or None at EOF."""
+        while True:
+            while (
+                self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def error(self, msg):
+        """Build a decode error for the current position."""
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+
+def decode_json_records(chunks, max_record_size, decoder=None):
+    """Decode a JSON document read as a series of byte chunks.
+
+    If the document is a JSON array a list of its members is returned.
+    Any other JSON value is returned as a list containing that value. The
+    raw bytes are decoded incrementally so that the undecoded document is
+    never held in memory as a whole and oversized records are rejected as
+    soon as they are seen. All decoded records are kept until the whole
+    document has been read.
+
+    :param chunks: iterable of UTF-8 encoded bytes
+    :param max_record_size: maximum size of a single record, measured in
+        decoded characters
+    :param decoder: json.JSONDecoder to use
+    :raises json.JSONDecodeError: when the document is not valid JSON
+    :raises ContentTooLarge: when a single record exceeds max_record_size
+    """
+    return list(_iter_records(chunks, max_record_size, decoder))
+
+
+def _iter_records(chunks, max_record_size, decoder=None):
+    """Yield each top level record of a JSON document."""
+    decoder = decoder or json.JSONDecoder()
+    reader = _Reader(chunks, max_record_size)
+
+    first = reader.peek()
+    if first is None:
+        raise reader.error("Expecting value")
+
+    if first != "[":
+        # Not an array; the whole document is a single record
+        while reader.fill():
+            pass
+        start = reader.pos
+        if len(reader.buf) - start > max_record_size:
+            raise ContentTooLarge(
+                "Record larger than {} characters".format(max_record_size)
+            )
+        yield decoder.decode(reader.buf[start:])
+        return
+
+    reader.pos += 1
+    after_value = False
+    while True:
+        c = reader.peek()
+        if c is None:
+            raise reader.error("Unterminated array")
+        if after_value:
+            # A value must be followed by a separator or the end of the array
+            reader.pos += 1
+            if c == "]":
+                break
+            if c != ",":
+                raise reader.error("Expecting ',' delimiter")
+            after_value = False
+            continue
+        if c == "]" and first == "[":
+            # Empty array
+            reader.pos += 1
+            break
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(reader.buf, reader.pos)
+            except json.JSONDecodeError:
+                if reader.fill():
+                    continue
+                raise
+            if end == len(reader.buf) and reader.fill():
+                # A bare number or literal may continue in the next chunk
+                continue
+            break
+        if end - reader.pos > max_record_size:
+            raise ContentTooLarge(
+                "Record larger than {} characters".format(max_record_size)
+            )
+        reader.pos = end
+        after_value = True
+        first = None
+        yield value
+
+    if reader.peek() is not None:
+        raise reader.error("Extra data")
@@ -63,13 +63,11 @@ class LogCaptureContext:
             self.stream.close()
 
 
-class CaptureCrawlLogs(LogCaptureContext):
-    """Collect logs and store in the given model."""
+class CaptureThreadLogs(LogCaptureContext):
+    """Collect toolhub logs emitted by the current thread."""
 
-    def __init__(self, model, field="logs"):
+    def __init__(self):
         """Setup context."""
-        self.model = model
-        self.field = field
         thread_id = threading.get_ident()
         filters = [
             # Only collect records for toolhub classes
@@ -83,8 +81,24 @@ class CaptureCrawlLogs(LogCaptureContext):
             filters=filters,
         )
 
+
+class CaptureCrawlLogs(CaptureThreadLogs):
+    """Collect logs and store in the given model.
+
+    Captured logs are appended to any logs already present in the model's
+    field so that records collected by other threads (e.g. a fetch worker)
+    are preserved.
+    """
+
+    def __init__(self, model, field="logs"):
+        """Setup context."""
+        self.model = model
+        self.field = field
+        super().__init__()
+
     def __exit__(self, exc_type, exc_value, traceback):
         """Exit context."""
-        setattr(self.model, self.field, self.stream.getvalue())
+        prior = getattr(self.model, self.field, None) or ""
+        setattr(self.model, self.field, prior + self.stream.getvalue())
         self.model.save()
         super().__exit__(exc_type, exc_value, traceback)
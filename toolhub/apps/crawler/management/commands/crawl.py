@@ -15,8 +15,13 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import json
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
 
+from toolhub.apps.crawler import metrics
 from toolhub.apps.crawler.tasks import Crawler
 
 
@@ -34,11 +39,62 @@ class Command(BaseCommand):
             dest="print_report",
             help="Do not output run results to stdout.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Process all content even if unchanged since last crawl.",
+        )
+        parser.add_argument(
+            "--due",
+            action="store_true",
+            dest="due_only",
+            help="Only crawl urls which are due according to their schedule.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of due urls to crawl (requires --due).",
+        )
+        parser.add_argument(
+            "--metrics-file",
+            default=None,
+            help=(
+                "Write Prometheus metrics for the run to this textfile. "
+                "Defaults to CRAWLER_METRICS_TEXTFILE except for dry runs."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=(
+                "Fetch and compare content with stored tools without saving "
+                "anything. Outputs a JSON change report."
+            ),
+        )
 
     def handle(self, *args, **options):
         """Execute the command."""
-        spider = Crawler()
+        if options["limit"] is not None and not options["due_only"]:
+            raise CommandError("--limit can only be used with --due")
+        spider = Crawler(
+            force=options["force"],
+            due_only=options["due_only"],
+            limit=options["limit"],
+        )
+        metrics_file = options["metrics_file"]
+        if options["dry_run"]:
+            report = spider.diff()
+            if metrics_file:
+                metrics.write_textfile(metrics_file)
+            self.stdout.write(json.dumps(report, indent=2, sort_keys=True))
+            return
+
+        if metrics_file is None:
+            metrics_file = settings.CRAWLER_METRICS_TEXTFILE
         run = spider.crawl()
+        if metrics_file:
+            metrics.write_textfile(metrics_file)
         if options["print_report"]:
             self.stdout.write(repr(run))
             for url in run.urls.all():
@@ -0,0 +1,71 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from toolhub.apps.crawler.compaction import prune_revisions
+
+
+class Command(BaseCommand):
+    """Delete old unreviewed revisions made by the crawler."""
+
+    help = "Delete old unreviewed revisions made by the crawler"  # noqa: A003
+
+    def add_arguments(self, parser):
+        """Add CLI arguments."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=(
+                "Keep revisions newer than this many days. Defaults to "
+                "CRAWLER_REVISION_RETENTION_DAYS."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of versions to examine per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count revisions that would be deleted without deleting.",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        days = options["days"]
+        if days is None:
+            days = settings.CRAWLER_REVISION_RETENTION_DAYS
+        cutoff = timezone.now() - datetime.timedelta(days=days)
+        total = prune_revisions(
+            cutoff,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                "{} {} revisions".format(
+                    "Would prune" if options["dry_run"] else "Pruned", total
+                )
+            )
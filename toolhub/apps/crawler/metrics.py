@@ -0,0 +1,155 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+"""Prometheus metrics for the crawler.
+
+Metrics are collected in a dedicated registry so that the crawl management
+command can export them to a node_exporter textfile without also exporting
+unrelated process metrics. They are also registered with the default
+registry so that they appear in the django_prometheus `/metrics` output of
+any process that runs a crawl.
+"""
+import contextlib
+
+from django.db import connection
+
+import prometheus_client
+
+
+registry = prometheus_client.CollectorRegistry(auto_describe=True)
+
+_SIZE_BUCKETS = (
+    1024,
+    4 * 1024,
+    16 * 1024,
+    64 * 1024,
+    256 * 1024,
+    1024 * 1024,
+    4 * 1024 * 1024,
+    16 * 1024 * 1024,
+    float("inf"),
+)
+_QUERY_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+FETCH_SECONDS = prometheus_client.Histogram(
+    "toolhub_crawler_fetch_seconds",
+    "Time until response headers were received for a toolinfo url.",
+    ["host"],
+    registry=registry,
+)
+FETCHES = prometheus_client.Counter(
+    "toolhub_crawler_fetches_total",
+    "Toolinfo url fetches by response status code.",
+    ["host", "status"],
+    registry=registry,
+)
+RESPONSE_BYTES = prometheus_client.Histogram(
+    "toolhub_crawler_response_bytes",
+    "Size of toolinfo response bodies.",
+    ["host"],
+    buckets=_SIZE_BUCKETS,
+    registry=registry,
+)
+PARSE_SECONDS = prometheus_client.Histogram(
+    "toolhub_crawler_parse_seconds",
+    "Time spent reading and parsing toolinfo response bodies.",
+    ["host"],
+    registry=registry,
+)
+UPSERT_SECONDS = prometheus_client.Histogram(
+    "toolhub_crawler_upsert_seconds",
+    "Time spent creating and updating tools from a toolinfo url.",
+    ["host"],
+    registry=registry,
+)
+RATE_LIMIT_SECONDS = prometheus_client.Counter(
+    "toolhub_crawler_rate_limit_seconds",
+    "Time fetches spent waiting on the per-host rate limit.",
+    ["host"],
+    registry=registry,
+)
+DB_QUERIES = prometheus_client.Histogram(
+    "toolhub_crawler_db_queries",
+    "Database queries made while processing a toolinfo url.",
+    ["host"],
+    buckets=_QUERY_BUCKETS,
+    registry=registry,
+)
+TOOLS = prometheus_client.Counter(
+    "toolhub_crawler_tools_total",
+    "Tools seen by the crawler by outcome.",
+    ["change"],
+    registry=registry,
+)
+RUN_SECONDS = prometheus_client.Gauge(
+    "toolhub_crawler_run_seconds",
+    "Duration of the most recent crawler run.",
+    registry=registry,
+)
+LAST_RUN = prometheus_client.Gauge(
+    "toolhub_crawler_last_run_timestamp_seconds",
+    "Completion time of the most recent crawler run.",
+    registry=registry,
+)
+
+for _collector in (
+    FETCH_SECONDS,
+    FETCHES,
+    RESPONSE_BYTES,
+    PARSE_SECONDS,
+    UPSERT_SECONDS,
+    RATE_LIMIT_SECONDS,
+    DB_QUERIES,
+    TOOLS,
+    RUN_SECONDS,
+    LAST_RUN,
+):
+    try:
+        prometheus_client.REGISTRY.register(_collector)
+    except ValueError:
+        # Already registered (e.g. module reloaded)
+        pass
+
+
+class QueryCounter:
+    """Count database queries executed on a connection."""
+
+    def __init__(self):
+        """Initialize counter."""
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Wrap a query execution."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextlib.contextmanager
+def count_queries(host):
+    """Record the number of database queries made inside the context.
+
+    Only queries made by the calling thread are counted.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+    DB_QUERIES.labels(host=host).observe(counter.count)
+
+
+def write_textfile(path):
+    """Write the crawler metrics to a node_exporter textfile."""
+    prometheus_client.write_to_textfile(path, registry)
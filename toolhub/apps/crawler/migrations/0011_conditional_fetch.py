@@ -0,0 +1,48 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0010_auto_20211216_0847'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='runurl',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='runurl',
+            name='etag',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='runurl',
+            name='last_modified',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='runurl',
+            name='unchanged',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='url',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='url',
+            name='etag',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='url',
+            name='last_modified',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+    ]
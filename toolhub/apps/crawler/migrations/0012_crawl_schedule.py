@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0011_conditional_fetch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='url',
+            name='consecutive_failures',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='url',
+            name='crawl_interval',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='url',
+            name='next_crawl',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
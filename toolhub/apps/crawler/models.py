@@ -39,6 +39,26 @@ class Url(ExportModelOperationsMixin("url"), models.Model):
     created_date = models.DateTimeField(
         auto_now_add=True, blank=True, editable=False, db_index=True
     )
+    # Cache validators from the last successful crawl of this URL
+    etag = models.CharField(
+        blank=True, max_length=255, null=True, editable=False
+    )
+    last_modified = models.CharField(
+        blank=True, max_length=64, null=True, editable=False
+    )
+    content_hash = models.CharField(
+        blank=True, max_length=64, null=True, editable=False
+    )
+    # Crawl schedule maintained by the crawler. The interval is in seconds.
+    next_crawl = models.DateTimeField(
+        blank=True, null=True, editable=False, db_index=True
+    )
+    crawl_interval = models.PositiveIntegerField(
+        blank=True, null=True, editable=False
+    )
+    consecutive_failures = models.PositiveIntegerField(
+        default=0, editable=False
+    )
 
     def __str__(self):
         return self.url
@@ -94,6 +114,10 @@ class RunUrl(ExportModelOperationsMixin("runurl"), models.Model):
     elapsed_ms = models.PositiveIntegerField(default=0)
     schema = models.CharField(blank=True, max_length=32, null=True)
     valid = models.BooleanField(default=False)
+    etag = models.CharField(blank=True, max_length=255, null=True)
+    last_modified = models.CharField(blank=True, max_length=64, null=True)
+    content_hash = models.CharField(blank=True, max_length=64, null=True)
+    unchanged = models.BooleanField(default=False)
     tools = models.ManyToManyField(
         Tool,
         related_name="crawler_runs",
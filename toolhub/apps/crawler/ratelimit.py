@@ -0,0 +1,105 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens are added at `rate` per second up to a maximum of `burst`. Each
+    call to `acquire` takes one token, sleeping until one is available.
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        """Initialize a new instance.
+
+        :param rate: tokens added per second
+        :param burst: maximum number of tokens held
+        :param clock: monotonic time source
+        :param sleep: function used to wait for tokens
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = self.burst
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long to wait before using it."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Going into debt queues callers in the order they arrived
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Take a token, waiting for one to become available if needed.
+
+        :returns: number of seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """Token bucket rate limits keyed by hostname.
+
+    A rate of zero or less disables limiting.
+    """
+
+    def __init__(self, rate, burst, **kwargs):
+        """Initialize a new instance.
+
+        :param rate: requests per second allowed for each host
+        :param burst: requests allowed in a burst for each host
+        :param kwargs: additional arguments for each TokenBucket
+        """
+        self.rate = rate
+        self.burst = burst
+        self.kwargs = kwargs
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, host):
+        """Get the token bucket for a host."""
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(
+                    self.rate, self.burst, **self.kwargs
+                )
+            return self.buckets[host]
+
+    def acquire(self, host):
+        """Wait until a request to a host is allowed.
+
+        :returns: number of seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0
+        return self.bucket(host).acquire()
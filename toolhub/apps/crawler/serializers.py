@@ -71,6 +71,7 @@ class RunUrlSerializer(ModelSerializer):
             "elapsed_ms",
             "schema",
             "valid",
+            "unchanged",
             "logs",
         ]
 
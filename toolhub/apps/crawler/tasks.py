@@ -15,69 +15,380 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import concurrent.futures
+import datetime
+import hashlib
 import json
 import logging
+import time
+import urllib.parse
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import Error
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
 from django.utils import timezone
 
 import requests
+import requests.adapters
 
+from toolhub.apps.auditlog.buffering import buffered_logging
 from toolhub.apps.auditlog.context import auditlog_context
+from toolhub.apps.search.indexing import buffered_indexing
 from toolhub.apps.toolinfo.models import Tool
 
+from . import metrics
 from .logging import CaptureCrawlLogs
+from .logging import CaptureThreadLogs
 from .models import Run
 from .models import RunUrl
 from .models import Url
+from .ratelimit import HostRateLimiter
+from .decoding import ContentTooLarge
+from .decoding import decode_json_records
+from .decoding import iter_limited
 
 
 logger = logging.getLogger(__name__)
 
+# Comment used for revisions made by the crawler
+IMPORT_COMMENT = "Import from {}"
+
 
 class Crawler:
     """Toolinfo URL crawler."""
 
-    def __init__(self):
-        """Initialize a new instance."""
+    def __init__(
+        self,
+        max_workers=None,
+        max_workers_per_host=None,
+        force=False,
+        due_only=False,
+        limit=None,
+    ):
+        """Initialize a new instance.
+
+        :param force: ignore cache validators and process all content
+        :param due_only: only crawl URLs whose next crawl time has passed
+        :param limit: maximum number of URLs to crawl when due_only is set
+        """
         self.user_agent = (
             "Toolhub/1.0 ("
             "https://meta.wikimedia.org/wiki/Toolhub; "
             "toolhub.crawler@toolforge.org)"
         )
+        self.max_workers = max(1, max_workers or settings.CRAWLER_MAX_WORKERS)
+        self.max_workers_per_host = max(
+            1, max_workers_per_host or settings.CRAWLER_MAX_WORKERS_PER_HOST
+        )
+        # Limit on URLs fetched ahead of the one being processed
+        self.result_window = 2 * self.max_workers
+        self.force = force
+        self.max_document_size = settings.CRAWLER_MAX_DOCUMENT_SIZE
+        self.max_record_size = settings.CRAWLER_MAX_RECORD_SIZE
+        self.due_only = due_only
+        self.limit = limit
+        self.min_interval = settings.CRAWLER_MIN_INTERVAL
+        self.max_interval = settings.CRAWLER_MAX_INTERVAL
+        self.max_backoff = settings.CRAWLER_MAX_BACKOFF
+        self.rate_limiter = HostRateLimiter(
+            settings.CRAWLER_HOST_RATE, settings.CRAWLER_HOST_BURST
+        )
+        self.session = self.make_session()
+
+    def make_session(self):
+        """Create a pooled HTTP session shared by all fetch workers.
+
+        Connections are kept alive and reused for each host so that a run
+        does not pay for a new TCP and TLS handshake on every request.
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=settings.CRAWLER_POOL_HOSTS,
+            pool_maxsize=self.max_workers_per_host,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["user-agent"] = self.user_agent
+        return session
 
     def crawl(self):  # noqa: R0912
         """Crawl all URLs and create/update tool records."""
         logger.info("Starting crawl")
+        started = time.monotonic()
         run = Run()
         run.save()
+        run_urls = [RunUrl(run=run, url=url) for url in self.get_active_urls()]
         names_seen_in_run = {}
+        if self.due_only:
+            names_seen_in_run = self.names_claimed_by_idle_urls(run_urls)
 
-        for url in self.get_active_urls():
-            # FIXME: rate limiting for outbound requests?
-            run_url = RunUrl(run=run, url=url)
-            with CaptureCrawlLogs(run_url):
-                self.process_url(run_url, names_seen_in_run)
+        # Send search index updates for the whole run in one bulk request
+        with buffered_indexing():
+            for run_url, toolinfo_list in self.fetch_all(run_urls):
+                with CaptureCrawlLogs(run_url), buffered_logging():
+                    with metrics.count_queries(self.host(run_url.url.url)):
+                        self.process_url(
+                            run_url, names_seen_in_run, toolinfo_list
+                        )
 
         run.end_date = timezone.now()
         run.save()
+        metrics.RUN_SECONDS.set(time.monotonic() - started)
+        metrics.LAST_RUN.set(run.end_date.timestamp())
         return run
 
-    def process_url(self, run_url, seen):
-        """Crawl a URL and update the run."""
-        logger.info("Crawling %s", run_url.url.url)
+    def diff(self):
+        """Report the changes a crawl would make without saving anything.
+
+        URLs are fetched, validated and normalized exactly as in `crawl`,
+        then compared with the stored tools. No Run, RunUrl, Url, Tool,
+        revision or search index changes are written.
+
+        :returns: change report
+        :rtype: dict
+        """
+        logger.info("Starting dry run crawl")
+        run = Run()
+        run_urls = [RunUrl(run=run, url=url) for url in self.get_active_urls()]
+        names_seen_in_run = {}
+        if self.due_only:
+            names_seen_in_run = self.names_claimed_by_idle_urls(run_urls)
+
+        report = {
+            "urls": [],
+            "summary": {
+                "created": 0,
+                "updated": 0,
+                "deleted": 0,
+                "unchanged": 0,
+                "errors": 0,
+            },
+        }
+        for run_url, toolinfo_list in self.fetch_all(run_urls):
+            entry = self.diff_url(run_url, names_seen_in_run, toolinfo_list)
+            report["urls"].append(entry)
+            summary = report["summary"]
+            summary["created"] += len(entry["created"])
+            summary["updated"] += len(entry["updated"])
+            summary["deleted"] += len(entry["deleted"])
+            summary["unchanged"] += entry["unchanged_tools"]
+            summary["errors"] += len(entry["errors"])
+        return report
+
+    def fetch_all(self, run_urls):
+        """Fetch URLs concurrently and yield their content in order.
+
+        Results are yielded in the same order as `run_urls` so that the
+        T278065 "first url wins" rule is deterministic. Each RunUrl has its
+        fetch logs attached when it is yielded.
+
+        Work is scheduled per host: a URL is only handed to the thread pool
+        when its host has a free slot, so URLs waiting on a busy host do not
+        hold threads that other hosts could use. At most `result_window`
+        URLs past the next one to be yielded are fetched or held in memory
+        at once.
+
+        :returns: generator of (run_url, toolinfo_list) tuples
+        """
+        queues = collections.OrderedDict()
+        for i, run_url in enumerate(run_urls):
+            queues.setdefault(self.host(run_url.url.url), []).append(i)
+        for queue in queues.values():
+            queue.reverse()
+        active = collections.Counter()
+        running = {}
+        done = {}
+        next_index = 0
+
+        def submit_ready(pool):
+            """Submit the next URL of each host with a free slot."""
+            limit = next_index + self.result_window
+            while len(running) < self.max_workers:
+                ready = [
+                    queue[-1]
+                    for host, queue in queues.items()
+                    if queue
+                    and queue[-1] < limit
+                    and active[host] < self.max_workers_per_host
+                ]
+                if not ready:
+                    return
+                i = min(ready)
+                host = self.host(run_urls[i].url.url)
+                queues[host].pop()
+                active[host] += 1
+                future = pool.submit(self.fetch_url, run_urls[i])
+                running[future] = (i, host)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="crawler",
+        ) as pool:
+            try:
+                while next_index < len(run_urls):
+                    submit_ready(pool)
+                    if next_index not in done:
+                        finished, _ = concurrent.futures.wait(
+                            running,
+                            return_when=concurrent.futures.FIRST_COMPLETED,
+                        )
+                        for future in finished:
+                            i, host = running.pop(future)
+                            active[host] -= 1
+                            done[i] = future.result()
+                        continue
+                    run_url = run_urls[next_index]
+                    toolinfo_list, run_url.logs = done.pop(next_index)
+                    next_index += 1
+                    yield run_url, toolinfo_list
+            finally:
+                for future in running:
+                    future.cancel()
+                self.session.close()
+
+    def host(self, raw_url):
+        """Get the hostname of a URL for grouping requests and metrics."""
+        return urllib.parse.urlsplit(raw_url).hostname or ""
+
+    def fetch_url(self, run_url):
+        """Fetch a URL's content and collect the logs emitted while doing so.
+
+        This method is safe to call from a worker thread. It does not touch
+        the database. Concurrent fetches per host are limited by the
+        scheduling in `fetch_all`.
+        """
+        host = self.host(run_url.url.url)
+        with CaptureThreadLogs() as stream:
+            waited = self.rate_limiter.acquire(host)
+            if waited:
+                logger.info("Rate limited for %.2fs", waited)
+                metrics.RATE_LIMIT_SECONDS.labels(host=host).inc(waited)
+            logger.info("Crawling %s", run_url.url.url)
+            toolinfo_list = self.fetch_content(run_url)
+            logs = stream.getvalue()
+        metrics.FETCHES.labels(host=host, status=run_url.status_code).inc()
+        return toolinfo_list, logs
+
+    def process_url(self, run_url, seen, toolinfo_list=None):
+        """Crawl a URL and update the run.
+
+        If `toolinfo_list` is not provided the URL will be fetched first.
+        """
+        if toolinfo_list is None:
+            logger.info("Crawling %s", run_url.url.url)
+            toolinfo_list = self.fetch_content(run_url)
+        if run_url.unchanged:
+            self.process_unchanged_url(run_url, seen)
+            self.update_url_state(run_url)
+            return
         expected_names = self.toolinfo_in_last_run(run_url.url)
-        toolinfo_list = self.fetch_content(run_url)
+        batch = self.collect_toolinfo(
+            run_url, seen, toolinfo_list, expected_names
+        )
         run_url.save()
 
+        self.upsert_toolinfo(run_url, batch, expected_names)
+
+        if len(expected_names) > 0:
+            logger.info(
+                "Expected but did not find toolinfo: %s", expected_names
+            )
+            if self.should_delete_missing(run_url):
+                # T271128: delete missing tools
+                reason = "Toolinfo removed from {}"
+                if run_url.status_code == 404:
+                    reason = "Url {} not found during crawl"
+                try:
+                    with auditlog_context(
+                        run_url.url.created_by, reason.format(run_url.url.url)
+                    ):
+                        Tool.objects.filter(name__in=expected_names).delete()
+                    metrics.TOOLS.labels(change="deleted").inc(
+                        len(expected_names)
+                    )
+                except Error:
+                    logger.exception(
+                        "Failed to delete missing tools: %s", expected_names
+                    )
+
+        self.update_url_state(run_url)
+
+    def diff_url(self, run_url, seen, toolinfo_list):
+        """Compare a fetched URL's content with the stored tools.
+
+        :returns: change report for the URL
+        :rtype: dict
+        """
+        entry = {
+            "url": run_url.url.url,
+            "status_code": run_url.status_code,
+            "valid": True,
+            "unchanged": run_url.unchanged,
+            "created": [],
+            "updated": {},
+            "deleted": [],
+            "unchanged_tools": 0,
+            "errors": [],
+        }
+        expected_names = self.toolinfo_in_last_run(run_url.url)
+        if run_url.unchanged:
+            # Claim the tools that a crawl would carry forward
+            for name in sorted(expected_names):
+                if name not in seen:
+                    seen[name] = run_url.url.url
+                    entry["unchanged_tools"] += 1
+            entry["valid"] = run_url.valid
+            return entry
+
+        batch = self.collect_toolinfo(
+            run_url, seen, toolinfo_list, expected_names
+        )
+        if batch:
+            results, errors = Tool.objects.diff_toolinfo_many(
+                batch, run_url.url.created_by, Tool.ORIGIN_CRAWLER
+            )
+            for tool, created, changed_fields in results:
+                expected_names.discard(tool.name)
+                if created:
+                    entry["created"].append(tool.name)
+                elif changed_fields:
+                    entry["updated"][tool.name] = changed_fields
+                else:
+                    entry["unchanged_tools"] += 1
+            for record, e in errors:
+                run_url.valid = False
+                entry["errors"].append(
+                    {"name": record["name"], "error": " ".join(e.messages)}
+                )
+
+        if expected_names and self.should_delete_missing(run_url):
+            entry["deleted"] = sorted(expected_names)
+        entry["valid"] = run_url.valid
+        return entry
+
+    def should_delete_missing(self, run_url):
+        """Check if tools missing from a URL's content should be deleted."""
+        return 200 <= run_url.status_code <= 299 or run_url.status_code == 404
+
+    def collect_toolinfo(self, run_url, seen, toolinfo_list, expected_names):
+        """Validate and normalize the toolinfo records fetched from a URL.
+
+        Records that are invalid or already claimed by an earlier URL in the
+        run are skipped. The URL is marked invalid if any record is invalid.
+
+        :returns: list of records to create or update
+        """
+        batch = []
         for toolinfo in toolinfo_list:
             if not self.validate_toolinfo(toolinfo):
-                if run_url.valid:
-                    # Mark URL as invalid if any of it's contained tools is
-                    # invalid in this run.
-                    run_url.valid = False
-                    run_url.save()
+                # Mark URL as invalid if any of it's contained tools is
+                # invalid in this run.
+                run_url.valid = False
                 continue
 
             logger.info(
@@ -99,52 +410,162 @@ class Crawler:
                 expected_names.discard(toolinfo["name"])
                 continue
             seen[toolinfo["name"]] = run_url.url.url
+            batch.append(toolinfo)
+        return batch
 
-            try:
-                obj, created, updated = Tool.objects.from_toolinfo(
-                    toolinfo,
-                    run_url.url.created_by,
-                    Tool.ORIGIN_CRAWLER,
-                    "Import from {}".format(run_url.url.url),
-                )
-                if created:
-                    run_url.run.new_tools += 1
-                if updated:
-                    run_url.run.updated_tools += 1
-                run_url.run.total_tools += 1
-                run_url.tools.add(obj)
-                expected_names.discard(obj.name)
-
-            except (
-                Error,
-                ValidationError,
-            ):
-                logger.exception(
-                    "Failed to upsert `%s` from %s",
-                    toolinfo["name"],
-                    run_url.url.url,
-                )
-                run_url.valid = False
-                run_url.save()
+    def upsert_toolinfo(self, run_url, records, expected_names):
+        """Create or update tools from a URL's toolinfo records."""
+        if not records:
+            return
+        creator = run_url.url.created_by
+        comment = IMPORT_COMMENT.format(run_url.url.url)
+        host = self.host(run_url.url.url)
+        with metrics.UPSERT_SECONDS.labels(host=host).time():
+            results, errors = self.upsert_records(records, creator, comment)
 
-        if len(expected_names) > 0:
-            logger.info(
-                "Expected but did not find toolinfo: %s", expected_names
+        objs = []
+        for obj, created, updated in results:
+            if created:
+                run_url.run.new_tools += 1
+                metrics.TOOLS.labels(change="created").inc()
+            elif updated:
+                metrics.TOOLS.labels(change="updated").inc()
+            else:
+                metrics.TOOLS.labels(change="unchanged").inc()
+            if updated:
+                run_url.run.updated_tools += 1
+            run_url.run.total_tools += 1
+            objs.append(obj)
+            expected_names.discard(obj.name)
+        run_url.tools.add(*objs)
+
+        for record, e in errors:
+            logger.error(
+                "Failed to upsert `%s` from %s",
+                record["name"],
+                run_url.url.url,
+                exc_info=e,
             )
-            if 200 <= run_url.status_code <= 299 or run_url.status_code == 404:
-                # T271128: delete missing tools
-                reason = "Toolinfo removed from {}"
-                if run_url.status_code == 404:
-                    reason = "Url {} not found during crawl"
+            run_url.valid = False
+        if errors:
+            metrics.TOOLS.labels(change="failed").inc(len(errors))
+            run_url.save()
+
+    def upsert_records(self, records, creator, comment):
+        """Create or update tools, falling back to one record at a time."""
+        try:
+            results, errors = Tool.objects.from_toolinfo_many(
+                records, creator, Tool.ORIGIN_CRAWLER, comment
+            )
+        except Error:
+            logger.exception(
+                "Bulk upsert failed; retrying records individually"
+            )
+            results = []
+            errors = []
+            for record in records:
                 try:
-                    with auditlog_context(
-                        run_url.url.created_by, reason.format(run_url.url.url)
-                    ):
-                        Tool.objects.filter(name__in=expected_names).delete()
-                except Error:
-                    logger.exception(
-                        "Failed to delete missing tools: %s", expected_names
+                    results.append(
+                        Tool.objects.from_toolinfo(
+                            record, creator, Tool.ORIGIN_CRAWLER, comment
+                        )
                     )
+                except (Error, ValidationError) as e:
+                    errors.append((record, e))
+        return results, errors
+
+    def process_unchanged_url(self, run_url, seen):
+        """Carry forward the tools from the last run of an unchanged URL."""
+        logger.info("Content unchanged at %s", run_url.url.url)
+        last_run = run_url.url.crawler_runs.order_by("-id").first()
+        run_url.save()
+        if last_run is None:
+            # Without a prior run there is nothing to carry forward. Forget
+            # the validators so that the next run processes the content.
+            logger.warning(
+                "No prior run found for unchanged url %s", run_url.url.url
+            )
+            run_url.valid = False
+            run_url.save()
+            return
+
+        qs = last_run.tools.filter(deleted__isnull=True).distinct()
+        for tool in qs:
+            if tool.name in seen:
+                # T278065: Reject updates from multiple urls in same run
+                logger.error(
+                    "Toolinfo %s already seen at %s",
+                    tool.name,
+                    seen[tool.name],
+                )
+                continue
+            seen[tool.name] = run_url.url.url
+            run_url.run.total_tools += 1
+            run_url.tools.add(tool)
+            metrics.TOOLS.labels(change="unchanged").inc()
+
+    def update_url_state(self, run_url):
+        """Update cache validators and crawl schedule for a crawled URL."""
+        url = run_url.url
+        state = self.get_validators(run_url)
+        state.update(self.get_schedule(run_url))
+        changed = {k: v for k, v in state.items() if getattr(url, k) != v}
+        if not changed:
+            return
+        for field, value in changed.items():
+            setattr(url, field, value)
+        # Use a queryset update to avoid creating an auditlog entry for
+        # bookkeeping changes made by the crawler.
+        Url.objects.filter(pk=url.pk).update(**changed)
+
+    def get_validators(self, run_url):
+        """Get cache validators to send with the next request for a URL.
+
+        Validators are only kept when all of the URL's content was processed
+        successfully. Otherwise they are cleared so that the next run will
+        fetch and process the content again.
+        """
+        if run_url.valid and 200 <= run_url.status_code <= 399:
+            return {
+                "etag": run_url.etag,
+                "last_modified": run_url.last_modified,
+                "content_hash": run_url.content_hash,
+            }
+        return {
+            "etag": None,
+            "last_modified": None,
+            "content_hash": None,
+        }
+
+    def get_schedule(self, run_url):
+        """Compute when a URL should next be crawled.
+
+        URLs whose content is unchanged have their polling interval doubled
+        up to CRAWLER_MAX_INTERVAL. Changed content resets the interval to
+        CRAWLER_MIN_INTERVAL. Failed fetches or invalid content back off
+        exponentially up to CRAWLER_MAX_BACKOFF without changing the
+        interval.
+        """
+        url = run_url.url
+        interval = url.crawl_interval or self.min_interval
+        if run_url.valid:
+            failures = 0
+            if run_url.unchanged:
+                interval = min(interval * 2, self.max_interval)
+            else:
+                interval = self.min_interval
+            delay = interval
+        else:
+            failures = url.consecutive_failures + 1
+            delay = min(
+                self.min_interval * 2 ** min(failures, 32),
+                self.max_backoff,
+            )
+        return {
+            "consecutive_failures": failures,
+            "crawl_interval": interval,
+            "next_crawl": timezone.now() + datetime.timedelta(seconds=delay),
+        }
 
     def toolinfo_in_last_run(self, url):
         """Find the toolinfo records in the most recent run for a url."""
@@ -170,38 +591,170 @@ class Crawler:
         return is_valid
 
     def get_active_urls(self):
-        """Get all URLs ready for crawling."""
-        # FIXME: filter out "failed" urls?
-        return Url.objects.all()
+        """Get all URLs ready for crawling.
+
+        When `due_only` is set only URLs whose next scheduled crawl time has
+        passed are returned. If `limit` is also set the most overdue URLs are
+        chosen. URLs are always returned in a stable order so that the
+        T278065 "first url wins" rule is deterministic.
+        """
+        qs = Url.objects.all()
+        if self.due_only:
+            qs = qs.filter(
+                Q(next_crawl__isnull=True) | Q(next_crawl__lte=timezone.now())
+            )
+            if self.limit:
+                most_overdue = qs.order_by(
+                    F("next_crawl").asc(nulls_first=True), "id"
+                ).values_list("pk", flat=True)[: self.limit]
+                qs = Url.objects.filter(pk__in=list(most_overdue))
+        return qs.select_related("created_by").order_by("id")
+
+    def names_claimed_by_idle_urls(self, run_urls):
+        """Find tool names claimed by URLs that are not part of this run.
+
+        Tools found at a URL in its most recent run stay claimed by that URL
+        until it is crawled again. Seeding the seen names with these claims
+        keeps a partial crawl from moving a tool to a different URL.
+        """
+        active = [run_url.url.pk for run_url in run_urls]
+        latest = (
+            RunUrl.objects.filter(url=OuterRef("pk"))
+            .order_by("-id")
+            .values("pk")[:1]
+        )
+        last_run_urls = (
+            Url.objects.exclude(pk__in=active)
+            .annotate(last_run_url=Subquery(latest))
+            .exclude(last_run_url__isnull=True)
+            .values_list("last_run_url", flat=True)
+        )
+        qs = Tool.objects.filter(
+            crawler_runs__pk__in=list(last_run_urls)
+        ).values_list("name", "crawler_runs__url__url")
+        return dict(qs)
+
+    def parse_content(self, response, digest, host=""):
+        """Parse the toolinfo records in a response body.
+
+        The body is read and decoded in chunks so that the raw document is
+        never held in memory as a whole and the document and record size
+        limits are enforced while reading. The decoded records are returned
+        as a list only if the whole document parses. A partial list would
+        cause tools missing from the unread remainder to be deleted.
+
+        :param response: response opened with stream=True
+        :param digest: hashlib object updated with the raw body
+        :param host: hostname used to label metrics
+        :raises json.JSONDecodeError: when the body is not valid JSON
+        :raises ContentTooLarge: when the body or a record is too large
+        """
+        try:
+            length = int(response.headers.get("content-length", 0))
+        except ValueError:
+            length = 0
+        if length > self.max_document_size:
+            raise ContentTooLarge(
+                "Document larger than {} bytes".format(self.max_document_size)
+            )
+        counter = _ByteCounter(response.iter_content(chunk_size=64 * 1024))
+        try:
+            with metrics.PARSE_SECONDS.labels(host=host).time():
+                chunks = iter_limited(counter, self.max_document_size, digest)
+                return decode_json_records(chunks, self.max_record_size)
+        finally:
+            response.close()
+            metrics.RESPONSE_BYTES.labels(host=host).observe(counter.count)
+
+    def get_request_headers(self, url):
+        """Get the HTTP headers to send when fetching a URL."""
+        headers = {"user-agent": self.user_agent}
+        if not self.force:
+            if url.url.etag:
+                headers["if-none-match"] = url.url.etag
+            if url.url.last_modified:
+                headers["if-modified-since"] = url.url.last_modified
+        return headers
+
+    def get_validator(self, response, header, default):
+        """Get a cache validator header to store for the next crawl.
+
+        Values that do not fit in the database column are dropped so that
+        the URL is fetched unconditionally next time.
+
+        :param response: response to read the header from
+        :param header: "etag" or "last-modified"
+        :param default: value to use when the header is absent
+        """
+        value = response.headers.get(header)
+        if not value:
+            return default
+        field = header.replace("-", "_")
+        max_length = RunUrl._meta.get_field(field).max_length
+        if len(value) > max_length:
+            logger.warning(
+                "Ignoring %s header longer than %d characters from %s",
+                header,
+                max_length,
+                response.url,
+            )
+            return None
+        return value
 
     def fetch_content(self, url):
         """Crawl a URL and return it's content."""
         raw_url = url.url.url
+        host = self.host(raw_url)
         url.status_code = 999
         try:
-            r = requests.get(
+            r = self.session.get(
                 raw_url,
-                headers={"user-agent": self.user_agent},
+                headers=self.get_request_headers(url),
                 # T288536: 5s connect, 33s read (time between bytes)
                 timeout=(5, 33),
+                stream=True,
             )
 
             url.status_code = r.status_code
             if r.history:
                 url.redirected = True
-            url.elapsed_ms = r.elapsed.microseconds
+            url.elapsed_ms = int(r.elapsed.total_seconds() * 1000)
+            metrics.FETCH_SECONDS.labels(host=host).observe(
+                r.elapsed.total_seconds()
+            )
+            url.etag = self.get_validator(r, "etag", url.url.etag)
+            url.last_modified = self.get_validator(
+                r, "last-modified", url.url.last_modified
+            )
+            if not r.ok or r.status_code == 304:
+                # Release the connection without reading the body
+                r.close()
+            if r.status_code == 304:
+                url.content_hash = url.url.content_hash
+                url.unchanged = True
+                url.valid = True
+                return []
+
             if r.ok:
+                digest = hashlib.sha256()
                 try:
-                    tools = r.json()
+                    tools = self.parse_content(r, digest, host)
                     # FIXME: validate schema for entire file?
-                    url.valid = True
-                    if not isinstance(tools, list):
-                        tools = [tools]
-                    return tools
                 except json.decoder.JSONDecodeError:
                     logger.exception("Failed to parse JSON from %s", raw_url)
                     url.valid = False
                     return []
+                except ContentTooLarge as e:
+                    logger.error("Refusing content from %s: %s", raw_url, e)
+                    url.valid = False
+                    return []
+
+                url.content_hash = digest.hexdigest()
+                url.valid = True
+                if not self.force and url.url.content_hash == url.content_hash:
+                    url.unchanged = True
+                    return []
+                return tools
 
         except requests.ConnectTimeout:
             logger.exception("Timeout connecting to %s", raw_url)
@@ -217,3 +770,16 @@ class Crawler:
 
         logger.error("Failed to fetch %s: %s", url.url, r)
         return []
+
+
+class _ByteCounter:
+    """Count the bytes passing through an iterable of byte chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.count = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.count += len(chunk)
+            yield chunk
@@ -0,0 +1,142 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from reversion.models import Revision
+from reversion.models import Version
+
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.versioned import diffs
+from toolhub.apps.versioned.context import reversion_context
+from toolhub.apps.versioned.models import Change
+from toolhub.tests import TestCase
+
+from ..compaction import prune_revisions
+from ..tasks import IMPORT_COMMENT
+
+
+class PruneRevisionsTest(TestCase):
+    """Test prune_revisions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup for all tests in this TestCase."""
+        cls.user = cls._user("user")
+        cls.toolinfo = cls._load_json("crawler_happy_path.json")
+        comment = IMPORT_COMMENT.format("https://example.org/toolinfo.json")
+        for i in range(4):
+            record = dict(cls.toolinfo, title="Title {}".format(i))
+            Tool.objects.from_toolinfo_many(
+                [record], cls.user, Tool.ORIGIN_CRAWLER, comment
+            )
+        cls.tool = Tool.objects.get(name=cls.toolinfo["name"])
+
+    def versions(self):
+        """Get the tool's versions, oldest first."""
+        return list(Version.objects.get_for_object(self.tool).order_by("pk"))
+
+    def backdate(self, days=100):
+        """Make all revisions older."""
+        Revision.objects.update(
+            date_created=timezone.now() - datetime.timedelta(days=days)
+        )
+
+    def test_prune(self):
+        """Test unreviewed old crawler revisions are deleted."""
+        versions = self.versions()
+        self.assertEqual(len(versions), 4)
+        self.backdate()
+        patrolled = versions[1].revision.meta
+        patrolled.patrolled = True
+        patrolled.save()
+
+        cutoff = timezone.now() - datetime.timedelta(days=90)
+        self.assertEqual(prune_revisions(cutoff, dry_run=True), 2)
+        self.assertEqual(len(self.versions()), 4)
+
+        self.assertEqual(prune_revisions(cutoff, batch_size=2), 2)
+        remaining = self.versions()
+        self.assertEqual(
+            [v.pk for v in remaining], [versions[1].pk, versions[3].pk]
+        )
+        self.assertFalse(
+            Change.objects.filter(
+                version_id__in=[versions[0].pk, versions[2].pk]
+            ).exists()
+        )
+        # Annotations saved with the pruned revisions are gone too
+        self.assertEqual(
+            Version.objects.filter(
+                revision_id__in=[v.revision_id for v in remaining]
+            ).count(),
+            4,
+        )
+        self.assertEqual(
+            list(diffs.get_patch(remaining[0], remaining[1])),
+            [{"op": "replace", "path": "/title", "value": "Title 3"}],
+        )
+
+    def test_recent_kept(self):
+        """Test revisions inside the retention window are kept."""
+        cutoff = timezone.now() - datetime.timedelta(days=90)
+        self.assertEqual(prune_revisions(cutoff), 0)
+        self.assertEqual(len(self.versions()), 4)
+
+    def test_lookalike_comment_kept(self):
+        """Test edits by people with a crawler-like comment are kept."""
+        comment = IMPORT_COMMENT.format("https://example.org/toolinfo.json")
+        record = dict(self.toolinfo, name="api-tool")
+        for i in range(3):
+            record["title"] = "API {}".format(i)
+            Tool.objects.from_toolinfo_many(
+                [record.copy()], self.user, Tool.ORIGIN_API, comment
+            )
+        api_tool = Tool.objects.get(name="api-tool")
+
+        other = self._user("other")
+        with reversion_context(other, comment):
+            self.tool.title = "Edited"
+            self.tool.save()
+        Tool.objects.from_toolinfo_many(
+            [dict(self.toolinfo, title="Newest")],
+            self.user,
+            Tool.ORIGIN_CRAWLER,
+            comment,
+        )
+        self.backdate()
+
+        cutoff = timezone.now() - datetime.timedelta(days=30)
+        # Only the crawler revisions of the crawler managed tool
+        self.assertEqual(prune_revisions(cutoff), 4)
+        self.assertEqual(Version.objects.get_for_object(api_tool).count(), 3)
+        versions = self.versions()
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(versions[0].revision.user, other)
+        self.assertEqual(versions[1].revision.user, self.user)
+
+    def test_command(self):
+        """Test prune_crawler_revisions command."""
+        self.backdate()
+        out = StringIO()
+        call_command("prune_crawler_revisions", "--days=30", stdout=out)
+        self.assertIn("Pruned 3 revisions", out.getvalue())
+        self.assertEqual(len(self.versions()), 1)
@@ -0,0 +1,81 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import json
+
+from django.test import SimpleTestCase
+
+from ..decoding import ContentTooLarge
+from ..decoding import decode_json_records
+from ..decoding import iter_limited
+
+
+def chunked(data, size=3):
+    """Split a string into utf-8 encoded chunks."""
+    raw = data.encode("utf-8")
+    return [raw[i:][:size] for i in range(0, len(raw), size)]
+
+
+class DecodeJsonRecordsTest(SimpleTestCase):
+    """Test decode_json_records."""
+
+    def parse(self, data, size=3, max_record_size=1024):
+        """Parse a string split into chunks."""
+        return decode_json_records(chunked(data, size), max_record_size)
+
+    def test_array(self):
+        """Array members are returned as records."""
+        data = [{"name": "a", "n": 1}, {"name": "bé"}, 12345, True, []]
+        for size in (1, 2, 7, 1024):
+            self.assertEqual(self.parse(json.dumps(data), size), data)
+
+    def test_single_value(self):
+        """A bare object is returned as a single record."""
+        self.assertEqual(self.parse(' {"name": "a"} '), [{"name": "a"}])
+
+    def test_empty_array(self):
+        """An empty array has no records."""
+        self.assertEqual(self.parse(" [ ] "), [])
+
+    def test_bom(self):
+        """A leading byte order mark is ignored."""
+        chunks = [b"\xef\xbb", b"\xbf[1]"]
+        self.assertEqual(decode_json_records(chunks, 10), [1])
+
+    def test_malformed(self):
+        """Malformed documents raise JSONDecodeError."""
+        for data in ("", "[1,", "[1 2]", "[1,]", "[1] x", "<html>", "[{]"):
+            with self.subTest(data=data):
+                with self.assertRaises(json.JSONDecodeError):
+                    self.parse(data)
+
+    def test_record_too_large(self):
+        """A single record larger than the limit is rejected."""
+        data = json.dumps([{"a": "x" * 10}, {"b": "y" * 100}])
+        with self.assertRaises(ContentTooLarge):
+            self.parse(data, max_record_size=50)
+        self.assertEqual(len(self.parse(data, max_record_size=150)), 2)
+
+
+class IterLimitedTest(SimpleTestCase):
+    """Test iter_limited."""
+
+    def test_limit(self):
+        """Exceeding the limit raises ContentTooLarge."""
+        self.assertEqual(list(iter_limited([b"ab", b"cd"], 4)), [b"ab", b"cd"])
+        with self.assertRaises(ContentTooLarge):
+            list(iter_limited([b"ab", b"cd", b"e"], 4))
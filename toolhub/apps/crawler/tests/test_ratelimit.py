@@ -0,0 +1,99 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.test import SimpleTestCase
+
+from ..ratelimit import HostRateLimiter
+from ..ratelimit import TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        """Get the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock."""
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Test TokenBucket."""
+
+    def setUp(self):
+        """Initialize common test conditions."""
+        self.clock = FakeClock()
+
+    def test_burst(self):
+        """Burst requests do not wait."""
+        bucket = TokenBucket(1, 3, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_waits_for_tokens(self):
+        """Requests past the burst wait for the rate."""
+        bucket = TokenBucket(2, 1, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0.5)
+        self.assertEqual(bucket.acquire(), 0.5)
+        self.assertEqual(self.clock.slept, [0.5, 0.5])
+
+    def test_concurrent_reservations_queue(self):
+        """Callers that arrive together are spaced out."""
+        bucket = TokenBucket(1, 1, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 1)
+        self.assertEqual(bucket.reserve(), 2)
+
+    def test_refill_capped(self):
+        """Idle time does not accumulate more than burst tokens."""
+        bucket = TokenBucket(1, 2, clock=self.clock, sleep=self.clock.sleep)
+        self.clock.now += 100
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 1)
+
+
+class HostRateLimiterTest(SimpleTestCase):
+    """Test HostRateLimiter."""
+
+    def test_per_host(self):
+        """Each host has its own bucket."""
+        clock = FakeClock()
+        limiter = HostRateLimiter(1, 1, clock=clock, sleep=clock.sleep)
+        self.assertEqual(limiter.acquire("example.org"), 0)
+        self.assertEqual(limiter.acquire("example.net"), 0)
+        self.assertEqual(limiter.acquire("example.org"), 1)
+        self.assertIs(
+            limiter.bucket("example.org"), limiter.bucket("example.org")
+        )
+
+    def test_disabled(self):
+        """A rate of zero disables limiting."""
+        limiter = HostRateLimiter(0, 1)
+        for _ in range(10):
+            self.assertEqual(limiter.acquire("example.org"), 0)
+        self.assertEqual(limiter.buckets, {})
@@ -15,16 +15,29 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+import io
+import json
 import os
+import tempfile
+import threading
+import types
+from unittest import mock
+
+from django.core.management import CommandError
+from django.core.management import call_command
 
 from django.test import TestCase
+from django.utils import timezone
 
 import requests_mock
 
 from toolhub.apps.toolinfo.models import Tool
 from toolhub.apps.user.models import ToolhubUser
 
+from .. import metrics
 from .. import tasks
+from ..models import Run
 from ..models import Url
 
 
@@ -250,3 +263,416 @@ class CrawlerTestCase(TestCase):
             self.v0_single["author"],
             Tool.objects.get(name=self.v0_single["name"]).author[0]["name"],
         )
+
+    def test_serial_crawl(self, rmock):
+        """When concurrency is disabled, the crawl still works."""
+        self.setup_url_fixture(rmock, json=[self.v0_single])
+        f2 = self.v0_single.copy()
+        f2["name"] = "another-tool"
+        self.setup_url_fixture(rmock, url="http://example.net", json=[f2])
+
+        crawler = tasks.Crawler(max_workers=1, max_workers_per_host=1)
+        run = crawler.crawl()
+
+        self.assertRunResult(run, new=2, urls=2)
+
+    def test_fetch_logs_captured(self, rmock):
+        """Logs emitted by fetch workers are stored with the RunUrl."""
+        self.setup_url_fixture(rmock, text="<html><body><p>Not JSON!</p>")
+
+        crawler = tasks.Crawler()
+        run = crawler.crawl()
+
+        logs = run.urls.all()[0].logs
+        self.assertIn("Failed to parse JSON", logs)
+
+    def make_run_urls(self, urls):
+        """Make stand-in RunUrls for fetch_all."""
+        return [
+            types.SimpleNamespace(url=types.SimpleNamespace(url=url))
+            for url in urls
+        ]
+
+    def test_fetch_all_schedules_per_host(self, rmock):
+        """Urls waiting on a busy host do not block other hosts."""
+        run_urls = self.make_run_urls(
+            [
+                "https://a.example/1",
+                "https://a.example/2",
+                "https://a.example/3",
+                "https://b.example/1",
+            ]
+        )
+        other_host_started = threading.Event()
+        overlapped = []
+
+        def fetch_url(run_url):
+            if run_url.url.url.startswith("https://b."):
+                other_host_started.set()
+            else:
+                overlapped.append(other_host_started.wait(5))
+            return [], ""
+
+        crawler = tasks.Crawler(max_workers=2, max_workers_per_host=1)
+        with mock.patch.object(crawler, "fetch_url", side_effect=fetch_url):
+            results = list(crawler.fetch_all(run_urls))
+        self.assertEqual([r[0] for r in results], run_urls)
+        self.assertTrue(overlapped[0])
+
+    def test_fetch_all_window(self, rmock):
+        """Only a window of urls is fetched ahead of the consumer."""
+        run_urls = self.make_run_urls(
+            ["https://h{}.example/".format(i) for i in range(20)]
+        )
+        crawler = tasks.Crawler(max_workers=2)
+        with mock.patch.object(
+            crawler, "fetch_url", return_value=([], "")
+        ) as fetch_url:
+            results = crawler.fetch_all(run_urls)
+            next(results)
+            self.assertLessEqual(
+                fetch_url.call_count, 1 + crawler.result_window
+            )
+            self.assertEqual(len(list(results)), 19)
+        self.assertEqual(fetch_url.call_count, 20)
+
+    def test_not_modified(self, rmock):
+        """When the remote returns a 304, the last run's tools are kept."""
+        self.setup_url_fixture(
+            rmock,
+            fixture="crawler_missing_run_1.json",
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 1 Mar 2021"},
+        )
+        crawler = tasks.Crawler()
+        crawler.crawl()
+        url = Url.objects.get()
+        self.assertEqual(url.etag, '"v1"')
+        self.assertEqual(url.last_modified, "Mon, 1 Mar 2021")
+        self.assertIsNotNone(url.content_hash)
+
+        self.setup_url_response(rmock, status_code=304)
+        with mock.patch.object(Tool.objects, "from_toolinfo_many") as upsert:
+            run = crawler.crawl()
+            upsert.assert_not_called()
+
+        req = rmock.last_request
+        self.assertEqual(req.headers["if-none-match"], '"v1"')
+        self.assertEqual(req.headers["if-modified-since"], "Mon, 1 Mar 2021")
+        run_url = run.urls.all()[0]
+        self.assertUrlStatus(run_url, status_code=304)
+        self.assertTrue(run_url.unchanged)
+        self.assertEqual(run.total_tools, 3)
+        self.assertToolsInUrl(
+            run_url,
+            ["test-delete-1", "test-delete-2", "test-delete-3"],
+        )
+
+    def test_oversized_validator(self, rmock):
+        """Validators too long to store are dropped."""
+        self.setup_url_fixture(
+            rmock,
+            fixture="crawler_missing_run_1.json",
+            headers={
+                "ETag": '"{}"'.format("x" * 300),
+                "Last-Modified": "Mon, 1 Mar 2021",
+            },
+        )
+        crawler = tasks.Crawler()
+        run = crawler.crawl()
+        self.assertUrlStatus(run.urls.all()[0])
+        self.assertIn("Ignoring etag header", run.urls.all()[0].logs)
+        url = Url.objects.get()
+        self.assertIsNone(url.etag)
+        self.assertEqual(url.last_modified, "Mon, 1 Mar 2021")
+
+        crawler.crawl()
+        self.assertNotIn("if-none-match", rmock.last_request.headers)
+
+    def test_unchanged_content_hash(self, rmock):
+        """When the content is unchanged, the upsert is skipped."""
+        self.setup_url_fixture(rmock, fixture="crawler_missing_run_1.json")
+        crawler = tasks.Crawler()
+        crawler.crawl()
+
+        with mock.patch.object(Tool.objects, "from_toolinfo_many") as upsert:
+            run = crawler.crawl()
+            upsert.assert_not_called()
+        self.assertNotIn("if-none-match", rmock.last_request.headers)
+        run_url = run.urls.all()[0]
+        self.assertUrlStatus(run_url)
+        self.assertTrue(run_url.unchanged)
+        self.assertToolsInUrl(
+            run_url,
+            ["test-delete-1", "test-delete-2", "test-delete-3"],
+        )
+
+        # Changed content is processed normally
+        self.setup_url_response(rmock, fixture="crawler_missing_run_2.json")
+        run = crawler.crawl()
+        run_url = run.urls.all()[0]
+        self.assertFalse(run_url.unchanged)
+        self.assertToolsInUrl(run_url, ["test-delete-1", "test-delete-3"])
+
+    def test_force_ignores_validators(self, rmock):
+        """When forced, content is processed even if unchanged."""
+        self.setup_url_fixture(
+            rmock, json=[self.v0_single], headers={"ETag": '"v1"'}
+        )
+        tasks.Crawler().crawl()
+
+        with mock.patch.object(
+            Tool.objects,
+            "from_toolinfo_many",
+            wraps=Tool.objects.from_toolinfo_many,
+        ) as upsert:
+            run = tasks.Crawler(force=True).crawl()
+            upsert.assert_called_once()
+        self.assertNotIn("if-none-match", rmock.last_request.headers)
+        self.assertFalse(run.urls.all()[0].unchanged)
+
+    def test_invalid_content_clears_validators(self, rmock):
+        """When content fails to validate, validators are not kept."""
+        self.setup_url_fixture(
+            rmock, json={"invalid": True}, headers={"ETag": '"v1"'}
+        )
+        tasks.Crawler().crawl()
+        url = Url.objects.get()
+        self.assertIsNone(url.etag)
+        self.assertIsNone(url.content_hash)
+
+    def test_document_too_large(self, rmock):
+        """When the document is too large, we notice but don't fail."""
+        self.setup_url_fixture(rmock, fixture="crawler_missing_run_1.json")
+
+        with self.settings(CRAWLER_MAX_DOCUMENT_SIZE=64):
+            crawler = tasks.Crawler()
+        run = crawler.crawl()
+
+        self.assertRunResult(run, new=0, urls=1)
+        self.assertUrlStatus(run.urls.all()[0], valid=False)
+        self.assertIn("Document larger than 64 bytes", run.urls.all()[0].logs)
+
+    def test_record_too_large(self, rmock):
+        """When a record is too large, no records are processed."""
+        big = self.v0_single.copy()
+        big["name"] = "big-tool"
+        big["description"] = "x" * 1024
+        self.setup_url_fixture(rmock, json=[self.v0_single, big])
+
+        with self.settings(CRAWLER_MAX_RECORD_SIZE=512):
+            crawler = tasks.Crawler()
+        run = crawler.crawl()
+
+        self.assertRunResult(run, new=0, urls=1)
+        self.assertUrlStatus(run.urls.all()[0], valid=False)
+
+    def test_schedule(self, rmock):
+        """Crawl intervals adapt to unchanged content and failures."""
+        self.setup_url_fixture(rmock, json=[self.v0_single])
+        crawler = tasks.Crawler()
+        hour = crawler.min_interval
+
+        crawler.crawl()
+        url = Url.objects.get()
+        self.assertEqual(url.crawl_interval, hour)
+        self.assertEqual(url.consecutive_failures, 0)
+        self.assertGreater(url.next_crawl, timezone.now())
+
+        crawler.crawl()
+        url.refresh_from_db()
+        self.assertEqual(url.crawl_interval, 2 * hour)
+
+        self.setup_url_response(rmock, status_code=500)
+        crawler.crawl()
+        crawler.crawl()
+        url.refresh_from_db()
+        self.assertEqual(url.crawl_interval, 2 * hour)
+        self.assertEqual(url.consecutive_failures, 2)
+        self.assertGreater(
+            url.next_crawl,
+            timezone.now() + datetime.timedelta(seconds=3 * hour),
+        )
+
+    def test_due_only(self, rmock):
+        """Only due urls are crawled in due_only mode."""
+        self.setup_url_fixture(rmock, json=[self.v0_single])
+        f2 = self.v0_single.copy()
+        f2["name"] = "another-tool"
+        self.setup_url_fixture(rmock, url="http://example.net", json=[f2])
+        tasks.Crawler().crawl()
+
+        Url.objects.filter(url="http://example.net").update(
+            next_crawl=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        run = tasks.Crawler(due_only=True).crawl()
+        self.assertRunResult(run, new=0, urls=1)
+        self.assertEqual(run.urls.get().url.url, "http://example.net")
+
+        Url.objects.update(next_crawl=None)
+        run = tasks.Crawler(due_only=True, limit=1).crawl()
+        self.assertRunResult(run, new=0, urls=1)
+
+    def test_due_only_keeps_claims(self, rmock):
+        """Tools claimed by idle urls are not taken over by due urls."""
+        self.setup_url_fixture(rmock, json=[self.v0_single])
+        tasks.Crawler().crawl()
+
+        f2 = self.v0_single.copy()
+        f2["author"] = "Not " + self.v0_single["author"]
+        self.setup_url_fixture(rmock, url="http://example.net", json=[f2])
+        run = tasks.Crawler(due_only=True).crawl()
+
+        self.assertEqual(run.urls.get().url.url, "http://example.net")
+        self.assertToolsInUrl(run.urls.get(), [])
+        self.assertEqual(
+            self.v0_single["author"],
+            Tool.objects.get(name=self.v0_single["name"]).author[0]["name"],
+        )
+
+    def test_metrics(self, rmock):
+        """Fetch, parse and churn metrics are recorded by host."""
+        self.setup_url_fixture(rmock, fixture="crawler_happy_path.json")
+        labels = {"host": "example.org"}
+
+        def sample(name, labels=labels):
+            return metrics.registry.get_sample_value(name, labels) or 0
+
+        fetches = sample(
+            "toolhub_crawler_fetches_total",
+            {"host": "example.org", "status": "200"},
+        )
+        parses = sample("toolhub_crawler_parse_seconds_count")
+        size = sample("toolhub_crawler_response_bytes_sum")
+        queries = sample("toolhub_crawler_db_queries_count")
+        created = sample("toolhub_crawler_tools_total", {"change": "created"})
+
+        run = tasks.Crawler().crawl()
+        self.assertEqual(
+            sample(
+                "toolhub_crawler_fetches_total",
+                {"host": "example.org", "status": "200"},
+            ),
+            fetches + 1,
+        )
+        self.assertEqual(
+            sample("toolhub_crawler_parse_seconds_count"), parses + 1
+        )
+        self.assertGreater(sample("toolhub_crawler_response_bytes_sum"), size)
+        self.assertEqual(
+            sample("toolhub_crawler_db_queries_count"), queries + 1
+        )
+        self.assertEqual(
+            sample("toolhub_crawler_tools_total", {"change": "created"}),
+            created + 1,
+        )
+        self.assertEqual(
+            sample("toolhub_crawler_last_run_timestamp_seconds", {}),
+            run.end_date.timestamp(),
+        )
+
+    def test_elapsed_ms(self, rmock):
+        """Fetch times longer than one second are recorded correctly."""
+        self.setup_url_fixture(rmock, fixture="crawler_happy_path.json")
+        crawler = tasks.Crawler()
+        real_get = crawler.session.get
+
+        def slow_get(*args, **kwargs):
+            r = real_get(*args, **kwargs)
+            r.elapsed = datetime.timedelta(seconds=2, microseconds=500)
+            return r
+
+        with mock.patch.object(crawler.session, "get", slow_get):
+            run = crawler.crawl()
+        self.assertEqual(run.urls.get().elapsed_ms, 2000)
+
+    def test_metrics_textfile(self, rmock):
+        """The crawl command can write metrics to a textfile."""
+        self.setup_url_fixture(rmock, fixture="crawler_happy_path.json")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crawler.prom")
+            call_command("crawl", "--quiet", "--metrics-file", path)
+            with open(path) as f:
+                content = f.read()
+        self.assertIn("toolhub_crawler_fetch_seconds_bucket", content)
+        self.assertIn("toolhub_crawler_run_seconds", content)
+
+    def test_rate_limited(self, rmock):
+        """Fetches wait on the per-host rate limiter."""
+        self.setup_url_fixture(rmock, fixture="crawler_happy_path.json")
+        crawler = tasks.Crawler()
+        with mock.patch.object(
+            crawler.rate_limiter, "acquire", return_value=0
+        ) as acquire:
+            crawler.crawl()
+        acquire.assert_called_once_with("example.org")
+
+    def test_session_pooled(self, rmock):
+        """Requests share a session with per-host connection pools."""
+        self.setup_url_fixture(rmock, fixture="crawler_happy_path.json")
+        crawler = tasks.Crawler(max_workers_per_host=3)
+        adapter = crawler.session.get_adapter("https://example.org/")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertIn("Toolhub", crawler.session.headers["user-agent"])
+        crawler.crawl()
+        self.assertEqual(
+            rmock.last_request.headers["user-agent"], crawler.user_agent
+        )
+
+    def test_dry_run(self, rmock):
+        """A dry run reports changes without saving anything."""
+        self.setup_url_fixture(rmock, fixture="crawler_missing_run_1.json")
+        tasks.Crawler().crawl()
+        run_count = Run.objects.count()
+        tool_count = Tool.objects.count()
+        url_state = Url.objects.values().get()
+
+        f2 = self.v0_single.copy()
+        f2["name"] = "test-delete-1"
+        f2["title"] = "A new title"
+        records = [
+            f2,
+            self.v0_single,
+            {"name": "test-delete-3", "title": "Invalid"},
+        ]
+        self.setup_url_response(rmock, json=records)
+        with self.assertNumQueries(4):
+            report = tasks.Crawler().diff()
+
+        self.assertEqual(Run.objects.count(), run_count)
+        self.assertEqual(Tool.objects.count(), tool_count)
+        self.assertEqual(Url.objects.values().get(), url_state)
+        self.assertEqual(
+            Tool.objects.get(name="test-delete-1").title, "Test delete 1"
+        )
+        self.assertEqual(
+            report["summary"],
+            {
+                "created": 1,
+                "updated": 1,
+                "deleted": 2,
+                "unchanged": 0,
+                "errors": 0,
+            },
+        )
+        entry = report["urls"][0]
+        self.assertFalse(entry["valid"])
+        self.assertEqual(entry["created"], ["hay-tools-directory"])
+        self.assertIn("title", entry["updated"]["test-delete-1"])
+        self.assertEqual(entry["deleted"], ["test-delete-2", "test-delete-3"])
+
+    def test_limit_requires_due(self, rmock):
+        """The crawl command rejects --limit without --due."""
+        with self.assertRaises(CommandError):
+            call_command("crawl", "--quiet", "--limit", "5")
+        self.assertFalse(Run.objects.exists())
+
+    def test_dry_run_command(self, rmock):
+        """The crawl command outputs a JSON change report for dry runs."""
+        self.setup_url_fixture(rmock, json=[self.v0_single])
+        out = io.StringIO()
+        call_command("crawl", "--dry-run", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["summary"]["created"], 1)
+        self.assertEqual(report["urls"][0]["url"], Url.objects.get().url)
+        self.assertFalse(Tool.objects.exists())
+        self.assertFalse(Run.objects.exists())
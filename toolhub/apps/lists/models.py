@@ -17,7 +17,11 @@
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
 from django.conf import settings
 from django.core import validators
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from django_prometheus.models import ExportModelOperationsMixin
@@ -144,6 +148,11 @@ class ToolList(ExportModelOperationsMixin("list"), SafeDeleteModel):
         return self.title
 
 
+def favorites_cache_key(user_id):
+    """Get the cache key for a user's favorites list id and tool ids."""
+    return "lists:favorites:{}".format(user_id)
+
+
 class ToolListItemManager(models.Manager):
     """Custom manager for ToolListItem models."""
 
@@ -158,6 +167,121 @@ class ToolListItemManager(models.Manager):
         )
         return favorites
 
+    def get_favorites_state(self, user):
+        """Get the cached state of a user's favorites.
+
+        The state is a dict holding the id of the user's favorites list
+        ("list") and the ids of the tools in it ("tools"). The tool ids are
+        None until they are first needed.
+
+        :rtype: dict
+        """
+        key = favorites_cache_key(user.pk)
+        state = cache.get(key)
+        if state is None:
+            state = {"list": self.get_user_favorites(user).pk, "tools": None}
+            cache.set(key, state)
+        return state
+
+    def get_user_favorites_id(self, user):
+        """Get the id of the user's favorites list.
+
+        The list is created if needed. The id is cached.
+        """
+        return self.get_favorites_state(user)["list"]
+
+    def get_favorite_tool_ids(self, user):
+        """Get the ids of the tools in a user's favorites.
+
+        The ids are cached until the user's favorites change.
+
+        :rtype: set(int)
+        """
+        state = self.get_favorites_state(user)
+        if state["tools"] is None:
+            state["tools"] = list(
+                self.filter(toollist_id=state["list"]).values_list(
+                    "tool_id", flat=True
+                )
+            )
+            cache.set(favorites_cache_key(user.pk), state)
+        return set(state["tools"])
+
+    def check_user_favorites(self, user, names):
+        """Check which of the named tools are in a user's favorites.
+
+        :param user: user whose favorites to check
+        :param names: tool names
+        :type names: list(str)
+        :returns: mapping of each name to True if the tool is a favorite
+        :rtype: dict
+        """
+        ids = self.get_favorite_tool_ids(user)
+        favorited = set()
+        if ids:
+            favorited = {
+                name
+                for name, pk in Tool.objects.filter(
+                    name__in=names
+                ).values_list("name", "pk")
+                if pk in ids
+            }
+        return {name: name in favorited for name in names}
+
+    def set_list_tools(self, toollist, names, added_by, items=None):
+        """Make the items of a list match an ordered list of tool names.
+
+        Only the difference between the current and desired contents is
+        written. Items for tools that stay in the list are kept, and only
+        their order is updated if they moved. Tools are looked up with
+        a single query and new items are inserted in bulk.
+
+        :param toollist: list to update
+        :type toollist: ToolList
+        :param names: ordered names of the tools that should be in the list
+        :type names: list(str)
+        :param added_by: user to credit for newly added items
+        :type added_by: settings.AUTH_USER_MODEL
+        :param items: current items of the list with their tools, if already
+            loaded by the caller
+        :type items: list(ToolListItem)
+        """
+        if items is None:
+            items = list(self.filter(toollist=toollist).select_related("tool"))
+        by_name = {item.tool.name: item for item in items}
+        wanted = set(names)
+
+        removed = [
+            item.pk for name, item in by_name.items() if name not in wanted
+        ]
+        if removed:
+            self.filter(pk__in=removed).delete()
+
+        added = [name for name in names if name not in by_name]
+        tools = Tool.objects.in_bulk(added, field_name="name") if added else {}
+
+        new_items = []
+        moved = []
+        for idx, name in enumerate(names):
+            item = by_name.get(name)
+            if item is None:
+                new_items.append(
+                    self.model(
+                        toollist=toollist,
+                        tool=tools[name],
+                        order=idx,
+                        added_by=added_by,
+                    )
+                )
+            elif item.order != idx:
+                item.order = idx
+                moved.append(item)
+
+        if moved:
+            self.bulk_update(moved, ["order"])
+        if new_items:
+            self.bulk_create(new_items)
+
 
 class ToolListItem(ExportModelOperationsMixin("listitem"), models.Model):
     """Many-to-many tracking of Tool models contained by a ToolList."""
@@ -202,3 +326,20 @@ class ToolListItem(ExportModelOperationsMixin("listitem"), models.Model):
     def natural_key(self):
         """Natural reference."""
         return (self.toollist, self.tool)
+
+
+@receiver(post_save, sender=ToolListItem)
+@receiver(post_delete, sender=ToolListItem)
+def invalidate_favorites_cache(sender, instance, **kwargs):  # noqa: W0613
+    """Forget cached favorites when a favorites list changes.
+
+    Favorites are only edited by their owner, so the item is compared with
+    the cached favorites list id of the user who added it. This avoids
+    loading the list for every item of every list.
+    """
+    if instance.added_by_id is None:
+        return
+    key = favorites_cache_key(instance.added_by_id)
+    state = cache.get(key)
+    if state is not None and state["list"] == instance.toollist_id:
+        cache.delete(key)
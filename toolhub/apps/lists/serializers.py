@@ -18,12 +18,14 @@
 import logging
 
 from django.db import transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
 from drf_spectacular.utils import extend_schema_field
 
 from rest_framework import serializers
 
+from toolhub.apps.auditlog.buffering import buffered_logging
 from toolhub.apps.auditlog.context import auditlog_context
 from toolhub.apps.toolinfo.models import Tool
 from toolhub.apps.toolinfo.serializers import SummaryToolSerializer
@@ -79,13 +81,36 @@ class ToolListSerializer(ModelSerializer):
             "modified_date",
         ]
 
+    @classmethod
+    def prefetch(cls, queryset):
+        """Load everything needed to serialize a queryset of lists.
+
+        The ordered items of each list are fetched along with their tools,
+        annotations, and the list's users in a constant number of queries
+        no matter how many lists or tools there are.
+        """
+        items = (
+            ToolListItem.objects.filter(tool__deleted__isnull=True)
+            .select_related("tool", "tool__annotations")
+            .order_by("order", "added_date")
+        )
+        return queryset.select_related(
+            "created_by", "modified_by"
+        ).prefetch_related(
+            Prefetch(
+                "toollistitem_set", queryset=items, to_attr="ordered_items"
+            )
+        )
+
     @extend_schema_field(SummaryToolSerializer(many=True))
     def get_tools(self, obj):
         """Get ordered list of tools in toollist."""
-        serializer = SummaryToolSerializer(
-            obj.tools.all().order_by("toollistitem__order").distinct(),
-            many=True,
-        )
+        items = getattr(obj, "ordered_items", None)
+        if items is not None:
+            tools = [item.tool for item in items]
+        else:
+            tools = obj.tools.all().order_by("toollistitem__order").distinct()
+        serializer = SummaryToolSerializer(tools, many=True)
         return serializer.data
 
 
@@ -132,17 +157,13 @@ class EditToolListSerializer(ModelSerializer, EditCommentFieldMixin):
         validated_data["created_by"] = user
         validated_data["modified_by"] = user
 
-        with reversion_context(user, comment):
+        with buffered_logging(), reversion_context(user, comment):
 
             with auditlog_context(user, comment):
                 instance = ToolList.objects.create(**validated_data)
-                for idx, name in enumerate(tools):
-                    ToolListItem.objects.create(
-                        toollist=instance,
-                        tool=Tool.objects.get(name=name),
-                        order=idx,
-                        added_by=user,
-                    )
+                ToolListItem.objects.set_list_tools(
+                    instance, tools, user, items=[]
+                )
             instance.save()
         return instance
 
@@ -162,17 +183,15 @@ class EditToolListSerializer(ModelSerializer, EditCommentFieldMixin):
                 instance_has_changes = True
 
         # Compute changes to the list contents
-        list_qs = ToolListItem.objects.filter(toollist=instance)
-        prior_tools = list(list_qs.values_list("tool__name", flat=True))
-        # I thought about doing some really fancy list diffing here using
-        # difflib.SequenceMatcher to find the minimal set of changes to the
-        # list items so that the db update could be really targeted. After
-        # playing with the idea it felt like a big pile of overkill, so
-        # instead we will just compare the ordered lists and if anything is
-        # different replace all of it below.
+        items = list(
+            ToolListItem.objects.filter(toollist=instance).select_related(
+                "tool"
+            )
+        )
+        prior_tools = [item.tool.name for item in items]
         list_has_changes = prior_tools != tools
 
-        with reversion_context(user, comment):
+        with buffered_logging(), reversion_context(user, comment):
 
             with auditlog_context(user, comment):
                 if instance_has_changes:
@@ -184,21 +203,36 @@ class EditToolListSerializer(ModelSerializer, EditCommentFieldMixin):
                     # for difficulties versioning m2m relations.
                     instance.tool_names = tools
 
-                    # Delete prior list contents and then repopulate
-                    list_qs.delete()
-                    for idx, name in enumerate(tools):
-                        ToolListItem.objects.create(
-                            toollist=instance,
-                            tool=Tool.objects.get(name=name),
-                            order=idx,
-                            added_by=user,
-                        )
+                    # Apply the minimal set of item changes
+                    ToolListItem.objects.set_list_tools(
+                        instance, tools, user, items=items
+                    )
 
                 if instance_has_changes or list_has_changes:
                     instance.save()
         return instance
 
 
+@doc(_("""Tool names to check against favorites."""))
+class CheckFavoritesSerializer(serializers.Serializer):
+    """Tool names to check against favorites."""
+
+    name = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=128,
+        help_text=_("""Tool names. Repeat the parameter for each name."""),
+    )
+
+    def create(self, validated_data):
+        """Operation not implemented."""
+        raise NotImplementedError("Data input only serializer.")
+
+    def update(self, instance, validated_data):
+        """Operation not implemented."""
+        raise NotImplementedError("Data input only serializer.")
+
+
 @doc(_("""Historic revision of a list for generating diffs."""))
 class ToolListDiffSerializer(ModelSerializer):
     """Historic revision of a list for generating diffs."""
@@ -228,6 +262,17 @@ class ToolListDiffSerializer(ModelSerializer):
         read_only_fields = fields
 
 
+def get_diff_snapshots(versions):
+    """Get the data compared when diffing ToolList versions."""
+    ret = []
+    for version in versions:
+        data = ToolListDiffSerializer(version.field_dict).data
+        # T302418: exclude 'featured' field from List diff
+        del data["featured"]
+        ret.append(data)
+    return ret
+
+
 @doc(_("""Historic revision of a list."""))
 class ToolListHistoricVersionSerializer(ToolListDiffSerializer):
     """Historic revision of a list."""
@@ -245,22 +290,43 @@ class ToolListHistoricVersionSerializer(ToolListDiffSerializer):
 
     @extend_schema_field(SummaryToolSerializer(many=True))
     def get_tools(self, obj):
-        """Get full tool objects"""
-        serializer = SummaryToolSerializer(
-            Tool.objects.filter(name__in=obj["tool_names"])
-            .order_by("toollistitem__order")
-            .distinct(),
-            many=True,
-        )
-        return serializer.data
+        """Get full tool objects in the order stored in the revision.
+
+        Tools which no longer exist are omitted.
+        """
+        names = obj.get("tool_names") or []
+        summaries = get_tool_summaries(names, self.context)
+        return [summaries[name] for name in names if name in summaries]
 
     @extend_schema_field(UserSerializer)
     def get_created_by(self, obj):
         """Get list creator object."""
-        serializer = UserSerializer(
-            ToolhubUser.objects.get(id=obj["created_by_id"])
+        users = self.context.setdefault("historic_users", {})
+        pk = obj["created_by_id"]
+        if pk not in users:
+            users[pk] = UserSerializer(ToolhubUser.objects.get(id=pk)).data
+        return users[pk]
+
+
+def get_tool_summaries(names, context):
+    """Get a map of tool name to serialized tool summary.
+
+    Summaries are cached in the serializer context so that tools shared by
+    many historic versions in a response are only fetched and serialized
+    once. Names which are not cached yet are fetched with a single query.
+    """
+    summaries = context.setdefault("tool_summaries", {})
+    missing = {name for name in names if name not in summaries}
+    if missing:
+        tools = Tool.objects.filter(name__in=missing).select_related(
+            "annotations"
         )
-        return serializer.data
+        for tool in tools:
+            summaries[tool.name] = SummaryToolSerializer(tool).data
+        # Remember misses too so they are not looked up again
+        for name in missing:
+            summaries.setdefault(name, None)
+    return {name: data for name, data in summaries.items() if data is not None}
 
 
 @doc(_("""Tool list revision."""))
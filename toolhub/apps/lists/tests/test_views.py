@@ -15,8 +15,13 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from reversion.models import Version
 
+from toolhub.apps.auditlog.models import LogEntry
 from toolhub.apps.toolinfo.models import Tool
 from toolhub.apps.versioned.context import reversion_context
 from toolhub.tests import TestCase
@@ -69,6 +74,32 @@ class ToolListViewSetTest(TestCase):
         response = self.client.post(url, payload, format="json")
         self.assertEqual(response.status_code, 201)
 
+    def test_create_buffers_log_entries(self):
+        """Test log entries of a list edit are written in one insert."""
+        self.client.force_authenticate(user=self.user)
+        url = "/api/lists/"
+        payload = {
+            "title": "buffered",
+            "tools": [self.tool.name],
+            "comment": "buffered create",
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        inserts = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith('INSERT INTO "auditlog_logentry"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+        toollist = models.ToolList.objects.get(pk=response.data["id"])
+        entries = LogEntry.objects.get_for_object(toollist).order_by("id")
+        self.assertEqual(entries[0].action, LogEntry.CREATE)
+        self.assertEqual(entries[0].user, self.user)
+        self.assertEqual(entries[0].change_message, "buffered create")
+
     def test_create_validates_tool_names(self):
         """Ensure duplicate and non-existant tool names are rejected."""
         self.client.force_authenticate(user=self.user)
@@ -139,6 +170,46 @@ class ToolListViewSetTest(TestCase):
         self.assertIn("tools", response.data)
         self.assertEqual(len(response.data["tools"]), 0)
 
+    def test_update_applies_minimal_diff(self):
+        """Items that stay in a list are kept rather than reinserted."""
+        names = ["tool-a", "tool-b", "tool-c", "tool-d"]
+        for name in names:
+            Tool.objects.create(
+                name=name,
+                title=name,
+                description=name,
+                url="https://example.org/",
+                created_by=self.user,
+            )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/lists/{id}/".format(id=self.list.pk)
+        payload = {"title": self.list.title, "tools": names[:3]}
+        response = self.client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        before = dict(
+            models.ToolListItem.objects.filter(toollist=self.list).values_list(
+                "tool__name", "pk"
+            )
+        )
+
+        payload["tools"] = ["tool-c", "tool-a", "tool-d"]
+        response = self.client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [tool["name"] for tool in response.data["tools"]],
+            payload["tools"],
+        )
+        after = dict(
+            models.ToolListItem.objects.filter(toollist=self.list).values_list(
+                "tool__name", "pk"
+            )
+        )
+        self.assertEqual(after["tool-a"], before["tool-a"])
+        self.assertEqual(after["tool-c"], before["tool-c"])
+        self.assertNotIn("tool-b", after)
+        self.list.refresh_from_db()
+        self.assertEqual(self.list.tool_names, payload["tools"])
+
     def test_update_as_oversighter(self):
         """Test update."""
         self.client.force_authenticate(user=self.oversighter)
@@ -209,6 +280,45 @@ class ToolListViewSetTest(TestCase):
         self.assertEqual(len(results[0]["tools"]), 1)
         self.assertEqual(results[0]["tools"][0]["name"], self.tool.name)
 
+    def test_list_query_count(self):
+        """The number of queries does not depend on list contents."""
+        self.client.force_authenticate(user=None)
+        url = "/api/lists/"
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        for i in range(4):
+            owner = self._user("owner{}".format(i))
+            toollist = models.ToolList.objects.create(
+                title="List {}".format(i),
+                published=True,
+                created_by=owner,
+                modified_by=owner,
+            )
+            for j in range(5):
+                tool = Tool.objects.create(
+                    name="list-{}-tool-{}".format(i, j),
+                    title="Tool",
+                    description="Tool",
+                    url="https://example.org/",
+                    created_by=owner,
+                )
+                models.ToolListItem.objects.create(
+                    toollist=toollist, tool=tool, order=5 - j
+                )
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(large), len(small))
+        # Items are returned in list order
+        tools = response.data["results"][0]["tools"]
+        self.assertEqual(
+            [tool["name"] for tool in tools],
+            ["list-3-tool-{}".format(j) for j in reversed(range(5))],
+        )
+
     def test_retrieve(self):
         """Test retrieve."""
         self.client.force_authenticate(user=None)
@@ -362,6 +472,37 @@ class ToolListRevisionViewSetTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_retrieve_stored_order(self):
+        """Test retrieve renders tools in the order stored in the revision."""
+        other = Tool.objects.create(
+            name="another-tool",
+            title="Another tool",
+            description="Another tool",
+            url="https://example.org/",
+            created_by=self.user,
+        )
+        with reversion_context(self.user):
+            self.list.tool_names = [other.name, "no-such-tool", self.tool.name]
+            self.list.save()
+        version = self.versions().first()
+
+        self.client.force_authenticate(user=None)
+        url = "/api/lists/{list_pk}/revisions/{id}/".format(
+            list_pk=self.list.pk,
+            id=version.pk,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [t["name"] for t in response.data["toollist"]["tools"]],
+            [other.name, self.tool.name],
+        )
+        tool_queries = [
+            q for q in ctx.captured_queries if '"toolinfo_tool"' in q["sql"]
+        ]
+        self.assertEqual(len(tool_queries), 1)
+
     def test_diff(self):
         """Test diff action."""
         with reversion_context(self.user):
@@ -699,6 +840,10 @@ class FavoritesViewSetTest(TestCase):
             cls.toolinfo, cls.user, Tool.ORIGIN_API
         )
 
+    def setUp(self):
+        """Forget favorites cached by other tests."""
+        cache.clear()
+
     def test_list_requires_auth(self):
         """Assert that anons get a 401 when calling."""
         self.client.force_authenticate(user=None)
@@ -752,6 +897,63 @@ class FavoritesViewSetTest(TestCase):
         self.assertIn("errors", response.data)
         self.assertEqual("name", response.data["errors"][0]["field"])
 
+    def test_check(self):
+        """Test check action."""
+        other = Tool.objects.create(
+            name="not-a-favorite",
+            title="Other",
+            description="Other",
+            url="https://example.org/",
+            created_by=self.user,
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/user/favorites-check/"
+        params = {"name": [self.tool.name, other.name, "no-such-tool"]}
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {self.tool.name: False, other.name: False, "no-such-tool": False},
+        )
+
+        response = self.client.post(
+            "/api/user/favorites/", {"name": self.tool.name}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(url, params)
+        self.assertEqual(response.data[self.tool.name], True)
+        with self.assertNumQueries(1):
+            # Favorite ids are cached; only the names are looked up
+            response = self.client.get(url, params)
+        self.assertEqual(response.data[self.tool.name], True)
+        self.assertEqual(response.data[other.name], False)
+
+        response = self.client.delete(
+            "/api/user/favorites/{}/".format(self.tool.name)
+        )
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get(url, params)
+        self.assertEqual(response.data[self.tool.name], False)
+
+    def test_tool_named_check(self):
+        """Test a tool named like the old check action."""
+        tool = Tool.objects.create(
+            name="check",
+            title="Check",
+            description="Check",
+            url="https://example.org/",
+            created_by=self.user,
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/user/favorites/"
+        response = self.client.post(url, {"name": tool.name}, format="json")
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(url + "check/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "check")
+        response = self.client.delete(url + "check/")
+        self.assertEqual(response.status_code, 204)
+
     def test_retrieve_requires_auth(self):
         """Assert that anons get a 401 when calling."""
         self.client.force_authenticate(user=None)
@@ -827,3 +1029,34 @@ class FavoritesViewSetTest(TestCase):
         )
         response = self.client.delete(url)
         self.assertEqual(response.status_code, 204)
+
+    def test_list_uses_cached_favorites_id(self):
+        """Test the favorites list is not looked up on every request."""
+        self.client.force_authenticate(user=self.user)
+        url = "/api/user/favorites/"
+        response = self.client.post(url, {"name": self.tool.name})
+        self.assertEqual(response.status_code, 201)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        for query in ctx.captured_queries:
+            self.assertNotIn('FROM "lists_toollist" ', query["sql"])
+
+    def test_item_changes_do_not_load_list(self):
+        """Test saving items of other lists does not query the list."""
+        models.ToolListItem.objects.get_favorite_tool_ids(self.user)
+        toollist = models.ToolList.objects.create(
+            title="Other", created_by=self.user
+        )
+        item = models.ToolListItem.objects.create(
+            toollist=toollist, tool=self.tool, added_by=self.user
+        )
+        item = models.ToolListItem.objects.get(pk=item.pk)
+        item.order = 1
+        with self.assertNumQueries(1):
+            item.save()
+        self.assertIsNotNone(
+            cache.get(models.favorites_cache_key(self.user.pk))["tools"]
+        )
@@ -64,10 +64,7 @@ def validate_tools_exist(value):
 def validate_favorites_unique(name, ctx):
     """Ensure that the provided data is not already a favorite tool."""
     user = ctx.context["request"].user
-    favorites = ToolListItem.objects.get_user_favorites(user)
-    try:
-        ToolListItem.objects.get(toollist=favorites, tool__name=name)
-    except ToolListItem.DoesNotExist:
+    if not ToolListItem.objects.check_user_favorites(user, [name])[name]:
         # Happy path
         return
     raise ValidationError(
@@ -38,7 +38,9 @@ from rest_framework.decorators import action
 from reversion.models import Version
 
 from toolhub.apps.auditlog.models import LogEntry
+from toolhub.apps.toolinfo.models import Tool
 from toolhub.apps.toolinfo.serializers import SummaryToolSerializer
+from toolhub.apps.versioned import diffs
 from toolhub.apps.versioned.exceptions import ConflictingState
 from toolhub.apps.versioned.exceptions import CurrentRevision
 from toolhub.apps.versioned.exceptions import PatrolledRevision
@@ -51,8 +53,8 @@ from toolhub.serializers import CommentSerializer
 from .models import ToolList
 from .models import ToolListItem
 from .serializers import AddFavoriteSerializer
+from .serializers import CheckFavoritesSerializer
 from .serializers import EditToolListSerializer
-from .serializers import ToolListDiffSerializer
 from .serializers import ToolListRevisionDetailSerializer
 from .serializers import ToolListRevisionDiffSerializer
 from .serializers import ToolListRevisionSerializer
@@ -128,7 +130,7 @@ class ToolListViewSet(viewsets.ModelViewSet):
             # limit to created_by=user here.
             return qs
         qs = qs.filter(Q(published=True) | Q(created_by=user))
-        return qs
+        return ToolListSerializer.prefetch(qs)
 
     def get_serializer_class(self):
         """Use different serializers for input vs output."""
@@ -287,6 +289,7 @@ class ToolListRevisionViewSet(viewsets.ReadOnlyModelViewSet):
             "revision",
             "revision__user",
             "revision__meta",
+            "content_type",
         )
         return qs.get_for_object(self._get_list())
 
@@ -308,12 +311,7 @@ class ToolListRevisionViewSet(viewsets.ReadOnlyModelViewSet):
         if right.revision.meta.suppressed and not user.has_perms(perms, right):
             raise SuppressedRevision()
 
-        data_left = ToolListDiffSerializer(left.field_dict).data
-        data_right = ToolListDiffSerializer(right.field_dict).data
-        # T302418: exclude 'featured' field from List diff
-        del data_right["featured"]
-        del data_left["featured"]
-        return jsonpatch.make_patch(data_left, data_right)
+        return diffs.get_patch(left, right)
 
     def _update_list(self, data, request):
         """Update our list record."""
@@ -557,12 +555,14 @@ class FavoritesViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Get the current user's favorites."""
         user = self.request.user
-        favorites = ToolListItem.objects.get_user_favorites(user)
+        favorites_id = ToolListItem.objects.get_user_favorites_id(user)
         if self.action == "destroy":
             # Delete needs to grab a ToolListItem object, not the tool it
             # points to.
-            return ToolListItem.objects.filter(toollist=favorites.pk)
-        return favorites.tools.all()
+            return ToolListItem.objects.filter(toollist_id=favorites_id)
+        return Tool.objects.filter(
+            toollistitem__toollist_id=favorites_id
+        ).select_related("annotations")
 
     def get_object(self):
         """Get the object(s) to operate on."""
@@ -587,7 +587,31 @@ class FavoritesViewSet(viewsets.ModelViewSet):
         """Add a tool to this user's favorites."""
         user = self.request.user
         serializer.save(
-            toollist=ToolListItem.objects.get_user_favorites(user),
+            toollist_id=ToolListItem.objects.get_user_favorites_id(user),
             order=0,
             added_by=user,
         )
+
+
+class FavoritesCheckViewSet(viewsets.ViewSet):
+    """Check many tools against personal favorites."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_(
+            """Check if each of the given tools is in favorites. """
+            """Returns an object mapping each tool name to a boolean."""
+        ),
+        parameters=[CheckFavoritesSerializer],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def list(self, request):  # noqa: A003
+        """Check if tools are in favorites."""
+        params = CheckFavoritesSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return response.Response(
+            ToolListItem.objects.check_user_favorites(
+                request.user, params.validated_data["name"]
+            )
+        )
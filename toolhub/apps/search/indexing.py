@@ -0,0 +1,167 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import contextlib
+import contextvars
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.db import transaction
+
+from django_elasticsearch_dsl.apps import DEDConfig
+from django_elasticsearch_dsl.registries import registry
+
+from elasticsearch.helpers import bulk
+
+from .models import IndexQueue
+
+
+logger = logging.getLogger(__name__)
+
+buffer_var = contextvars.ContextVar("search_index_buffer", default=None)
+
+
+class IndexBuffer:
+    """Collect search index changes to send in a single bulk request.
+
+    Changes are keyed by document class and document id, so an instance
+    that is saved many times is only sent once. The last action recorded
+    for a document wins.
+    """
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self.pending = {}
+
+    def __len__(self):
+        """Get the number of pending document changes."""
+        return len(self.pending)
+
+    def add(self, instance, action="index"):
+        """Record a change to all documents for a model instance."""
+        for doc in registry.get_documents([instance.__class__]):
+            if not doc.django.ignore_signals:
+                self._add(doc, instance, action)
+
+    def add_related(self, instance):
+        """Record reindexing of documents that embed a model instance."""
+        for doc in registry.get_documents():
+            if instance.__class__ not in doc.django.related_models:
+                continue
+            try:
+                related = doc().get_instances_from_related(instance)
+            except ObjectDoesNotExist:
+                related = None
+            if related is None:
+                continue
+            if isinstance(related, models.Model):
+                related = [related]
+            for obj in related:
+                self._add(doc, obj, "index")
+
+    def _add(self, doc, instance, action):
+        self.pending[(doc, doc.generate_id(instance))] = (action, instance)
+
+    def flush(self):
+        """Send all pending changes to Elasticsearch."""
+        pending, self.pending = self.pending, {}
+        if not pending or not DEDConfig.autosync_enabled():
+            return
+        if queue_enabled():
+            self._enqueue(pending)
+        else:
+            self._send(pending)
+
+    def _enqueue(self, pending):
+        """Record pending changes for the index queue worker."""
+        rows = {}
+        for action, instance in pending.values():
+            ct = ContentType.objects.get_for_model(instance)
+            rows[(ct.pk, instance.pk)] = IndexQueue(
+                content_type=ct, object_id=instance.pk, action=action
+            )
+        IndexQueue.objects.bulk_create(rows.values())
+
+    def _send(self, pending):
+        """Send pending changes to Elasticsearch with a bulk request."""
+        actions = []
+        client = None
+        refresh = False
+        for (doc_class, _), (action, instance) in pending.items():
+            doc = doc_class()
+            if action != "delete" and not doc.should_index_object(instance):
+                continue
+            actions.append(doc._prepare_action(instance, action))
+            client = client or doc._get_connection()
+            refresh = refresh or doc.django.auto_refresh
+        if not actions:
+            return
+
+        _, errors = bulk(
+            client, actions, refresh=refresh, raise_on_error=False
+        )
+        for error in errors:
+            op, info = next(iter(error.items()))
+            if op == "delete" and info.get("status") == 404:
+                # Expected when the document is not currently in the index.
+                continue
+            logger.error(
+                "Failed to %s document %s: %s", op, info.get("_id"), info
+            )
+
+
+def queue_enabled():
+    """Check if index changes should be queued instead of sent directly."""
+    return getattr(settings, "SEARCH_INDEX_QUEUE", False)
+
+
+def current_buffer():
+    """Get the active IndexBuffer, if any."""
+    return buffer_var.get()
+
+
+@contextlib.contextmanager
+def buffered_indexing():
+    """Context manager for batching search index updates.
+
+    Index changes made by model signals inside the context are collected
+    and sent with one bulk request when the outermost context exits. If a
+    database transaction is open at that point the request is delayed until
+    the transaction commits, and dropped if it rolls back.
+
+    When SEARCH_INDEX_QUEUE is enabled the changes are instead written to
+    the IndexQueue table as part of the open transaction.
+    """
+    buffer = current_buffer()
+    if buffer is not None:
+        # Nested context; the outermost context will flush
+        yield buffer
+        return
+
+    buffer = IndexBuffer()
+    token = buffer_var.set(buffer)
+    try:
+        yield buffer
+    finally:
+        buffer_var.reset(token)
+        if queue_enabled():
+            buffer.flush()
+        else:
+            transaction.on_commit(buffer.flush)
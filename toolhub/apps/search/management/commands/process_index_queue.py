@@ -0,0 +1,80 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import time
+
+from django.core.management.base import BaseCommand
+
+from toolhub.apps.search.worker import IndexQueueWorker
+
+
+class Command(BaseCommand):
+    """Send queued search index changes to Elasticsearch."""
+
+    help = "Send queued search index changes to Elasticsearch"  # noqa: A003
+
+    def add_arguments(self, parser):
+        """Add CLI arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Maximum number of queued changes to send per request.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=None,
+            help="Stop retrying a change after this many failures.",
+        )
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep polling for new changes instead of exiting once the "
+            "queue is empty.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        worker = IndexQueueWorker(
+            batch_size=options["batch_size"],
+            max_attempts=options["max_attempts"],
+        )
+        total_done = 0
+        total_failed = 0
+        while True:
+            done, failed = worker.process()
+            total_done += done
+            total_failed += failed
+            if done:
+                continue
+            # The queue is empty or Elasticsearch is failing
+            if not options["forever"]:
+                break
+            time.sleep(options["sleep"])
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                "Processed {} queued changes, {} failed".format(
+                    total_done, total_failed
+                )
+            )
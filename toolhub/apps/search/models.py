@@ -15,3 +15,39 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class IndexQueue(models.Model):
+    """A pending search index change for a model instance.
+
+    Rows are written instead of calling Elasticsearch directly when
+    SEARCH_INDEX_QUEUE is enabled, and are drained in bulk by the
+    `process_index_queue` management command.
+    """
+
+    INDEX = "index"
+    DELETE = "delete"
+    ACTION_CHOICES = (
+        (INDEX, _("index")),
+        (DELETE, _("delete")),
+    )
+
+    content_type = models.ForeignKey(
+        to="contenttypes.ContentType",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=8, choices=ACTION_CHOICES)
+    created_date = models.DateTimeField(auto_now_add=True, editable=False)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True, null=True)
+
+    def __str__(self):
+        return "{} {}:{}".format(
+            self.action, self.content_type_id, self.object_id
+        )
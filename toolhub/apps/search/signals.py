@@ -25,12 +25,26 @@ from safedelete.signals import post_softdelete
 
 from toolhub.apps.lists.models import ToolList
 
+from .indexing import buffered_indexing
+from .indexing import current_buffer
+from .indexing import queue_enabled
+
 
 class SignalProcessor(RealTimeSignalProcessor):
-    """Update index based on signals."""
+    """Update index based on signals.
+
+    Inside a `buffered_indexing` context changes are collected and sent in
+    bulk when the context exits rather than one request per signal. When
+    SEARCH_INDEX_QUEUE is enabled every change is buffered and written to
+    the index queue.
+    """
 
     def handle_save(self, sender, instance, **kwargs):
         """Handle save."""
+        buffer = current_buffer()
+        if buffer is None and queue_enabled():
+            with buffered_indexing():
+                return self.handle_save(sender, instance, **kwargs)
         if isinstance(instance, SafeDeleteModel):
             if instance.deleted is not None:
                 # Ignore if instance is soft deleted
@@ -39,6 +53,9 @@ class SignalProcessor(RealTimeSignalProcessor):
         if isinstance(instance, ToolList) and not instance.published:
             # T303892: ensure that unpublished lists are not included in the
             # search index.
+            if buffer is not None:
+                buffer.add(instance, "delete")
+                return
             try:
                 registry.delete(instance)
             except BulkIndexError:
@@ -48,8 +65,37 @@ class SignalProcessor(RealTimeSignalProcessor):
             # registry.update which will reindex what we just deleted.
             return
 
+        if buffer is not None:
+            buffer.add(instance)
+            buffer.add_related(instance)
+            return
+
         super().handle_save(sender, instance, **kwargs)
 
+    def handle_pre_delete(self, sender, instance, **kwargs):
+        """Handle removing of instance from related documents."""
+        buffer = current_buffer()
+        if buffer is None and queue_enabled():
+            with buffered_indexing():
+                return self.handle_pre_delete(sender, instance, **kwargs)
+        if buffer is not None:
+            # Related documents are prepared when the buffer is flushed, by
+            # which time the instance has been deleted.
+            buffer.add_related(instance)
+            return
+        super().handle_pre_delete(sender, instance, **kwargs)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        """Handle delete."""
+        buffer = current_buffer()
+        if buffer is None and queue_enabled():
+            with buffered_indexing():
+                return self.handle_delete(sender, instance, **kwargs)
+        if buffer is not None:
+            buffer.add(instance, "delete")
+            return
+        super().handle_delete(sender, instance, **kwargs)
+
     def setup(self):
         """Setup signals."""
         super().setup()
@@ -0,0 +1,149 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from unittest import mock
+
+from django.test import TestCase
+from django.test import override_settings
+
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.user.models import ToolhubUser
+
+from ..indexing import buffered_indexing
+from ..indexing import current_buffer
+
+
+@override_settings(ELASTICSEARCH_DSL_AUTOSYNC=True)
+@mock.patch("toolhub.apps.search.indexing.bulk", return_value=(0, []))
+class BufferedIndexingTest(TestCase):
+    """Test buffered_indexing."""
+
+    def setUp(self):
+        """Initialize common test conditions."""
+        self.user = ToolhubUser.objects.create(
+            username="tester",
+            email="tester@example.org",
+        )
+
+    def make_tool(self, name="buffered-tool"):
+        """Create a Tool."""
+        return Tool.objects.create(
+            name=name,
+            title="Buffered",
+            description="Buffered",
+            url="https://example.org/",
+            created_by=self.user,
+        )
+
+    def test_single_bulk_request(self, bulk):
+        """Saves inside the context are deduplicated into one request."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_indexing() as buffer:
+                tool = self.make_tool()
+                tool.title = "Changed"
+                tool.save()
+                tool.annotations.wikidata_qid = "Q42"
+                tool.annotations.save()
+                self.make_tool("other-tool")
+                self.assertEqual(len(buffer), 2)
+                bulk.assert_not_called()
+        self.assertIsNone(current_buffer())
+
+        bulk.assert_called_once()
+        actions = bulk.call_args[0][1]
+        self.assertEqual(
+            sorted((a["_op_type"], a["_id"]) for a in actions),
+            sorted(
+                ("index", pk)
+                for pk in Tool.objects.values_list("pk", flat=True)
+            ),
+        )
+
+    def test_last_action_wins(self, bulk):
+        """A delete after a save replaces the pending index action."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_indexing():
+                tool = self.make_tool()
+                tool.delete()
+        actions = bulk.call_args[0][1]
+        self.assertEqual(len(actions), 1)
+        self.assertEqual(actions[0]["_op_type"], "delete")
+
+    def test_unpublished_list(self, bulk):
+        """Unpublished lists are removed from the index."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_indexing():
+                ToolList.objects.create(
+                    title="Hidden", created_by=self.user, published=False
+                )
+        actions = bulk.call_args[0][1]
+        self.assertEqual([a["_op_type"] for a in actions], ["delete"])
+
+    def test_nested(self, bulk):
+        """Only the outermost context flushes."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with buffered_indexing() as outer:
+                with buffered_indexing() as inner:
+                    self.assertIs(inner, outer)
+                    self.make_tool()
+                self.assertEqual(len(callbacks), 0)
+        self.assertEqual(len(callbacks), 1)
+        bulk.assert_called_once()
+
+    def test_deferred_until_commit(self, bulk):
+        """Nothing is sent before the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with buffered_indexing():
+                self.make_tool()
+        self.assertEqual(len(callbacks), 1)
+        bulk.assert_not_called()
+
+    @override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False)
+    def test_autosync_disabled(self, bulk):
+        """Nothing is sent when autosync is disabled."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_indexing():
+                self.make_tool()
+        bulk.assert_not_called()
+
+    def test_async_isolation(self, bulk):
+        """Buffers are not shared between asyncio tasks."""
+
+        async def buffered(entered, checked):
+            with buffered_indexing():
+                entered.set()
+                await checked.wait()
+
+        async def other(entered, checked):
+            await entered.wait()
+            seen = current_buffer()
+            checked.set()
+            return seen
+
+        async def main():
+            entered, checked = asyncio.Event(), asyncio.Event()
+            _, seen = await asyncio.gather(
+                buffered(entered, checked), other(entered, checked)
+            )
+            return seen
+
+        # Django does not allow transaction handling inside an event loop
+        with mock.patch("toolhub.apps.search.indexing.transaction"):
+            self.assertIsNone(asyncio.run(main()))
+        self.assertIsNone(current_buffer())
@@ -0,0 +1,145 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import io
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+
+from elasticsearch.exceptions import ConnectionError
+
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.toolinfo.models import Tool
+from toolhub.apps.user.models import ToolhubUser
+
+from ..models import IndexQueue
+from ..worker import IndexQueueWorker
+
+
+@override_settings(ELASTICSEARCH_DSL_AUTOSYNC=True, SEARCH_INDEX_QUEUE=True)
+@mock.patch("toolhub.apps.search.worker.bulk", return_value=(0, []))
+class IndexQueueWorkerTest(TestCase):
+    """Test queued indexing."""
+
+    def setUp(self):
+        """Initialize common test conditions."""
+        self.user = ToolhubUser.objects.create(
+            username="tester",
+            email="tester@example.org",
+        )
+
+    def make_tool(self, name="queued-tool"):
+        """Create a Tool."""
+        return Tool.objects.create(
+            name=name,
+            title="Queued",
+            description="Queued",
+            url="https://example.org/",
+            created_by=self.user,
+        )
+
+    def test_queued(self, bulk):
+        """Saves are written to the queue instead of Elasticsearch."""
+        with mock.patch("toolhub.apps.search.indexing.bulk") as direct:
+            tool = self.make_tool()
+            tool.title = "Changed"
+            tool.save()
+        direct.assert_not_called()
+        ct = ContentType.objects.get_for_model(Tool)
+        rows = IndexQueue.objects.filter(content_type=ct, object_id=tool.pk)
+        self.assertGreaterEqual(rows.count(), 2)
+
+    @override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False)
+    def test_autosync_disabled(self, bulk):
+        """Nothing is queued when autosync is disabled."""
+        self.make_tool()
+        self.assertFalse(IndexQueue.objects.exists())
+
+    def test_process(self, bulk):
+        """Queued changes for an object are sent as one action."""
+        tool = self.make_tool()
+        tool.title = "Changed"
+        tool.save()
+        deleted = self.make_tool("deleted-tool")
+        deleted.delete()
+        ToolList.objects.create(
+            title="Hidden", created_by=self.user, published=False
+        )
+        queued = IndexQueue.objects.count()
+
+        done, failed = IndexQueueWorker().process()
+        self.assertEqual((done, failed), (queued, 0))
+        self.assertFalse(IndexQueue.objects.exists())
+
+        actions = bulk.call_args[0][1]
+        self.assertEqual(len(actions), 3)
+        ops = {(a["_index"], a["_id"]): a["_op_type"] for a in actions}
+        self.assertEqual(ops[("toolhub_tools", tool.pk)], "index")
+        self.assertEqual(ops[("toolhub_tools", deleted.pk)], "delete")
+        self.assertIn("delete", [a["_op_type"] for a in actions])
+
+    def test_failures_retried(self, bulk):
+        """Failed changes are retried later."""
+        tool = self.make_tool()
+        other = self.make_tool("other-tool")
+        bulk.return_value = (
+            1,
+            [
+                {
+                    "index": {
+                        "_index": "toolhub_tools",
+                        "_id": str(tool.pk),
+                        "status": 400,
+                        "error": "mapper_parsing_exception",
+                    }
+                }
+            ],
+        )
+        worker = IndexQueueWorker(retry_delay=60)
+        done, failed = worker.process()
+        rows = IndexQueue.objects.all()
+        self.assertEqual(failed, rows.count())
+        for row in rows:
+            self.assertEqual(row.object_id, tool.pk)
+            self.assertEqual(row.attempts, 1)
+            self.assertIn("mapper_parsing_exception", row.last_error)
+        self.assertFalse(rows.filter(object_id=other.pk).exists())
+        # Not ready for another attempt yet
+        self.assertEqual(worker.process(), (0, 0))
+
+    def test_connection_error(self, bulk):
+        """All rows are retried when Elasticsearch is unavailable."""
+        self.make_tool()
+        bulk.side_effect = ConnectionError("N/A", "unavailable", None)
+        with self.assertLogs("toolhub.apps.search.worker", "ERROR"):
+            done, failed = IndexQueueWorker().process()
+        self.assertEqual(done, 0)
+        self.assertEqual(failed, IndexQueue.objects.count())
+        self.assertTrue(
+            all(row.attempts == 1 for row in IndexQueue.objects.all())
+        )
+
+    def test_command(self, bulk):
+        """The management command drains the queue."""
+        self.make_tool()
+        out = io.StringIO()
+        call_command("process_index_queue", stdout=out)
+        self.assertFalse(IndexQueue.objects.exists())
+        self.assertIn("0 failed", out.getvalue())
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import datetime
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from django_elasticsearch_dsl.registries import registry
+
+from elasticsearch.exceptions import ElasticsearchException
+from elasticsearch.helpers import bulk
+
+from .models import IndexQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+class IndexQueueWorker:
+    """Send queued search index changes to Elasticsearch."""
+
+    def __init__(self, batch_size=None, max_attempts=None, retry_delay=None):
+        """Initialize a new instance.
+
+        :param batch_size: maximum number of queued rows to process at once
+        :param max_attempts: attempts before a row is left for inspection
+        :param retry_delay: seconds to wait before the first retry. The
+            delay doubles for each following attempt.
+        """
+        self.batch_size = batch_size or settings.SEARCH_INDEX_QUEUE_BATCH_SIZE
+        self.max_attempts = (
+            max_attempts or settings.SEARCH_INDEX_QUEUE_MAX_ATTEMPTS
+        )
+        self.retry_delay = (
+            retry_delay or settings.SEARCH_INDEX_QUEUE_RETRY_DELAY
+        )
+
+    def pending(self):
+        """Get the queued rows that are ready to be processed."""
+        return IndexQueue.objects.filter(
+            next_attempt__lte=timezone.now(),
+            attempts__lt=self.max_attempts,
+        ).order_by("id")
+
+    def process(self):
+        """Process one batch of queued rows.
+
+        The queue only records which objects changed. Documents are built
+        from the current database state, so any number of queued changes to
+        an object are sent as a single index or delete action.
+
+        :returns: (number of rows done, number of rows failed)
+        :rtype: tuple
+        """
+        rows = list(self.pending()[: self.batch_size])
+        if not rows:
+            return 0, 0
+
+        by_key = collections.defaultdict(list)
+        for row in rows:
+            by_key[(row.content_type_id, row.object_id)].append(row)
+
+        actions, keys, client = self.get_actions(by_key)
+        failed = {}
+        if actions:
+            try:
+                _, errors = bulk(client, actions, raise_on_error=False)
+            except ElasticsearchException as e:
+                logger.exception("Bulk index request failed")
+                self.retry(rows, str(e))
+                return 0, len(rows)
+
+            for error in errors:
+                op, info = next(iter(error.items()))
+                if op == "delete" and info.get("status") == 404:
+                    # Expected when the document is not currently in the index.
+                    continue
+                key = keys.get((info.get("_index"), str(info.get("_id"))))
+                failed[key] = str(info.get("error", info))
+
+        done = []
+        for key, key_rows in by_key.items():
+            if key in failed:
+                self.retry(key_rows, failed[key])
+            else:
+                done.extend(row.pk for row in key_rows)
+        IndexQueue.objects.filter(pk__in=done).delete()
+        return len(done), len(rows) - len(done)
+
+    def get_actions(self, by_key):
+        """Build bulk actions for the objects referenced by queued rows.
+
+        :returns: (actions, keys, client) where keys maps (index, id) pairs
+            back to the queued (content type, object id) keys.
+        :rtype: tuple
+        """
+        pks_by_type = collections.defaultdict(set)
+        for content_type_id, object_id in by_key:
+            pks_by_type[content_type_id].add(object_id)
+
+        actions = []
+        keys = {}
+        client = None
+        for content_type_id, pks in pks_by_type.items():
+            model = ContentType.objects.get_for_id(
+                content_type_id
+            ).model_class()
+            for doc_class in registry.get_documents([model]):
+                doc = doc_class()
+                client = client or doc._get_connection()
+                # The document queryset excludes objects that should not be
+                # in the index, such as soft deleted or unpublished objects.
+                found = doc.get_queryset().in_bulk(list(pks))
+                for pk in pks:
+                    obj = found.get(pk)
+                    if obj is not None and doc.should_index_object(obj):
+                        actions.append(doc._prepare_action(obj, "index"))
+                    else:
+                        actions.append(
+                            {
+                                "_op_type": "delete",
+                                "_index": doc._index._name,
+                                "_id": pk,
+                            }
+                        )
+                    keys[(doc._index._name, str(pk))] = (content_type_id, pk)
+        return actions, keys, client
+
+    def retry(self, rows, error):
+        """Schedule rows to be processed again after a failure."""
+        now = timezone.now()
+        for row in rows:
+            row.attempts += 1
+            row.last_error = error
+            row.next_attempt = now + datetime.timedelta(
+                seconds=self.retry_delay * 2 ** min(row.attempts - 1, 16)
+            )
+            if row.attempts >= self.max_attempts:
+                logger.error(
+                    "Giving up on search index update %s after %d attempts",
+                    row,
+                    row.attempts,
+                )
+        IndexQueue.objects.bulk_update(
+            rows, ["attempts", "last_error", "next_attempt"]
+        )
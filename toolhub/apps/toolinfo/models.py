@@ -19,18 +19,26 @@ import functools
 import logging
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.core import serializers
 from django.core import validators
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db import models
+from django.db import router
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 from django_prometheus.models import ExportModelOperationsMixin
 
 import reversion
+from reversion.models import Revision
+from reversion.models import Version
 from reversion.signals import post_revision_commit
 
 from safedelete.managers import SafeDeleteManager
@@ -39,7 +47,11 @@ from safedelete.models import SafeDeleteModel
 from toolhub.apps.auditlog.context import auditlog_context
 from toolhub.apps.auditlog.models import LogEntry
 from toolhub.apps.auditlog.signals import registry
+from toolhub.apps.search.indexing import buffered_indexing
 from toolhub.apps.versioned.context import reversion_context
+from toolhub.apps.versioned import diffs
+from toolhub.apps.versioned.models import Change
+from toolhub.apps.versioned.models import RevisionMetadata
 from toolhub.fields import BlankAsNullCharField
 from toolhub.fields import BlankAsNullTextField
 from toolhub.fields import JSONSchemaField
@@ -445,49 +457,312 @@ class ToolManager(SafeDeleteManager):
             if created:
                 return tool, created, False
 
-            # Compare input to prior model and decide if anything of note has
-            # changed. Revived models are always considered changed.
-            has_changes = revived
-
-            for key, value in record.items():
-                if key in self.VARIANT_FIELDS:
-                    continue
-
-                prior = getattr(tool, key)
-
-                if value != prior:
-                    if not revived and key in self.INVARIANT_FIELDS:
-                        # Invariant fields are allowed to change when reviving
-                        # a deleted record.
-                        raise ValidationError(
-                            _(
-                                "Changing %(key)s after initial "
-                                "object creation is not allowed"
-                            ),
-                            code="invariant",
-                            params={"key": key},
-                        )
-
-                    if value == "" and prior is None:
-                        # T293103: guard against blank as null storage
-                        # conversion causing infinite empty diffs
-                        continue
-
-                    setattr(tool, key, value)
-                    has_changes = True
-                    logger.debug(
-                        "%s: Updating %s to %s (was %s)",
-                        record["name"],
-                        key,
-                        value,
-                        prior,
-                    )
+            has_changes = bool(self._apply_toolinfo(tool, record, revived))
             if has_changes:
                 with auditlog_context(creator, comment):
                     tool.save()
 
         return tool, False, has_changes
 
+    def _apply_toolinfo(self, tool, record, revived):
+        """Apply a normalized toolinfo record to an existing Tool.
+
+        The Tool is modified in memory but not saved.
+
+        :returns: names of the fields changed by the record. Revived Tools
+            always include "deleted".
+        :rtype: list
+        :raises ValidationError: if an invariant field would change
+        """
+        # Compare input to prior model and decide if anything of note has
+        # changed. Revived models are always considered changed.
+        changed = ["deleted"] if revived else []
+
+        for key, value in record.items():
+            if key in self.VARIANT_FIELDS:
+                continue
+
+            prior = getattr(tool, key)
+
+            if value != prior:
+                if not revived and key in self.INVARIANT_FIELDS:
+                    # Invariant fields are allowed to change when reviving
+                    # a deleted record.
+                    raise ValidationError(
+                        _(
+                            "Changing %(key)s after initial "
+                            "object creation is not allowed"
+                        ),
+                        code="invariant",
+                        params={"key": key},
+                    )
+
+                if value == "" and prior is None:
+                    # T293103: guard against blank as null storage
+                    # conversion causing infinite empty diffs
+                    continue
+
+                setattr(tool, key, value)
+                changed.append(key)
+                logger.debug(
+                    "%s: Updating %s to %s (was %s)",
+                    record["name"],
+                    key,
+                    value,
+                    prior,
+                )
+        return changed
+
+    def diff_toolinfo_many(self, records, creator, origin):
+        """Compare toolinfo records to the stored Tools without saving.
+
+        Existing tools are fetched with a single query and updated in memory
+        using the same rules as `from_toolinfo`. Nothing is written to the
+        database.
+
+        :param records: Toolinfo records. May be mutated as a side effect.
+        :type records: list(dict)
+        :param creator: User creating/updating the records
+        :type creator: settings.AUTH_USER_MODEL
+        :param origin: Origin of this submission
+        :type origin: str
+        :returns: (results, errors) where results is a list of
+            (tool (Tool), was_created (boolean), changed_fields (list))
+            tuples and errors is a list of (record (dict),
+            error (ValidationError)) tuples.
+        :rtype: tuple
+        """
+        normalized = {}
+        errors = []
+        for record in records:
+            record["created_by"] = creator
+            record["modified_by"] = creator
+            record["origin"] = origin
+            record = self.normalize_toolinfo(record)
+            if record["name"] in normalized:
+                errors.append(
+                    (
+                        record,
+                        ValidationError(
+                            _("Duplicate toolinfo record for %(name)s"),
+                            code="duplicate",
+                            params={"name": record["name"]},
+                        ),
+                    )
+                )
+                continue
+            normalized[record["name"]] = record
+
+        existing = {
+            tool.name: tool
+            for tool in self.all_with_deleted()
+            .filter(name__in=list(normalized))
+            .select_related("annotations")
+        }
+
+        results = []
+        for name, record in normalized.items():
+            tool = existing.get(name)
+            if tool is None:
+                results.append((Tool(**record), True, []))
+                continue
+
+            revived = tool.deleted is not None
+            if revived:
+                tool.deleted = None
+            try:
+                changed = self._apply_toolinfo(tool, record, revived)
+            except ValidationError as e:
+                errors.append((record, e))
+                continue
+            results.append((tool, False, changed))
+        return results, errors
+
+    def from_toolinfo_many(self, records, creator, origin, comment=None):
+        """Create or update many Tools using data from toolinfo records.
+
+        Equivalent to calling `from_toolinfo` for each record, but existing
+        tools are fetched with a single query and changes are written using
+        bulk operations inside a single transaction. Each created or changed
+        tool still gets its own revision, Version history, and LogEntry.
+
+        Model signals are not sent for the bulk writes. The side effects of
+        those signals (Annotations creation, auditlog entries, revision
+        history, and search indexing) are performed directly instead.
+
+        :param records: Toolinfo records. May be mutated as a side effect.
+        :type records: list(dict)
+        :param creator: User creating/updating the records
+        :type creator: settings.AUTH_USER_MODEL
+        :param origin: Origin of this submission
+        :type origin: str
+        :param comment: User provided comment for these changes
+        :type comment: str
+        :returns: (results, errors) where results is a list of
+            (tool (Tool), was_created (boolean), has_changes (boolean))
+            tuples and errors is a list of (record (dict),
+            error (ValidationError)) tuples.
+        :rtype: tuple
+        """
+        tool_diffs, errors = self.diff_toolinfo_many(records, creator, origin)
+        results = []
+        created = []
+        changed = []
+        for tool, was_created, changed_fields in tool_diffs:
+            if was_created:
+                created.append(tool)
+            elif changed_fields:
+                changed.append(tool)
+            results.append((tool, was_created, bool(changed_fields)))
+
+        if created or changed:
+            with transaction.atomic():
+                self._bulk_write(created, changed, creator, comment)
+        return results, errors
+
+    def _bulk_write(self, created, changed, creator, comment):
+        """Persist new and changed tools along with their history."""
+        now = timezone.now()
+
+        if created:
+            self.bulk_create(created)
+            if any(tool.pk is None for tool in created):
+                # Backends which cannot return ids from a bulk insert need a
+                # followup query to find them.
+                pks = dict(
+                    self.filter(
+                        name__in=[tool.name for tool in created]
+                    ).values_list("name", "pk")
+                )
+                for tool in created:
+                    tool.pk = pks[tool.name]
+
+            annotations = [Annotations(tool=tool) for tool in created]
+            Annotations.objects.bulk_create(annotations)
+            if any(a.pk is None for a in annotations):
+                pks = dict(
+                    Annotations.objects.filter(tool__in=created).values_list(
+                        "tool_id", "pk"
+                    )
+                )
+                for a in annotations:
+                    a.pk = pks[a.tool_id]
+            for tool, a in zip(created, annotations):
+                tool.annotations = a
+
+        if changed:
+            for tool in changed:
+                # bulk_update does not apply auto_now
+                tool.modified_date = now
+            self.bulk_update(
+                changed,
+                [
+                    f.name
+                    for f in Tool._meta.concrete_fields
+                    if not f.primary_key and f.name != "created_date"
+                ],
+                batch_size=100,
+            )
+
+        tools = created + changed
+        revisions = [
+            Revision(date_created=now, user=creator, comment=comment or "")
+            for _ in tools
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Revision.objects.bulk_create(revisions)
+        else:
+            for revision in revisions:
+                revision.save()
+        metas = RevisionMetadata.objects.bulk_create(
+            [RevisionMetadata(revision=revision) for revision in revisions]
+        )
+
+        tool_versions = []
+        versions = []
+        for tool, revision in zip(tools, revisions):
+            tool_version = _make_version(tool, revision)
+            tool_versions.append(tool_version)
+            versions.append(tool_version)
+            try:
+                versions.append(_make_version(tool.annotations, revision))
+            except Annotations.DoesNotExist:
+                pass
+        Version.objects.bulk_create(versions)
+        if any(v.pk is None for v in tool_versions):
+            pks = dict(
+                Version.objects.filter(
+                    revision__in=revisions,
+                    content_type_id=get_tool_content_type_id(),
+                ).values_list("revision_id", "pk")
+            )
+            for v in tool_versions:
+                v.pk = pks[v.revision_id]
+
+        # post_revision_commit is not sent for these revisions, so add the
+        # recent changes feed entries here.
+        Change.objects.bulk_create(
+            [
+                change
+                for meta, version in zip(metas, tool_versions)
+                for change in Change.objects.from_versions([version], meta)
+            ]
+        )
+        if settings.REVISION_DIFF_EAGER:
+            transaction.on_commit(
+                lambda: diffs.warm_parent_diffs(tool_versions)
+            )
+
+        user = creator if isinstance(creator, get_user_model()) else None
+        created_ids = {tool.pk for tool in created}
+        LogEntry.objects.bulk_create(
+            [
+                LogEntry(
+                    user=user,
+                    content_type_id=get_tool_content_type_id(),
+                    object_id=tool.pk,
+                    action=(
+                        LogEntry.CREATE
+                        if tool.pk in created_ids
+                        else LogEntry.UPDATE
+                    ),
+                    change_message=comment,
+                    params={"revision": version.pk},
+                )
+                for tool, version in zip(tools, tool_versions)
+            ]
+        )
+
+        # Search index updates are sent once the transaction commits, or
+        # queued as part of it when SEARCH_INDEX_QUEUE is enabled.
+        _index_tools(tools)
+
+
+def _make_version(obj, revision):
+    """Build an unsaved reversion Version for a model instance."""
+    options = reversion.revisions._get_options(obj.__class__)
+    return Version(
+        revision=revision,
+        content_type=ContentType.objects.get_for_model(obj.__class__),
+        object_id=str(obj.pk),
+        db=router.db_for_write(obj.__class__, instance=obj),
+        format=options.format,
+        serialized_data=serializers.serialize(
+            options.format,
+            (obj,),
+            fields=options.fields,
+            use_natural_foreign_keys=options.use_natural_foreign_keys,
+        ),
+        object_repr=str(obj),
+    )
+
+
+def _index_tools(tools):
+    """Update the search index for a list of tools with a bulk request."""
+    with buffered_indexing() as buffer:
+        for tool in tools:
+            buffer.add(tool)
+
 
 @reversion.register(follow=("annotations",))
 @registry.register()
@@ -687,17 +962,13 @@ def add_revision_to_tool(sender, revision, versions, **kwargs):  # noqa: W0613
     for version in versions:
         if version.content_type.id == ct_id:
             # Find the latest LogEntry for this Tool
-            log_entry = (
-                LogEntry.objects.filter(
-                    content_type=version.content_type,
-                    object_id=version.object_id,
-                )
-                .order_by("-timestamp")
-                .first()
+            log_entry = LogEntry.objects.get_latest_for_object_id(
+                version.content_type, int(version.object_id)
             )
             # Decorate with the revision id
             log_entry.params["revision"] = version.id
-            log_entry.save(update_fields=["params"])
+            if log_entry.pk is not None:
+                log_entry.save(update_fields=["params"])
 
 
 @reversion.register()
@@ -24,10 +24,13 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 
+from reversion.models import Version
+
 from toolhub.apps.auditlog.context import auditlog_context
 from toolhub.apps.user.serializers import UserSerializer
 from toolhub.apps.versioned.context import reversion_context
 from toolhub.apps.versioned.serializers import JSONPatchField
+from toolhub.apps.versioned.serializers import RevisionListSerializer
 from toolhub.apps.versioned.serializers import RevisionSerializer
 from toolhub.decorators import doc
 from toolhub.serializers import EditCommentFieldMixin
@@ -329,6 +332,65 @@ class UpdateToolSerializer(CreateToolSerializer):
         fields = CreateToolSerializer.Meta.fields[1:]
 
 
+def load_historic_data(versions):
+    """Get historic data for many Tool versions.
+
+    Annotations saved in the same revisions are fetched with a single
+    query. Version.field_dict memoizes deserialization on each Version, so
+    the returned dicts are copies that callers may modify.
+
+    :param versions: Tool versions
+    :return: dict of Version pk to historic data
+    """
+    versions = list(versions)
+    annotations = {}
+    if versions:
+        qs = Version.objects.get_for_model(Annotations).filter(
+            revision_id__in={v.revision_id for v in versions}
+        )
+        # Keep the first (newest) annotations version in each revision
+        for ann in qs.order_by("-pk"):
+            annotations.setdefault(ann.revision_id, ann)
+
+    ret = {}
+    for version in versions:
+        data = dict(version.field_dict)
+        ann = annotations.get(version.revision_id)
+        data["annotations"] = dict(ann.field_dict) if ann is not None else {}
+        ret[version.pk] = data
+    return ret
+
+
+def get_historic_data(version):
+    """Get historic data for a given Tool version."""
+    return load_historic_data([version])[version.pk]
+
+
+def get_diff_snapshots(versions):
+    """Get the data compared when diffing Tool versions."""
+    historic = load_historic_data(versions)
+    ret = []
+    for version in versions:
+        data = ToolSerializer(historic[version.pk]).data
+        # T279484: exclude modified_date from diff
+        del data["modified_date"]
+        ret.append(data)
+    return ret
+
+
+class ToolRevisionDetailListSerializer(RevisionListSerializer):
+    """Serialize many tool revision details."""
+
+    def to_representation(self, data):
+        """Load historic data for all revisions before serializing them."""
+        data = list(data.all() if hasattr(data, "all") else data)
+        historic = self.context.setdefault("historic_data", {})
+        historic.update(
+            load_historic_data(v for v in data if v.pk not in historic)
+        )
+        return super().to_representation(data)
+
+
 @doc(_("""Tool revision."""))
 class ToolRevisionSerializer(RevisionSerializer):
     """Tool revision."""
@@ -350,29 +412,21 @@ class ToolRevisionDetailSerializer(ToolRevisionSerializer):
             ret["toolinfo"] = {}
         return ret
 
-    def _get_historic_data(self, obj):
-        """Get historic data for a given Tool version."""
-        data = obj.field_dict
-
-        data["annotations"] = {}
-        qs = obj.revision.version_set.get_for_model(Annotations)
-        ann = qs.first()
-        if ann is not None:
-            data["annotations"] = ann.field_dict
-
-        return data
-
     @extend_schema_field(ToolSerializer(many=False))
     def get_toolinfo(self, obj):
         """Get historic toolinfo."""
-        serializer = ToolSerializer(self._get_historic_data(obj), many=False)
-        return serializer.data
+        historic = self.context.get("historic_data", {})
+        data = historic.get(obj.pk)
+        if data is None:
+            data = get_historic_data(obj)
+        return ToolSerializer(data, many=False).data
 
     class Meta(ToolRevisionSerializer.Meta):
         """Configure serializer."""
 
         fields = list(ToolRevisionSerializer.Meta.fields)
         fields.append("toolinfo")
+        list_serializer_class = ToolRevisionDetailListSerializer
 
 
 @doc(_("""Tool revision difference."""))  # noqa: W0223
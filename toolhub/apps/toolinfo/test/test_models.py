@@ -21,7 +21,11 @@ import os
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
+import reversion
+
+from toolhub.apps.auditlog.models import LogEntry
 from toolhub.apps.user.models import ToolhubUser
+from toolhub.apps.versioned.models import Change
 
 from .. import models
 
@@ -234,6 +238,113 @@ class ToolManagerTest(TestCase):
         self.assertNotIn("__test__should__strip", cleaned)
         self.assertIn("comment", cleaned)
 
+    def test_from_toolinfo_many(self):
+        """Bulk create, update, and no-op with history."""
+        first = self.toolinfo.copy()
+        second = self.toolinfo.copy()
+        second["name"] = "second-tool"
+
+        results, errors = models.Tool.objects.from_toolinfo_many(
+            [first.copy(), second.copy()],
+            self.user,
+            models.Tool.ORIGIN_CRAWLER,
+            "bulk import",
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 2)
+        for obj, created, updated in results:
+            self.assertTrue(created)
+            self.assertFalse(updated)
+            self.assertIsNotNone(obj.pk)
+            self.assertIsNotNone(obj.annotations.pk)
+        self.assertToolBasics(results[0][0], self.toolinfo)
+
+        tool = models.Tool.objects.get(name=second["name"])
+        self.assertIsNotNone(
+            models.Annotations.objects.get(tool=tool).pk,
+        )
+        versions = reversion.models.Version.objects.get_for_object(tool)
+        self.assertEqual(versions.count(), 1)
+        revision = versions[0].revision
+        self.assertEqual(revision.comment, "bulk import")
+        self.assertEqual(revision.user, self.user)
+        self.assertFalse(revision.meta.suppressed)
+        self.assertEqual(revision.version_set.count(), 2)
+        entry = LogEntry.objects.get_for_object(tool).get()
+        self.assertEqual(entry.action, LogEntry.CREATE)
+        self.assertEqual(entry.user, self.user)
+        self.assertEqual(entry.change_message, "bulk import")
+        self.assertEqual(entry.params["revision"], versions[0].pk)
+        change = Change.objects.get(version=versions[0])
+        self.assertEqual(change.content_id, tool.name)
+        self.assertEqual(change.comment, "bulk import")
+
+        with self.assertNumQueries(1):
+            # Unchanged records only cost the prefetch query
+            models.Tool.objects.from_toolinfo_many(
+                [first.copy(), second.copy()],
+                self.user,
+                models.Tool.ORIGIN_CRAWLER,
+            )
+
+        second["title"] = "Updated title"
+        results, errors = models.Tool.objects.from_toolinfo_many(
+            [first.copy(), second.copy()],
+            self.user,
+            models.Tool.ORIGIN_CRAWLER,
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [(r[1], r[2]) for r in results], [(False, False), (False, True)]
+        )
+        tool.refresh_from_db()
+        self.assertEqual(tool.title, "Updated title")
+        self.assertEqual(
+            reversion.models.Version.objects.get_for_object(tool).count(), 2
+        )
+        self.assertEqual(
+            LogEntry.objects.get_for_object(tool)
+            .filter(action=LogEntry.UPDATE)
+            .count(),
+            1,
+        )
+
+    def test_from_toolinfo_many_revive(self):
+        """Bulk update revives soft deleted tools."""
+        obj, _, _ = models.Tool.objects.from_toolinfo(
+            self.toolinfo.copy(), self.user, models.Tool.ORIGIN_CRAWLER
+        )
+        obj.delete()
+
+        results, errors = models.Tool.objects.from_toolinfo_many(
+            [self.toolinfo.copy()], self.user, models.Tool.ORIGIN_CRAWLER
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(results[0][1:], (False, True))
+        self.assertEqual(
+            models.Tool.objects.get(name=obj.name).pk,
+            obj.pk,
+        )
+
+    def test_from_toolinfo_many_errors(self):
+        """Invalid records are reported without blocking valid ones."""
+        models.Tool.objects.from_toolinfo(
+            self.toolinfo.copy(), self.user, models.Tool.ORIGIN_API
+        )
+        other = self.toolinfo.copy()
+        other["name"] = "other-tool"
+
+        results, errors = models.Tool.objects.from_toolinfo_many(
+            [self.toolinfo.copy(), other.copy(), other.copy()],
+            self.user,
+            models.Tool.ORIGIN_CRAWLER,
+        )
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0].name, "other-tool")
+        self.assertEqual(
+            [e.code for _, e in errors], ["duplicate", "invariant"]
+        )
+
     def test_empty_string_none_eqivalance_T293103(self):
         """Normalization should treat empty string and None as equal."""
         obj, created, updated = models.Tool.objects.from_toolinfo(
@@ -15,12 +15,16 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from reversion.models import Version
 
 from toolhub.apps.versioned.context import reversion_context
 from toolhub.tests import TestCase
 
 from .. import models
+from .. import serializers
 
 
 class ToolViewSetTest(TestCase):
@@ -223,6 +227,29 @@ class ToolRevisionViewSetTest(TestCase):
         self.assertIn("results", response.data)
         self.assertEqual(len(response.data["results"]), 2)
 
+    def test_list_parent_child_ids(self):
+        """Test list links each revision to its neighbours."""
+        self.client.force_authenticate(user=None)
+        url = "/api/tools/{name}/revisions/".format(name=self.tool.name)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        short_history_queries = len(ctx)
+
+        for i in range(3):
+            with reversion_context(self.user, "edit {}".format(i)):
+                self.tool.title = "Title {}".format(i)
+                self.tool.save()
+        ids = list(self.versions().values_list("id", flat=True))
+
+        # Query count does not depend on the length of the history
+        with self.assertNumQueries(short_history_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([r["id"] for r in results], ids)
+        self.assertEqual([r["parent_id"] for r in results], ids[1:] + [None])
+        self.assertEqual([r["child_id"] for r in results], [None] + ids[:-1])
+
     def test_retrieve(self):
         """Test retrieve action."""
         self.client.force_authenticate(user=None)
@@ -235,6 +262,20 @@ class ToolRevisionViewSetTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_load_historic_data(self):
+        """Test historic data for many versions is loaded together."""
+        versions = list(self.versions().select_related("content_type"))
+        self.assertEqual(len(versions), 2)
+        with self.assertNumQueries(1):
+            historic = serializers.load_historic_data(versions)
+        newest = historic[versions[0].pk]
+        self.assertEqual(newest["name"], self.tool.name)
+        for key, value in self.annotations.items():
+            self.assertEqual(newest["annotations"][key], value)
+        # Returned data is independent of the memoized field_dict
+        newest["name"] = "changed"
+        self.assertEqual(versions[0].field_dict["name"], self.tool.name)
+
     def test_diff(self):
         """Test diff action."""
         self.client.force_authenticate(user=None)
@@ -36,6 +36,7 @@ from rest_framework.decorators import action
 from reversion.models import Version
 
 from toolhub.apps.auditlog.models import LogEntry
+from toolhub.apps.versioned import diffs
 from toolhub.apps.versioned.exceptions import ConflictingState
 from toolhub.apps.versioned.exceptions import CurrentRevision
 from toolhub.apps.versioned.exceptions import PatrolledRevision
@@ -45,7 +46,6 @@ from toolhub.permissions import ObjectPermissions
 from toolhub.permissions import ObjectPermissionsOrAnonReadOnly
 from toolhub.serializers import CommentSerializer
 
-from .models import Annotations
 from .models import Tool
 from .serializers import AnnotationsSerializer
 from .serializers import CreateToolSerializer
@@ -56,6 +56,7 @@ from .serializers import ToolRevisionSerializer
 from .serializers import ToolSerializer
 from .serializers import UpdateAnnotationsSerializer
 from .serializers import UpdateToolSerializer
+from .serializers import get_historic_data
 from .spdx import SPDX_LICENSES
 
 
@@ -254,6 +255,7 @@ class ToolRevisionViewSet(viewsets.ReadOnlyModelViewSet):
             "revision",
             "revision__user",
             "revision__meta",
+            "content_type",
         )
         qs = qs.get_for_object(tool)
         return qs
@@ -264,18 +266,6 @@ class ToolRevisionViewSet(viewsets.ReadOnlyModelViewSet):
             return ToolRevisionDetailSerializer
         return ToolRevisionSerializer
 
-    def _get_historic_data(self, tool_version):
-        """Get historic data for a given Tool version."""
-        data = tool_version.field_dict
-
-        data["annotations"] = {}
-        qs = tool_version.revision.version_set.get_for_model(Annotations)
-        ann = qs.first()
-        if ann is not None:
-            data["annotations"] = ann.field_dict
-
-        return data
-
     def _get_patch(self, left, right, request):
         """Compute the JSON Patch between revisions."""
         # Our built-in permissions checking doesn't trigger on GET/HEAD
@@ -288,12 +278,7 @@ class ToolRevisionViewSet(viewsets.ReadOnlyModelViewSet):
         if right.revision.meta.suppressed and not user.has_perms(perms, right):
             raise SuppressedRevision()
 
-        data_left = ToolSerializer(self._get_historic_data(left)).data
-        data_right = ToolSerializer(self._get_historic_data(right)).data
-        # T279484: exclude modified_date from diff
-        del data_left["modified_date"]
-        del data_right["modified_date"]
-        return jsonpatch.make_patch(data_left, data_right)
+        return diffs.get_patch(left, right)
 
     @transaction.atomic
     def _update_tool(self, data, request):
@@ -358,7 +343,7 @@ class ToolRevisionViewSet(viewsets.ReadOnlyModelViewSet):
         rev_id = kwargs["pk"]
         qs = self.get_queryset()
         rev = get_object_or_404(qs, pk=rev_id)
-        data = self._get_historic_data(rev)
+        data = get_historic_data(rev)
         data["comment"] = _(
             "Revert to revision %(rev_id)s dated %(datetime)s by %(user)s"
         ) % {
@@ -386,7 +371,7 @@ class ToolRevisionViewSet(viewsets.ReadOnlyModelViewSet):
         patch = self._get_patch(version_left, version_right, request)
 
         head = qs.first()  # Most recent version
-        data = self._get_historic_data(head)
+        data = get_historic_data(head)
 
         try:
             jsonpatch.apply_patch(data, patch, in_place=True)
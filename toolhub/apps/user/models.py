@@ -16,7 +16,13 @@
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from django_prometheus.models import ExportModelOperationsMixin
@@ -49,3 +55,77 @@ class ToolhubUser(ExportModelOperationsMixin("user"), AbstractUser):
     def auditlog_label(self):
         """Get label for use in auditlog output."""
         return self.username
+
+
+def groups_cache_key(user_id):
+    """Get the cache key for the names of a user's groups."""
+    return "user:groups:{}".format(user_id)
+
+
+def get_group_names(user):
+    """Get the names of the groups that a user is a member of.
+
+    The names are cached until the user's group membership changes. They
+    are also stored on the user object in the attribute that
+    rules.is_group_member predicates check before querying the database.
+
+    :rtype: frozenset(str)
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, "_group_names_cache", None)
+    if names is None:
+        key = groups_cache_key(user.pk)
+        names = cache.get(key)
+        if names is None:
+            names = list(user.groups.values_list("name", flat=True))
+            cache.set(key, names)
+        names = set(names)
+        user._group_names_cache = names
+    return frozenset(names)
+
+
+def invalidate_groups_cache(user_ids):
+    """Forget the cached group names of the given users."""
+    cache.delete_many([groups_cache_key(pk) for pk in user_ids])
+
+
+@receiver(m2m_changed, sender=ToolhubUser.groups.through)
+def groups_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):  # noqa: W0613
+    """Forget cached group names when group membership changes.
+
+    The cache is cleared after the change so that a concurrent read cannot
+    cache the old membership again.
+    """
+    if reverse and action == "pre_clear":
+        # Remember the members of the group before they are removed
+        instance._cleared_user_ids = list(
+            instance.user_set.values_list("pk", flat=True)
+        )
+    elif action in ["post_add", "post_remove", "post_clear"]:
+        if not reverse:
+            invalidate_groups_cache([instance.pk])
+        elif action == "post_clear":
+            invalidate_groups_cache(
+                instance.__dict__.pop("_cleared_user_ids", [])
+            )
+        else:
+            invalidate_groups_cache(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):  # noqa: W0613
+    """Forget cached group names of members of a renamed or deleted group."""
+    if kwargs.get("created", False):
+        return
+    invalidate_groups_cache(instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=ToolhubUser)
+def user_created(sender, instance, created, **kwargs):  # noqa: W0613
+    """Forget any cached group names left behind for a reused user id."""
+    if created:
+        invalidate_groups_cache([instance.pk])
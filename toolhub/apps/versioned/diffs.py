@@ -0,0 +1,110 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+"""Cached JSON Patch diffs between versions of an object.
+
+Diffs are cached under a key derived from the ids and stored data of both
+versions, so a cached diff is never used for versions with other content.
+Cache entries expire after REVISION_DIFF_CACHE_TIMEOUT seconds and are
+otherwise evicted by the cache backend.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+import jsonpatch
+
+from reversion.models import Version
+
+
+logger = logging.getLogger(__name__)
+
+# Functions which build the data compared by a diff for each content type.
+# Each takes a list of Versions of that type and returns a list of
+# JSON-compatible dicts in the same order.
+SNAPSHOTS = {
+    "tool": "toolhub.apps.toolinfo.serializers.get_diff_snapshots",
+    "toollist": "toolhub.apps.lists.serializers.get_diff_snapshots",
+}
+
+# Bump when snapshot contents change to ignore previously cached diffs
+CACHE_VERSION = 1
+
+
+def cache_key(left, right):
+    """Get the cache key for the diff between two versions."""
+    digest = hashlib.sha256()
+    for version in (left, right):
+        digest.update(
+            "{}:{}:{}\n".format(
+                version.pk, version.revision_id, version.serialized_data
+            ).encode("utf-8")
+        )
+    return "versioned:diff:{}:{}".format(CACHE_VERSION, digest.hexdigest())
+
+
+def get_snapshots(versions):
+    """Get the data compared by diffs for versions of one content type."""
+    loader = import_string(SNAPSHOTS[versions[0].content_type.model])
+    return loader(versions)
+
+
+def get_patch(left, right):
+    """Get the JSON Patch which turns one version into another.
+
+    :param left: Version to apply changes to
+    :param right: Version after applying changes
+    :rtype: jsonpatch.JsonPatch
+    """
+    key = cache_key(left, right)
+    ops = cache.get(key)
+    if ops is None:
+        data_left, data_right = get_snapshots([left, right])
+        patch = jsonpatch.make_patch(data_left, data_right)
+        ops = patch.patch
+        cache.set(key, ops, settings.REVISION_DIFF_CACHE_TIMEOUT)
+    return jsonpatch.JsonPatch(ops)
+
+
+def warm_parent_diffs(versions):
+    """Compute and cache diffs from the previous version of each version.
+
+    Failures are logged rather than raised as the diffs will be computed
+    again when they are requested.
+    """
+    for version in versions:
+        if version.content_type.model not in SNAPSHOTS:
+            continue
+        try:
+            parent = (
+                Version.objects.select_related("revision", "content_type")
+                .filter(
+                    content_type_id=version.content_type_id,
+                    object_id=version.object_id,
+                    db=version.db,
+                    pk__lt=version.pk,
+                )
+                .order_by("-pk")
+                .first()
+            )
+            if parent is not None:
+                get_patch(parent, version)
+        except Exception:  # noqa: B902
+            logger.exception("Failed to compute diff for %s", version)
@@ -0,0 +1,73 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reversion.models import Version
+
+from toolhub.apps.versioned.models import Change
+
+
+class Command(BaseCommand):
+    """Populate the recent changes feed from existing versions."""
+
+    help = (
+        "Populate the recent changes feed from existing versions"  # noqa: A003
+    )
+
+    def add_arguments(self, parser):
+        """Add CLI arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of versions to process per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        qs = (
+            Version.objects.select_related(
+                "revision", "revision__meta", "content_type"
+            )
+            .filter(content_type__model__in=Change.objects.FEED_MODELS)
+            .exclude(revision__meta__revision_id__isnull=True)
+            .order_by("pk")
+        )
+        last_pk = 0
+        total = 0
+        while True:
+            batch = list(qs.filter(pk__gt=last_pk)[: options["batch_size"]])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changes = []
+            for version in batch:
+                changes.extend(
+                    Change.objects.from_versions(
+                        [version], version.revision.meta
+                    )
+                )
+            with transaction.atomic():
+                # Versions that already have an entry are skipped
+                created = Change.objects.bulk_create(
+                    changes, ignore_conflicts=True
+                )
+            total += len(created)
+        if options["verbosity"] > 0:
+            self.stdout.write("Processed {} versions".format(total))
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db import models
+
+
+# Index used to find the previous and next versions of an object. The
+# Version model belongs to django-reversion, so the index cannot be declared
+# in the model's Meta, and AddIndex can only alter models of the app that
+# owns the migration. The schema editor is used directly instead.
+INDEX = models.Index(
+    fields=["content_type", "object_id", "db", "id"],
+    name="versioned_version_chain_idx",
+)
+
+
+def add_index(apps, schema_editor):
+    """Add the version chain index."""
+    Version = apps.get_model("reversion", "Version")
+    schema_editor.add_index(Version, INDEX)
+
+
+def remove_index(apps, schema_editor):
+    """Remove the version chain index."""
+    Version = apps.get_model("reversion", "Version")
+    schema_editor.remove_index(Version, INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("versioned", "0002_tool_convert_author_to_jsonschema"),
+        ("reversion", "0002_add_index_on_version_for_content_type_and_db"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
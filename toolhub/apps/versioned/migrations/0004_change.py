@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reversion', '0002_add_index_on_version_for_content_type_and_db'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('versioned', '0003_version_chain_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('version', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='reversion.version')),
+                ('timestamp', models.DateTimeField(help_text='The timestamp of the revision.')),
+                ('comment', models.TextField(blank=True)),
+                ('object_id', models.CharField(max_length=191)),
+                ('content_id', models.CharField(help_text='Name of the tool or id of the list.', max_length=255)),
+                ('content_title', models.CharField(blank=True, max_length=255)),
+                ('suppressed', models.BooleanField(default=False)),
+                ('patrolled', models.BooleanField(default=False)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('revision', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reversion.revision')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            #BUG(django-prometheus/issues/42) bases=(django_prometheus.models.Mixin, models.Model),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['timestamp', 'version'], name='versioned_change_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['patrolled', 'timestamp', 'version'], name='versioned_change_patrol_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['user', 'timestamp'], name='versioned_change_user_idx'),
+        ),
+    ]
@@ -15,12 +15,20 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from django_prometheus.models import ExportModelOperationsMixin
 
 import reversion
+from reversion.models import Version
+from reversion.signals import post_revision_commit
+
+from . import diffs
 
 
 class RevisionMetadata(ExportModelOperationsMixin("revision"), models.Model):
@@ -46,3 +54,139 @@ class RevisionMetadata(ExportModelOperationsMixin("revision"), models.Model):
         db_index=True,
         help_text=_("Has this revision been reviewed by a patroller?"),
     )
+
+
+class ChangeManager(models.Manager):
+    """Custom manager for Change models."""
+
+    # Content types which are shown in the recent changes feed
+    FEED_MODELS = ("tool", "toollist")
+
+    def from_versions(self, versions, meta):
+        """Build unsaved Change models for versions in a revision.
+
+        :param versions: Version models sharing a single revision
+        :param meta: RevisionMetadata for the revision
+        """
+        changes = []
+        for version in versions:
+            model = version.content_type.model
+            if model not in self.FEED_MODELS:
+                continue
+            fields = version._local_field_dict
+            if model == "tool":
+                content_id = fields["name"]
+            else:
+                content_id = str(fields["id"])
+            changes.append(
+                self.model(
+                    version=version,
+                    revision_id=version.revision_id,
+                    timestamp=meta.revision.date_created,
+                    user_id=meta.revision.user_id,
+                    comment=meta.revision.comment,
+                    content_type_id=version.content_type_id,
+                    object_id=version.object_id,
+                    content_id=content_id,
+                    content_title=fields.get("title") or "",
+                    suppressed=meta.suppressed,
+                    patrolled=meta.patrolled,
+                )
+            )
+        return changes
+
+
+class Change(ExportModelOperationsMixin("change"), models.Model):
+    """Denormalized recent changes feed entry for a tool or list version.
+
+    Rows are added when a revision is committed and kept in sync with the
+    RevisionMetadata flags. Use the `backfill_changes` management command
+    to populate the table from existing versions.
+    """
+
+    version = models.OneToOneField(
+        Version,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    revision = models.ForeignKey(
+        reversion.models.Revision,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    timestamp = models.DateTimeField(
+        help_text=_("The timestamp of the revision."),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+    comment = models.TextField(blank=True)
+    content_type = models.ForeignKey(
+        "contenttypes.ContentType",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    object_id = models.CharField(max_length=191)
+    content_id = models.CharField(
+        max_length=255,
+        help_text=_("Name of the tool or id of the list."),
+    )
+    content_title = models.CharField(max_length=255, blank=True)
+    suppressed = models.BooleanField(default=False)
+    patrolled = models.BooleanField(default=False)
+
+    objects = ChangeManager()
+
+    class Meta:
+        """Metadata for model."""
+
+        indexes = [
+            models.Index(
+                fields=["timestamp", "version"],
+                name="versioned_change_ts_idx",
+            ),
+            models.Index(
+                fields=["patrolled", "timestamp", "version"],
+                name="versioned_change_patrol_idx",
+            ),
+            models.Index(
+                fields=["user", "timestamp"],
+                name="versioned_change_user_idx",
+            ),
+        ]
+
+
+@receiver(post_revision_commit)
+def add_changes(sender, revision, versions, **kwargs):  # noqa: W0613
+    """Add recent changes feed entries for a committed revision."""
+    try:
+        meta = revision.meta
+    except RevisionMetadata.DoesNotExist:
+        # Initial revisions created outside of reversion_context are not
+        # part of the feed
+        return
+    Change.objects.bulk_create(Change.objects.from_versions(versions, meta))
+
+
+@receiver(post_revision_commit)
+def warm_diffs(sender, revision, versions, **kwargs):  # noqa: W0613
+    """Compute diffs for a committed revision if eager diffs are enabled."""
+    if not settings.REVISION_DIFF_EAGER:
+        return
+    transaction.on_commit(lambda: diffs.warm_parent_diffs(versions))
+
+
+@receiver(post_save, sender=RevisionMetadata)
+def sync_change_flags(sender, instance, created, **kwargs):  # noqa: W0613
+    """Copy suppressed and patrolled flags to recent changes entries."""
+    if created:
+        return
+    Change.objects.filter(revision_id=instance.revision_id).update(
+        suppressed=instance.suppressed,
+        patrolled=instance.patrolled,
+    )
@@ -17,8 +17,8 @@
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
 import logging
 
-from django.apps import apps
-from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import OuterRef
+from django.db.models import Subquery
 from django.utils.translation import gettext_lazy as _
 
 from drf_spectacular.utils import extend_schema_field
@@ -33,11 +33,63 @@ from toolhub.permissions import is_oversighter
 from toolhub.serializers import ModelSerializer
 
 from . import schema
+from .models import Change
 
 
 logger = logging.getLogger(__name__)
 
 
+def get_revision_links(pks):
+    """Get the previous and next version ids for many versions.
+
+    The ids are found with correlated subqueries against the version chain
+    index, so the cost depends on the number of versions asked about and
+    not on the length of each object's history.
+
+    :param pks: Version ids
+    :return: dict of version id to (parent id, child id)
+    """
+    siblings = Version.objects.filter(
+        content_type=OuterRef("content_type"),
+        object_id=OuterRef("object_id"),
+        db=OuterRef("db"),
+    )
+    qs = (
+        Version.objects.filter(pk__in=pks)
+        .annotate(
+            parent_pk=Subquery(
+                siblings.filter(pk__lt=OuterRef("pk"))
+                .order_by("-pk")
+                .values("pk")[:1]
+            ),
+            child_pk=Subquery(
+                siblings.filter(pk__gt=OuterRef("pk"))
+                .order_by("pk")
+                .values("pk")[:1]
+            ),
+        )
+        .values_list("pk", "parent_pk", "child_pk")
+    )
+    return {pk: (parent, child) for pk, parent, child in qs}
+
+
+class RevisionListSerializer(serializers.ListSerializer):
+    """Serialize many revisions.
+
+    Parent and child ids for all of the revisions are looked up with a
+    single query before the individual revisions are serialized.
+    """
+
+    def to_representation(self, data):
+        """Generate primative representation of many revisions."""
+        data = list(data.all() if hasattr(data, "all") else data)
+        links = self.context.setdefault("revision_links", {})
+        missing = [v.pk for v in data if v.pk not in links]
+        if missing:
+            links.update(get_revision_links(missing))
+        return super().to_representation(data)
+
+
 class RevisionSerializer(ModelSerializer):
     """Reusable serializer for revision summary information.
 
@@ -92,63 +144,12 @@ class RevisionSerializer(ModelSerializer):
             is_oversighter(user) or is_administrator(user)
         )
 
-    def _get_revision_ids(self, instance):
-        """Get a list of revision ids associated with the instance's model."""
-        ctx_key = "revision_ids({}, {}, {})".format(
-            instance.content_type.app_label,
-            instance.content_type.model,
-            instance.object_id,
-        )
-        if ctx_key in self.context:
-            return self.context[ctx_key]
-
-        target_model = apps.get_model(
-            instance.content_type.app_label,
-            instance.content_type.model,
-        )
-        try:
-            if hasattr(target_model, "all_objects"):
-                # This should be the common case. `all_objects` is the manager
-                # on safedelete model subclasses that returns deleted objects
-                # too. Versioned models should typically also be safedelete
-                # models.
-                target = target_model.all_objects.get(pk=instance.object_id)
-            else:
-                target = target_model.objects.get(pk=instance.object_id)
-        except ObjectDoesNotExist:
-            # This really should not happen unless someone starts versioning
-            # models that are not also safedelete models. And why would that
-            # be a good idea?
-            logger.error(
-                "Model <%s: pk=%s> not found",
-                target_model.__class__,
-                instance.object_id,
-            )
-            return []
-
-        qs = Version.objects.get_for_object(target)
-        qs = qs.order_by("id").values_list("id", flat=True)
-
-        self.context[ctx_key] = list(qs)
-        return self.context[ctx_key]
-
     def _get_parent_and_child_ids(self, instance):
         """Get the id of the previous and next versions."""
-        ids = self._get_revision_ids(instance)
-
-        try:
-            current_idx = ids.index(instance.id)
-        except ValueError:
-            # This should only happen if _get_revision_ids returned an empty
-            # list.
-            return (None, None)
-
-        parent_idx = current_idx - 1
-        parent_id = ids[parent_idx] if parent_idx >= 0 else None
-        child_idx = current_idx + 1
-        child_id = ids[child_idx] if child_idx < len(ids) else None
-
-        return (parent_id, child_id)
+        links = self.context.setdefault("revision_links", {})
+        if instance.pk not in links:
+            links.update(get_revision_links([instance.pk]))
+        return links.get(instance.pk, (None, None))
 
     def to_representation(self, instance):
         """Generate primative representation of a model instance."""
@@ -185,6 +186,7 @@ class RevisionSerializer(ModelSerializer):
         """Configure serializer."""
 
         model = Version
+        list_serializer_class = RevisionListSerializer
         fields = [
             "id",
             "timestamp",
@@ -200,6 +202,63 @@ class RevisionSerializer(ModelSerializer):
         ]
 
 
+class ChangeSerializer(RevisionSerializer):
+    """Recent changes feed entry.
+
+    Renders the same representation as RevisionSerializer from the
+    denormalized Change table.
+    """
+
+    id = serializers.IntegerField(  # noqa: A003
+        source="pk",
+        help_text=_("A unique integer value identifying this revision."),
+    )
+    timestamp = serializers.DateTimeField(
+        read_only=True,
+        help_text=_("The timestamp of the revision."),
+    )
+    user = UserSerializer(many=False, read_only=True)
+    comment = serializers.CharField(
+        read_only=True,
+        default="",
+        help_text=_("Comment by the user for the revision."),
+    )
+    suppressed = serializers.BooleanField(
+        read_only=True,
+        default=False,
+        help_text=_("Has this revision been marked as hidden?"),
+    )
+    patrolled = serializers.BooleanField(
+        read_only=True,
+        default=False,
+        help_text=_("Has this revision been reviewed by a patroller?"),
+    )
+
+    def _should_hide_details(self, instance):
+        """Should the details of this revision be hidden?"""
+        user = self.context["request"].user
+        return instance.suppressed and not (
+            is_oversighter(user) or is_administrator(user)
+        )
+
+    @extend_schema_field(schema.CONTENT_ID)
+    def get_content_id(self, instance):
+        """Get the identifier of the content being versioned"""
+        if instance.content_type.model == "toollist":
+            return int(instance.content_id)
+        return instance.content_id
+
+    @extend_schema_field(schema.CONTENT_TITLE)
+    def get_content_title(self, instance):
+        """Get the title of the content being versioned"""
+        return instance.content_title
+
+    class Meta(RevisionSerializer.Meta):
+        """Configure serializer."""
+
+        model = Change
+
+
 @extend_schema_field(schema.JSONPATCH)
 class JSONPatchField(serializers.JSONField):
     """JSONField with schema."""
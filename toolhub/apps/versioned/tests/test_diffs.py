@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from reversion.models import Version
+
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.versioned.context import reversion_context
+from toolhub.tests import TestCase
+
+from .. import diffs
+
+
+class DiffsTest(TestCase):
+    """Test cached revision diffs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup for all tests in this TestCase."""
+        cls.user = cls._user("user")
+
+    def setUp(self):
+        """Setup before each test."""
+        cache.clear()
+        with reversion_context(self.user):
+            self.toollist = ToolList.objects.create(
+                title="Before", created_by=self.user
+            )
+
+    def _edit(self):
+        with reversion_context(self.user):
+            self.toollist.title = "After"
+            self.toollist.save()
+
+    def _versions(self):
+        return list(
+            Version.objects.get_for_object(self.toollist).order_by("pk")
+        )
+
+    def test_get_patch_cached(self):
+        """Test patches are computed once."""
+        self._edit()
+        left, right = self._versions()
+        with mock.patch.object(
+            diffs, "get_snapshots", wraps=diffs.get_snapshots
+        ) as snapshots:
+            patch = diffs.get_patch(left, right)
+            self.assertEqual(snapshots.call_count, 1)
+            again = diffs.get_patch(left, right)
+            self.assertEqual(snapshots.call_count, 1)
+        self.assertEqual(
+            list(patch),
+            [{"op": "replace", "path": "/title", "value": "After"}],
+        )
+        self.assertEqual(list(again), list(patch))
+
+    def test_cache_key_content(self):
+        """Test cache keys depend on version data."""
+        self._edit()
+        left, right = self._versions()
+        key = diffs.cache_key(left, right)
+        self.assertNotEqual(key, diffs.cache_key(right, left))
+        right.serialized_data = right.serialized_data.replace("After", "X")
+        self.assertNotEqual(key, diffs.cache_key(left, right))
+
+    @override_settings(REVISION_DIFF_EAGER=True)
+    def test_eager(self):
+        """Test diffs are computed when a revision commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._edit()
+        left, right = self._versions()
+        self.assertIsNotNone(cache.get(diffs.cache_key(left, right)))
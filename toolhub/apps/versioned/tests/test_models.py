@@ -0,0 +1,103 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+from io import StringIO
+
+from django.core.management import call_command
+
+import reversion
+
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.versioned.context import reversion_context
+from toolhub.tests import TestCase
+
+from ..models import Change
+
+
+class ChangeTest(TestCase):
+    """Test the recent changes feed table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup for all tests in this TestCase."""
+        cls.user = cls._user("user")
+
+    def _make_list(self):
+        with reversion_context(self.user, "create"):
+            return ToolList.objects.create(
+                title="Feed test", created_by=self.user
+            )
+
+    def test_added_on_commit(self):
+        """Test a change is added when a revision is committed."""
+        toollist = self._make_list()
+        change = Change.objects.get(object_id=str(toollist.pk))
+        self.assertEqual(change.content_id, str(toollist.pk))
+        self.assertEqual(change.content_title, "Feed test")
+        self.assertEqual(change.comment, "create")
+        self.assertEqual(change.user, self.user)
+        self.assertEqual(change.timestamp, change.revision.date_created)
+        self.assertFalse(change.patrolled)
+
+    def test_initial_revision_skipped(self):
+        """Test revisions without metadata are not added."""
+        with reversion.create_revision():
+            ToolList.objects.create(title="No meta", created_by=self.user)
+        self.assertFalse(
+            Change.objects.filter(content_title="No meta").exists()
+        )
+
+    def test_flags_synced(self):
+        """Test metadata flags are copied to the change."""
+        toollist = self._make_list()
+        change = Change.objects.get(object_id=str(toollist.pk))
+        meta = change.revision.meta
+        meta.patrolled = True
+        meta.suppressed = True
+        meta.save()
+        change.refresh_from_db()
+        self.assertTrue(change.patrolled)
+        self.assertTrue(change.suppressed)
+
+    def test_backfill(self):
+        """Test backfill_changes command."""
+        toollist = self._make_list()
+        Change.objects.all().delete()
+
+        out = StringIO()
+        call_command("backfill_changes", stdout=out)
+        self.assertIn("Processed 1 versions", out.getvalue())
+        self.assertTrue(
+            Change.objects.filter(object_id=str(toollist.pk)).exists()
+        )
+
+        # Existing entries are left alone
+        out = StringIO()
+        call_command("backfill_changes", stdout=out)
+        self.assertEqual(Change.objects.count(), 1)
+
+    def test_recent_changes(self):
+        """Test recent changes are served from the feed."""
+        toollist = self._make_list()
+        response = self.client.get("/api/recent/", {"patrolled": False})
+        self.assertEqual(response.status_code, 200)
+        result = response.data["results"][0]
+        self.assertEqual(result["content_type"], "toollist")
+        self.assertEqual(result["content_id"], toollist.pk)
+        self.assertEqual(result["content_title"], "Feed test")
+        self.assertEqual(result["user"]["username"], "user")
+        self.assertIsNone(result["parent_id"])
@@ -26,16 +26,17 @@ from drf_spectacular.utils import extend_schema_view
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 
-from reversion.models import Version
+from toolhub.pagination import KeysetPagination
 
-from .serializers import RevisionSerializer
+from .models import Change
+from .serializers import ChangeSerializer
 
 
 class RecentChangesFilter(filters.FilterSet):
     """Custom query filters for RecentChanges endpoints."""
 
     user = filters.CharFilter(
-        field_name="revision__user__username",
+        field_name="user__username",
         lookup_expr="exact",
         help_text=_("Only show recent changes by the given user."),
     )
@@ -45,21 +46,21 @@ class RecentChangesFilter(filters.FilterSet):
         help_text=_("Only show recent changes for the given target type."),
     )
     suppressed = filters.BooleanFilter(
-        field_name="revision__meta__suppressed",
+        field_name="suppressed",
         help_text=_(
             "Only show recent changes where suppressed field is either "
             "true or false",
         ),
     )
     patrolled = filters.BooleanFilter(
-        field_name="revision__meta__patrolled",
+        field_name="patrolled",
         help_text=_(
             "Only show recent changes where patrolled field is either "
             "true or false",
         ),
     )
     date_created = filters.IsoDateTimeFromToRangeFilter(
-        field_name="revision__date_created",
+        field_name="timestamp",
         help_text=_("Only show recent changes within this time range"),
     )
 
@@ -70,20 +71,13 @@ class RecentChangesFilter(filters.FilterSet):
 class RecentChangesViewSet(viewsets.ReadOnlyModelViewSet):
     """Historical revisions of a tool list."""
 
-    serializer_class = RevisionSerializer
+    serializer_class = ChangeSerializer
     permission_classes = [AllowAny]
     filterset_class = RecentChangesFilter
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-timestamp", "-pk")
 
     def get_queryset(self):
-        """Sort Version queryset by revision__date_created"""
-        qs = Version.objects.select_related(
-            "revision",
-            "revision__meta",
-            "content_type",
-        )
-        qs = qs.filter(content_type__model__in=["tool", "toollist"])
-        # Exclude is used as a hack-around to remove Initial Revisions since
-        # those do not have .meta property and will break the code.
-        qs = qs.exclude(revision__meta__revision_id__isnull=True)
-
-        return qs.order_by("-revision__date_created")
+        """Sort Change queryset by timestamp."""
+        qs = Change.objects.select_related("user", "content_type")
+        return qs.order_by("-timestamp", "-pk")
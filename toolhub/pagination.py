@@ -15,7 +15,20 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.utils.urls import remove_query_param
 
 
 class CustomPagination(pagination.PageNumberPagination):
@@ -23,3 +36,192 @@ class CustomPagination(pagination.PageNumberPagination):
 
     page_size_query_param = "page_size"
     max_page_size = 1000
+
+
+class KeysetPagination(CustomPagination):
+    """Page number pagination with an optional keyset cursor mode.
+
+    Requests that include a `cursor` query parameter are paginated by
+    filtering on the ordering values of the last row seen rather than with
+    OFFSET and COUNT, so every page costs the same no matter how deep it
+    is. An empty cursor selects the first page. Requests without a cursor
+    keep the page number behavior.
+
+    The view must set `keyset_ordering` to a tuple of descending field
+    names whose last member is unique, for example
+    ``("-timestamp", "-id")``.
+
+    The `previous` link of a cursor page selects rows newer than the first
+    row on the page. Polling it returns changes made since the page was
+    fetched; when there is nothing new the same link is returned again.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _(
+        "Cursor for keyset pagination. Send an empty value to fetch the "
+        "first page, then follow the `next` and `previous` links."
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate a queryset by page number or by cursor."""
+        if self.cursor_query_param not in request.query_params:
+            self.cursor = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.cursor = self.decode_cursor(
+            request.query_params[self.cursor_query_param]
+        )
+        self.fields = [f.lstrip("-") for f in view.keyset_ordering]
+        self.page_size = self.get_page_size(request)
+        values, reverse = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*self.fields)
+        else:
+            queryset = queryset.order_by(*view.keyset_ordering)
+        if values is not None:
+            values = self.clean_values(queryset.model, values)
+            queryset = queryset.filter(self.keyset_filter(values, reverse))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+        self.results = results
+        return results
+
+    def clean_values(self, model, values):
+        """Convert cursor values to the types of the ordering fields."""
+        if len(values) != len(self.fields):
+            raise NotFound(_("Invalid cursor"))
+        cleaned = []
+        for name, value in zip(self.fields, values):
+            field = self.get_model_field(model, name)
+            try:
+                value = field.to_python(value)
+            except (TypeError, ValueError, ValidationError) as e:
+                raise NotFound(_("Invalid cursor")) from e
+            if value is None:
+                raise NotFound(_("Invalid cursor"))
+            cleaned.append(value)
+        return cleaned
+
+    def get_model_field(self, model, name):
+        """Get the model field for an ordering field name."""
+        parts = name.split("__")
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        if parts[-1] == "pk":
+            return model._meta.pk
+        return model._meta.get_field(parts[-1])
+
+    def keyset_filter(self, values, reverse):
+        """Build a filter selecting rows after the given ordering values.
+
+        For descending fields (a, b) this is ``a < x OR (a = x AND b < y)``.
+        """
+        lookup = "gt" if reverse else "lt"
+        pairs = list(zip(self.fields, values))
+        field, value = pairs[-1]
+        q = Q(**{"{}__{}".format(field, lookup): value})
+        for field, value in reversed(pairs[:-1]):
+            q = Q(**{"{}__{}".format(field, lookup): value}) | (
+                Q(**{field: value}) & q
+            )
+        return q
+
+    def get_position(self, obj):
+        """Get the ordering values of a row."""
+        values = []
+        for field in self.fields:
+            value = obj
+            for attr in field.split("__"):
+                value = getattr(value, attr)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def encode_cursor(self, values, reverse):
+        """Build a url for the given cursor position."""
+        data = json.dumps({"p": values, "r": int(reverse)})
+        token = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, token):
+        """Parse a cursor into (values, reverse)."""
+        if not token:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            values = data["p"]
+            reverse = bool(data.get("r", False))
+        except (KeyError, TypeError, ValueError) as e:
+            raise NotFound(_("Invalid cursor")) from e
+        if not isinstance(values, list):
+            raise NotFound(_("Invalid cursor"))
+        return values, reverse
+
+    def get_next_link(self):
+        """Get a link to the next page."""
+        if self.cursor is None:
+            return super().get_next_link()
+        values, reverse = self.cursor
+        # Pages read backwards always have older rows after them
+        if self.results and (reverse or self.has_more):
+            return self.encode_cursor(
+                self.get_position(self.results[-1]), False
+            )
+        return None
+
+    def get_previous_link(self):
+        """Get a link to the previous page."""
+        if self.cursor is None:
+            return super().get_previous_link()
+        values, reverse = self.cursor
+        if self.results:
+            return self.encode_cursor(self.get_position(self.results[0]), True)
+        if reverse and values is not None:
+            # Nothing newer yet; poll the same position again
+            return self.encode_cursor(values, True)
+        return None
+
+    def get_paginated_response(self, data):
+        """Build the response for a page of results."""
+        if self.cursor is None:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response."""
+        ret = super().get_paginated_response_schema(schema)
+        ret["properties"]["count"][
+            "description"
+        ] = "Total number of results. Not included in cursor mode."
+        return ret
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the query parameters used for pagination."""
+        params = super().get_schema_operation_parameters(view)
+        params.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        )
+        return params
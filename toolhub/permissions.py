@@ -15,10 +15,14 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+
 from rest_framework import permissions
 
 import rules
 
+from toolhub.apps.user.models import get_group_names
+
 
 class ObjectPermissions(permissions.DjangoObjectPermissions):
     """Per object permissions checking for DRF."""
@@ -241,8 +245,58 @@ def register_model_permissions(conf):
                     register(perms, app, model, perm)
 
 
+# Placeholder for the user's id in the conditions of cached CASL rules
+USER_ID = object()
+
+
+class CASLProfile:
+    """Stand-in user for evaluating predicates for a permission profile."""
+
+    id = USER_ID  # noqa: A003
+    # rules.is_group_member requires a groups attribute, but reads the
+    # names from _group_names_cache when it is set.
+    groups = ()
+
+    def __init__(self, is_authenticated, group_names):
+        """Initialize object."""
+        self.is_authenticated = is_authenticated
+        self._group_names_cache = set(group_names)
+
+
 def casl_for_user(user):
     """Generate CASL authorization rules for the given user."""
+    profile_rules = casl_for_profile(
+        user.is_authenticated, get_group_names(user)
+    )
+    return [bind_casl_rule(rule, user.id) for rule in profile_rules]
+
+
+def bind_casl_rule(rule, user_id):
+    """Copy a CASL rule, replacing USER_ID placeholders with a user id."""
+    rule = dict(rule)
+    if "conditions" in rule:
+        rule["conditions"] = {
+            key: user_id if value is USER_ID else value
+            for key, value in rule["conditions"].items()
+        }
+    return rule
+
+
+@functools.lru_cache(maxsize=32)
+def casl_for_profile(is_authenticated, group_names):
+    """Generate CASL authorization rules for a permission profile.
+
+    The rules only depend on whether the user is authenticated and which
+    groups they are a member of, so they are computed once per process for
+    each combination. Conditions on the user's id use the USER_ID
+    placeholder.
+
+    :param is_authenticated: is the user authenticated?
+    :param group_names: names of the user's groups
+    :type group_names: frozenset(str)
+    :rtype: tuple(dict)
+    """
+    user = CASLProfile(is_authenticated, group_names)
     # CASL rules are sent to API consumers to help them understand if the
     # current user is allowed to perform certain actions. These rules can
     # largely be computed from our MODEL_PERMISSIONS base, but when things
@@ -343,7 +397,7 @@ def casl_for_user(user):
 
     # Filter out inverted rules. We don't need to state all the things that
     # cannot be done by the user, and we don't have any AND'd rules.
-    return [rule for rule in casl if not rule.get("inverted", False)]
+    return tuple(rule for rule in casl if not rule.get("inverted", False))
 
 
 register_model_permissions(MODEL_PERMISSIONS)
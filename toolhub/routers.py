@@ -75,6 +75,11 @@ root.register("spdx", toolinfo_views.SpdxViewSet, basename="spdx")
 root.register("tools", toolinfo_views.ToolViewSet, basename="tool")
 root.register("users", user_views.UserViewSet)
 root.register("user/favorites", lists_views.FavoritesViewSet)
+root.register(
+    "user/favorites-check",
+    lists_views.FavoritesCheckViewSet,
+    basename="favorites-check",
+)
 root.register(
     "recent", versioned_views.RecentChangesViewSet, basename="recent-changes"
 )
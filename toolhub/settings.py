@@ -293,6 +293,70 @@ ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = (
 )
 ELASTICSEARCH_DSL_AUTOSYNC = env.bool("ES_DSL_AUTOSYNC", default=True)
 ELASTICSEARCH_DSL_PARALLEL = env.bool("ES_DSL_PARALLEL", default=True)
+# Queue search index changes in the database instead of sending them to
+# Elasticsearch while handling a request. Run the process_index_queue
+# management command to send queued changes.
+SEARCH_INDEX_QUEUE = env.bool("SEARCH_INDEX_QUEUE", default=False)
+SEARCH_INDEX_QUEUE_BATCH_SIZE = env.int(
+    "SEARCH_INDEX_QUEUE_BATCH_SIZE", default=500
+)
+SEARCH_INDEX_QUEUE_MAX_ATTEMPTS = env.int(
+    "SEARCH_INDEX_QUEUE_MAX_ATTEMPTS", default=10
+)
+# Seconds to wait before retrying a failed change. Doubles for each attempt.
+SEARCH_INDEX_QUEUE_RETRY_DELAY = env.int(
+    "SEARCH_INDEX_QUEUE_RETRY_DELAY", default=30
+)
+
+# === Crawler ===
+# Maximum number of toolinfo urls to fetch concurrently
+CRAWLER_MAX_WORKERS = env.int("CRAWLER_MAX_WORKERS", default=8)
+# Maximum number of concurrent fetches to any single host
+CRAWLER_MAX_WORKERS_PER_HOST = env.int(
+    "CRAWLER_MAX_WORKERS_PER_HOST", default=2
+)
+# Maximum size in bytes of a toolinfo document
+CRAWLER_MAX_DOCUMENT_SIZE = env.int(
+    "CRAWLER_MAX_DOCUMENT_SIZE", default=32 * 1024 * 1024
+)
+# Maximum size in characters of a single toolinfo record
+CRAWLER_MAX_RECORD_SIZE = env.int(
+    "CRAWLER_MAX_RECORD_SIZE", default=256 * 1024
+)
+# Sustained requests per second allowed to any single host. Zero disables
+# rate limiting.
+CRAWLER_HOST_RATE = env.float("CRAWLER_HOST_RATE", default=2.0)
+# Requests allowed to a single host in a burst before rate limiting starts
+CRAWLER_HOST_BURST = env.int("CRAWLER_HOST_BURST", default=4)
+# Number of hosts to keep pooled keep-alive connections for
+CRAWLER_POOL_HOSTS = env.int("CRAWLER_POOL_HOSTS", default=32)
+# Bounds in seconds for the adaptive interval between crawls of a url
+CRAWLER_MIN_INTERVAL = env.int("CRAWLER_MIN_INTERVAL", default=60 * 60)
+CRAWLER_MAX_INTERVAL = env.int("CRAWLER_MAX_INTERVAL", default=24 * 60 * 60)
+# Maximum delay in seconds before retrying a url that is failing
+CRAWLER_MAX_BACKOFF = env.int("CRAWLER_MAX_BACKOFF", default=7 * 24 * 60 * 60)
+# Path of a node_exporter textfile to write crawler metrics to after each
+# `crawl` command run. Disabled when empty.
+CRAWLER_METRICS_TEXTFILE = env.str("CRAWLER_METRICS_TEXTFILE", default="")
+# Age in days after which unreviewed crawler revisions are deleted by the
+# `prune_crawler_revisions` command
+CRAWLER_REVISION_RETENTION_DAYS = env.int(
+    "CRAWLER_REVISION_RETENTION_DAYS", default=90
+)
+
+# === Revisions ===
+# Seconds to keep cached diffs between revisions
+REVISION_DIFF_CACHE_TIMEOUT = env.int(
+    "REVISION_DIFF_CACHE_TIMEOUT", default=7 * 24 * 60 * 60
+)
+# Compute and cache the diff from the previous revision as soon as a new
+# revision is committed.
+REVISION_DIFF_EAGER = env.bool("REVISION_DIFF_EAGER", default=False)
+
+# === Audit log ===
+# Age in days after which entries are moved to the archive table by the
+# `archive_auditlog` command
+AUDITLOG_ARCHIVE_DAYS = env.int("AUDITLOG_ARCHIVE_DAYS", default=365)
 
 # === Authentication ===
 AUTH_USER_MODEL = "user.ToolhubUser"
@@ -0,0 +1,149 @@
+# Copyright (c) 2026 Wikimedia Foundation and contributors.
+# All Rights Reserved.
+#
+# This file is part of Toolhub.
+#
+# Toolhub is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Toolhub is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
+import base64
+import datetime
+import json
+
+from django.utils import timezone
+
+from reversion.models import Version
+
+from toolhub.apps.auditlog.models import LogEntry
+from toolhub.apps.lists.models import ToolList
+from toolhub.apps.versioned.context import reversion_context
+
+from .testcases import TestCase
+
+
+class KeysetPaginationTest(TestCase):
+    """Test KeysetPagination."""
+
+    url = "/api/auditlogs/"
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup for all tests in this TestCase."""
+        cls.user = cls._user("user")
+        for i in range(5):
+            LogEntry.objects.log_action(
+                cls.user, cls.user, LogEntry.CREATE, "entry {}".format(i)
+            )
+        # Two entries with the same timestamp to check the id tie-break
+        ts = timezone.now() - datetime.timedelta(days=1)
+        LogEntry.objects.filter(
+            pk__in=LogEntry.objects.order_by("id").values_list("pk")[:2]
+        ).update(timestamp=ts)
+        cls.ids = list(
+            LogEntry.objects.order_by("-timestamp", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_page_number_default(self):
+        """Test page number pagination without a cursor."""
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], len(self.ids))
+        self.assertIn("page=2", response.data["next"])
+
+    def test_cursor_pages(self):
+        """Test following next links in cursor mode."""
+        seen = []
+        response = self.client.get(self.url, {"cursor": "", "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(r["id"] for r in response.data["results"])
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, self.ids)
+
+    def test_cursor_previous(self):
+        """Test previous links return newer entries."""
+        response = self.client.get(self.url, {"cursor": "", "page_size": 2})
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [r["id"] for r in response.data["results"]], self.ids[2:4]
+        )
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [r["id"] for r in response.data["results"]], self.ids[0:2]
+        )
+
+    def test_cursor_poll(self):
+        """Test polling the previous link of the first page."""
+        response = self.client.get(self.url, {"cursor": "", "page_size": 2})
+        poll = response.data["previous"]
+
+        response = self.client.get(poll)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["previous"], poll)
+
+        entry = LogEntry.objects.log_action(
+            self.user, self.user, LogEntry.UPDATE, "new"
+        )
+        response = self.client.get(poll)
+        self.assertEqual(
+            [r["id"] for r in response.data["results"]], [entry.pk]
+        )
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor."""
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        """Test cursors with values that do not match the ordering."""
+        for values in (
+            [{"a": 1}, 1],
+            ["notadate", 1],
+            [timezone.now().isoformat(), "x"],
+            [timezone.now().isoformat(), None],
+            [timezone.now().isoformat()],
+        ):
+            token = base64.urlsafe_b64encode(
+                json.dumps({"p": values}).encode("utf-8")
+            ).decode("ascii")
+            for url in (self.url, "/api/recent/"):
+                response = self.client.get(url, {"cursor": token})
+                self.assertEqual(response.status_code, 404, (url, values))
+
+    def test_recent_changes_cursor(self):
+        """Test cursor mode on recent changes."""
+        with reversion_context(self.user):
+            toollist = ToolList.objects.create(
+                title="Paged", created_by=self.user
+            )
+        for i in range(2):
+            with reversion_context(self.user):
+                toollist.title = "Paged {}".format(i)
+                toollist.save()
+        ids = list(
+            Version.objects.get_for_object(toollist)
+            .order_by("-id")
+            .values_list("id", flat=True)
+        )
+
+        response = self.client.get(
+            "/api/recent/", {"cursor": "", "page_size": 2}
+        )
+        self.assertEqual([r["id"] for r in response.data["results"]], ids[:2])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([r["id"] for r in response.data["results"]], ids[2:])
+        self.assertIsNone(response.data["next"])
@@ -17,9 +17,12 @@
 # along with Toolhub.  If not, see <http://www.gnu.org/licenses/>.
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed
 from django.test import TestCase
 
 from toolhub.apps.user.models import ToolhubUser
+from toolhub.apps.user.models import get_group_names
 
 from .. import permissions
 
@@ -61,6 +64,10 @@ class CASLForUserTest(TestCase):
         )
         Group.objects.get(name="Patrollers").user_set.add(cls.patroller)
 
+    def setUp(self):
+        """Initialize common test conditions."""
+        cache.clear()
+
     def assertRuleViewUnsuppressed(self, rule):
         """Assert that the rule allows viewing if suppressed=False."""
         self.assertEqual(rule["subject"], "reversion/version")
@@ -217,3 +224,57 @@ class CASLForUserTest(TestCase):
             elif action == "patrol":
                 self.assertEqual(subject, "reversion/version")
                 self.assertNotIn("conditions", rule)
+
+    def test_cached(self):
+        """Rules are computed without queries once groups are cached."""
+        expect = permissions.casl_for_user(self.admin)
+        admin = ToolhubUser.objects.get(pk=self.admin.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(permissions.casl_for_user(admin), expect)
+
+    def test_group_change(self):
+        """Rules follow changes in group membership."""
+        user = ToolhubUser.objects.get(pk=self.user.pk)
+        before = permissions.casl_for_user(user)
+        self.assertEqual(get_group_names(user), frozenset())
+
+        group = Group.objects.get(name="Patrollers")
+        group.user_set.add(self.user)
+        user = ToolhubUser.objects.get(pk=self.user.pk)
+        self.assertEqual(get_group_names(user), {"Patrollers"})
+        after = permissions.casl_for_user(user)
+        self.assertNotEqual(after, before)
+        self.assertIn(
+            {"subject": "reversion/version", "action": "patrol"}, after
+        )
+
+        user.groups.remove(group)
+        user = ToolhubUser.objects.get(pk=self.user.pk)
+        self.assertEqual(permissions.casl_for_user(user), before)
+
+    def test_group_clear(self):
+        """Group names read while groups are cleared are not kept."""
+        group = Group.objects.get(name="Patrollers")
+        group.user_set.add(self.user)
+
+        def read_groups(action, **kwargs):
+            if action == "pre_clear":
+                # A concurrent request reading the old membership
+                user = ToolhubUser.objects.get(pk=self.user.pk)
+                self.assertEqual(get_group_names(user), {"Patrollers"})
+
+        m2m_changed.connect(read_groups, sender=ToolhubUser.groups.through)
+        try:
+            ToolhubUser.objects.get(pk=self.user.pk).groups.clear()
+        finally:
+            m2m_changed.disconnect(
+                read_groups, sender=ToolhubUser.groups.through
+            )
+        user = ToolhubUser.objects.get(pk=self.user.pk)
+        self.assertEqual(get_group_names(user), frozenset())
+
+        group.user_set.add(self.user)
+        get_group_names(ToolhubUser.objects.get(pk=self.user.pk))
+        group.user_set.clear()
+        user = ToolhubUser.objects.get(pk=self.user.pk)
+        self.assertEqual(get_group_names(user), frozenset())